@@ -57,8 +57,6 @@ class TodayGames(Resource):
             scoreboard = ScoreboardV2(game_date=today_str)
             data = scoreboard.get_normalized_dict()
 
-            print(data)
-
             extracted_data = extract_game_data(data)
 
             return {"date": today_str, "games": extracted_data}
@@ -1,12 +1,207 @@
+import os
 from flask import Flask
 from flask_cors import CORS
 from flask_restx import Api
 
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
+    if config:
+        app.config.update(config)
+
+    # Preload mode: build everything once in a pre-fork master, start the
+    # background threads in each worker after the fork
+    from app.services.preload import (
+        default_preload_seasons,
+        freeze_heap,
+        load_static_data,
+        run_in_workers,
+        start_startup_report,
+        stop_preload_threads,
+    )
+
+    app.config.setdefault(
+        "PRELOAD_APP", os.environ.get("PRELOAD_APP", "").lower() in ("1", "true")
+    )
+    app.config.setdefault("PRELOAD_SEASONS", default_preload_seasons())
+    preload = app.config["PRELOAD_APP"]
+    startup = start_startup_report(preload)
+    startup.import_modules()
+
     CORS(app)  # Enable CORS for all routes
 
+    # Pooled async client for stats.nba.com
+    from app.services.circuit_breaker import (
+        DEFAULT_FAILURE_THRESHOLD,
+        DEFAULT_RESET_TIMEOUT,
+    )
+    from app.services.stats_gateway import (
+        DEFAULT_MAX_CONCURRENCY,
+        DEFAULT_POOL_SIZE,
+        DEFAULT_TIMEOUT,
+        init_stats_gateway,
+    )
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    app.config.setdefault(
+        "STATS_BASE_URL", os.environ.get("STATS_BASE_URL", NBAStatsHTTP.base_url)
+    )
+    app.config.setdefault("STATS_POOL_SIZE", DEFAULT_POOL_SIZE)
+    app.config.setdefault("STATS_TIMEOUT", DEFAULT_TIMEOUT)
+    # Upstream throttling: concurrent requests and requests per second
+    app.config.setdefault("UPSTREAM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+    app.config.setdefault("UPSTREAM_RATE_LIMIT", None)
+    app.config.setdefault("UPSTREAM_RATE_BURST", None)
+    # Consecutive failures that open the circuit, and seconds until a probe
+    app.config.setdefault("UPSTREAM_BREAKER_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)
+    app.config.setdefault("UPSTREAM_BREAKER_RESET", DEFAULT_RESET_TIMEOUT)
+    # Seconds before a slow call made under a request deadline is sent again
+    app.config.setdefault("UPSTREAM_HEDGE_DELAY", None)
+    init_stats_gateway(
+        base_url=app.config["STATS_BASE_URL"],
+        pool_size=app.config["STATS_POOL_SIZE"],
+        timeout=app.config["STATS_TIMEOUT"],
+        max_concurrency=app.config["UPSTREAM_MAX_CONCURRENCY"],
+        rate_limit=app.config["UPSTREAM_RATE_LIMIT"],
+        rate_burst=app.config["UPSTREAM_RATE_BURST"],
+        breaker_threshold=app.config["UPSTREAM_BREAKER_THRESHOLD"],
+        breaker_reset=app.config["UPSTREAM_BREAKER_RESET"],
+        hedge_delay=app.config["UPSTREAM_HEDGE_DELAY"],
+    )
+    startup.mark("stats_gateway")
+
+    # Time budget of fan-out requests (matchups, batches); None waits for everything
+    from app.services.deadline import DEFAULT_BUDGET, init_request_deadlines
+
+    app.config.setdefault("REQUEST_DEADLINE", DEFAULT_BUDGET)
+    init_request_deadlines(app.config["REQUEST_DEADLINE"])
+
+    # Bounded executor shared by every route's fan-out
+    from app.services.executor import (
+        DEFAULT_MAX_QUEUE,
+        DEFAULT_MAX_WORKERS,
+        init_executor,
+    )
+
+    app.config.setdefault("EXECUTOR_MAX_WORKERS", DEFAULT_MAX_WORKERS)
+    app.config.setdefault("EXECUTOR_MAX_QUEUE", DEFAULT_MAX_QUEUE)
+    init_executor(
+        max_workers=app.config["EXECUTOR_MAX_WORKERS"],
+        max_queue=app.config["EXECUTOR_MAX_QUEUE"],
+    )
+    startup.mark("executor")
+
+    # Persistent cache for upstream stats.nba.com responses
+    app.config.setdefault(
+        "STATS_CACHE_PATH",
+        os.environ.get(
+            "STATS_CACHE_PATH", os.path.join(app.instance_path, "stats_cache.sqlite3")
+        ),
+    )
+    from app.services.nba_stats import init_stats_cache
+    from app.services.stats_cache import (
+        DEFAULT_FILL_LEASE,
+        DEFAULT_MMAP_SIZE,
+        DEFAULT_STALE_WINDOW,
+    )
+
+    # Workers sharing the file share the cache; misses are fetched once
+    app.config.setdefault("STATS_CACHE_MMAP_SIZE", DEFAULT_MMAP_SIZE)
+    app.config.setdefault("STATS_CACHE_FILL_LEASE", DEFAULT_FILL_LEASE)
+    # Expired entries this recent are served while they refresh
+    app.config.setdefault("STATS_CACHE_STALE_WINDOW", DEFAULT_STALE_WINDOW)
+    init_stats_cache(
+        app.config["STATS_CACHE_PATH"],
+        mmap_size=app.config["STATS_CACHE_MMAP_SIZE"],
+        fill_lease=app.config["STATS_CACHE_FILL_LEASE"],
+        stale_window=app.config["STATS_CACHE_STALE_WINDOW"],
+    )
+    startup.mark("stats_cache")
+
+    # Byte-budgeted cache of projected team and player logs
+    from app.services.memory_cache import DEFAULT_MAX_BYTES, init_memory_cache
+
+    app.config.setdefault("MEMORY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+    init_memory_cache(app.config["MEMORY_CACHE_MAX_BYTES"])
+
+    # Player search index, built in the background and refreshed periodically
+    from app.services.player_index import start_player_index_refresher
+    from app.services.stats_cache import ALL_PLAYERS_TTL
+
+    app.config.setdefault("PLAYER_INDEX_REFRESH_INTERVAL", ALL_PLAYERS_TTL)
+    run_in_workers(
+        preload,
+        start_player_index_refresher,
+        app.config["PLAYER_INDEX_REFRESH_INTERVAL"],
+    )
+
+    # Season-wide team box-score store, ingested in the background
+    from app.services.season_store import start_season_ingest
+    from app.services.stats_cache import CURRENT_SEASON_LOGS_TTL
+
+    app.config.setdefault("SEASON_STORE_SEASONS", None)
+    app.config.setdefault("SEASON_STORE_SEASON_TYPES", ("Regular Season",))
+    app.config.setdefault("SEASON_STORE_INGEST_INTERVAL", CURRENT_SEASON_LOGS_TTL)
+    run_in_workers(
+        preload,
+        start_season_ingest,
+        seasons=app.config["SEASON_STORE_SEASONS"],
+        season_types=app.config["SEASON_STORE_SEASON_TYPES"],
+        interval=app.config["SEASON_STORE_INGEST_INTERVAL"],
+    )
+
+    # Background poller serving /games/today from memory
+    from app.services.scoreboard_poller import (
+        DEFAULT_IDLE_INTERVAL,
+        DEFAULT_LIVE_INTERVAL,
+        start_scoreboard_poller,
+    )
+    from app.services.scoreboard_stream import (
+        DEFAULT_BUFFER_SIZE,
+        DEFAULT_HEARTBEAT,
+        init_scoreboard_stream,
+    )
+
+    app.config.setdefault("SCOREBOARD_POLLER_ENABLED", True)
+    app.config.setdefault("SCOREBOARD_LIVE_INTERVAL", DEFAULT_LIVE_INTERVAL)
+    app.config.setdefault("SCOREBOARD_IDLE_INTERVAL", DEFAULT_IDLE_INTERVAL)
+    app.config.setdefault("SCOREBOARD_STREAM_BUFFER", DEFAULT_BUFFER_SIZE)
+    app.config.setdefault("SCOREBOARD_STREAM_HEARTBEAT", DEFAULT_HEARTBEAT)
+
+    def start_scoreboard():
+        poller = start_scoreboard_poller(
+            live_interval=app.config["SCOREBOARD_LIVE_INTERVAL"],
+            idle_interval=app.config["SCOREBOARD_IDLE_INTERVAL"],
+        )
+        init_scoreboard_stream(
+            poller,
+            buffer_size=app.config["SCOREBOARD_STREAM_BUFFER"],
+            heartbeat=app.config["SCOREBOARD_STREAM_HEARTBEAT"],
+        )
+
+    if app.config["SCOREBOARD_POLLER_ENABLED"]:
+        run_in_workers(preload, start_scoreboard)
+
+    # Prefetch upstream data for games about to tip off
+    from app.services.cache_warmer import (
+        DEFAULT_CONCURRENCY,
+        DEFAULT_LEAD_TIME,
+        start_cache_warmer,
+    )
+
+    app.config.setdefault("CACHE_WARMER_ENABLED", True)
+    app.config.setdefault("CACHE_WARMER_LEAD_TIME", DEFAULT_LEAD_TIME)
+    app.config.setdefault("CACHE_WARMER_CONCURRENCY", DEFAULT_CONCURRENCY)
+    if app.config["CACHE_WARMER_ENABLED"]:
+        run_in_workers(
+            preload,
+            start_cache_warmer,
+            lead_time=app.config["CACHE_WARMER_LEAD_TIME"],
+            concurrency=app.config["CACHE_WARMER_CONCURRENCY"],
+            season_types=app.config["SEASON_STORE_SEASON_TYPES"],
+        )
+    startup.mark("background_services")
+
     # Initialize API
     api = Api(
         app,
@@ -16,20 +211,86 @@ def create_app():
         doc="/swagger",
     )
 
+    # Fast JSON encoding, compression and the encoded response cache
+    from app.services.responses import (
+        DEFAULT_MAX_BYTES,
+        DEFAULT_MIN_COMPRESS_SIZE,
+        init_response_cache,
+        json_response,
+    )
+
+    app.config.setdefault("RESPONSE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+    app.config.setdefault("RESPONSE_COMPRESS_MIN_SIZE", DEFAULT_MIN_COMPRESS_SIZE)
+    init_response_cache(
+        max_bytes=app.config["RESPONSE_CACHE_MAX_BYTES"],
+        min_compress_size=app.config["RESPONSE_COMPRESS_MIN_SIZE"],
+    )
+
+    @api.representation("application/json")
+    def output_json(data, code, headers=None):
+        return json_response(data, code, headers)
+
+    startup.mark("api")
+
+    # Server-Timing header and /metrics counters for every request
+    from app.services.metrics import init_request_metrics
+
+    app.config.setdefault("SERVER_TIMING_ENABLED", True)
+    init_request_metrics(app, server_timing=app.config["SERVER_TIMING_ENABLED"])
+
+    # cProfile capture of requests that ask for it or are sampled
+    from app.services.profiler import (
+        DEFAULT_HEADER,
+        DEFAULT_MAX_PROFILES,
+        DEFAULT_SAMPLE_RATE,
+        DEFAULT_SLOW_THRESHOLD,
+        init_request_profiler,
+    )
+
+    app.config.setdefault("PROFILING_ENABLED", True)
+    app.config.setdefault("PROFILE_HEADER", DEFAULT_HEADER)
+    app.config.setdefault("PROFILE_TOKEN", os.environ.get("PROFILE_TOKEN"))
+    app.config.setdefault("PROFILE_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+    app.config.setdefault("PROFILE_SLOW_THRESHOLD", DEFAULT_SLOW_THRESHOLD)
+    app.config.setdefault("PROFILE_MAX_PROFILES", DEFAULT_MAX_PROFILES)
+    if app.config["PROFILING_ENABLED"]:
+        init_request_profiler(
+            app,
+            header=app.config["PROFILE_HEADER"],
+            token=app.config["PROFILE_TOKEN"],
+            sample_rate=app.config["PROFILE_SAMPLE_RATE"],
+            slow_threshold=app.config["PROFILE_SLOW_THRESHOLD"],
+            max_profiles=app.config["PROFILE_MAX_PROFILES"],
+        )
+    startup.mark("instrumentation")
+
     # Register blueprints
-    from app.routes import games_bp, players_bp, teams_bp
+    from app.routes import admin_bp, games_bp, players_bp, teams_bp
 
+    app.register_blueprint(admin_bp)
     app.register_blueprint(games_bp)
     app.register_blueprint(players_bp)
     app.register_blueprint(teams_bp)
 
     # Register API namespaces
+    from app.routes.admin import api as admin_api
     from app.routes.games import api as games_api
     from app.routes.players import api as players_api
     from app.routes.teams import api as teams_api
 
+    api.add_namespace(admin_api)
     api.add_namespace(games_api)
     api.add_namespace(players_api)
     api.add_namespace(teams_api)
+    startup.mark("routes")
+
+    if preload:
+        load_static_data(
+            app.config["PRELOAD_SEASONS"], app.config["SEASON_STORE_SEASON_TYPES"]
+        )
+        stop_preload_threads()
+        freeze_heap()
+        startup.mark("static_data")
+    startup.log()
 
     return app
@@ -0,0 +1,162 @@
+from flask_restx import fields, Namespace
+
+api = Namespace("admin", description="Operational endpoints")
+
+# Define models for Swagger documentation
+cache_endpoint_model = api.model(
+    "CacheEndpointStats",
+    {
+        "hits": fields.Integer(description="Lookups served from the cache"),
+        "misses": fields.Integer(description="Lookups that went upstream"),
+        "stores": fields.Integer(description="Responses written to the cache"),
+        "waits": fields.Integer(description="Misses served by another worker's fetch"),
+        "hit_rate": fields.Float(description="Hits divided by lookups"),
+        "entries": fields.Integer(description="Entries currently stored"),
+    },
+)
+
+cache_stats_response = api.model(
+    "CacheStatsResponse",
+    {
+        "path": fields.String(description="Location of the cache database"),
+        "journal_mode": fields.String(
+            description="SQLite journal mode; wal when shared"
+        ),
+        "fills_in_progress": fields.Integer(
+            description="Misses being fetched by any worker"
+        ),
+        "endpoints": fields.Raw(description="Counters keyed by upstream endpoint"),
+    },
+)
+
+memory_cache_stats_response = api.model(
+    "MemoryCacheStatsResponse",
+    {
+        "max_bytes": fields.Integer(description="Byte budget shared by all namespaces"),
+        "bytes": fields.Integer(description="Bytes currently held"),
+        "entries": fields.Integer(description="Entries currently held"),
+        "namespaces": fields.Raw(
+            description="Entries, bytes, hits, misses, evictions and rejected admissions keyed by namespace"
+        ),
+    },
+)
+
+coalescing_stats_response = api.model(
+    "CoalescingStatsResponse",
+    {
+        "in_flight": fields.Integer(description="Upstream fetches currently running"),
+        "groups": fields.Raw(
+            description="Calls, executions and collapsed calls keyed by upstream endpoint"
+        ),
+    },
+)
+
+upstream_stats_response = api.model(
+    "UpstreamStatsResponse",
+    {
+        "executor": fields.Raw(
+            description="Shared fan-out executor queue depth and wait times"
+        ),
+        "gateway": fields.Raw(
+            description="Upstream concurrency cap, rate limiter, circuit breaker and wait times"
+        ),
+    },
+)
+
+response_cache_stats_response = api.model(
+    "ResponseCacheStatsResponse",
+    {
+        "entries": fields.Integer(description="Encoded bodies currently cached"),
+        "bytes": fields.Integer(description="Size of the cached bodies and variants"),
+        "max_bytes": fields.Integer(description="Size budget of the cache"),
+        "hits": fields.Integer(description="Responses served from cached bytes"),
+        "misses": fields.Integer(description="Lookups that had to build the body"),
+        "hit_rate": fields.Float(description="Hits divided by lookups"),
+    },
+)
+
+warmer_stats_response = api.model(
+    "WarmerStatsResponse",
+    {
+        "lead_time": fields.Integer(
+            description="Seconds before tipoff games are warmed"
+        ),
+        "concurrency": fields.Integer(
+            description="Parallel upstream calls while warming"
+        ),
+        "season": fields.String(description="Season whose data is warmed"),
+        "games_warmed": fields.Integer(description="Games of today already warmed"),
+        "calls": fields.Integer(description="Upstream calls made by the warmer"),
+        "errors": fields.Integer(description="Warming calls that failed"),
+        "last_run": fields.Float(description="Unix time of the last warming run"),
+        "last_duration": fields.Float(description="Seconds the last run took"),
+    },
+)
+
+profile_model = api.model(
+    "CapturedProfile",
+    {
+        "id": fields.String(description="Profile ID, as sent in X-Profile-Id"),
+        "method": fields.String(description="HTTP method of the request"),
+        "path": fields.String(description="Path and query string of the request"),
+        "route": fields.String(description="Route rule that served the request"),
+        "status": fields.Integer(description="Response status"),
+        "duration": fields.Float(description="Seconds the request took"),
+        "started_at": fields.Float(description="Unix time the request started"),
+        "trigger": fields.String(description="header or sampled"),
+        "size": fields.Integer(description="Size of the .prof data in bytes"),
+    },
+)
+
+profile_list_response = api.model(
+    "ProfileListResponse",
+    {
+        "header": fields.String(description="Request header that asks for a profile"),
+        "sample_rate": fields.Float(description="Fraction of requests profiled"),
+        "slow_threshold": fields.Float(
+            description="Seconds a sampled request must take for its profile to be kept"
+        ),
+        "skipped_concurrent": fields.Integer(
+            description="Requests not profiled because another capture was running"
+        ),
+        "profiles": fields.List(fields.Nested(profile_model)),
+    },
+)
+
+startup_import_model = api.model(
+    "StartupImport",
+    {
+        "module": fields.String(description="Module imported"),
+        "seconds": fields.Float(
+            description="Seconds its import took, dependencies included"
+        ),
+        "cached": fields.Boolean(description="Whether it had already been imported"),
+        "peak_rss_kib": fields.Integer(description="Peak RSS after the import"),
+    },
+)
+
+startup_step_model = api.model(
+    "StartupStep",
+    {
+        "step": fields.String(description="Part of create_app"),
+        "seconds": fields.Float(description="Seconds the step took"),
+        "peak_rss_kib": fields.Integer(description="Peak RSS after the step"),
+    },
+)
+
+startup_report_response = api.model(
+    "StartupReportResponse",
+    {
+        "pid": fields.Integer(
+            description="Process that ran create_app; the master in preload mode"
+        ),
+        "preload": fields.Boolean(
+            description="Whether the app was built before forking workers"
+        ),
+        "worker_pid": fields.Integer(description="Process serving this request"),
+        "total_seconds": fields.Float(description="Seconds create_app took"),
+        "peak_rss_kib": fields.Integer(description="Peak RSS of this process"),
+        "imports": fields.List(fields.Nested(startup_import_model)),
+        "steps": fields.List(fields.Nested(startup_step_model)),
+    },
+)
@@ -6,6 +6,7 @@ api = Namespace("games", description="Game related operations")
 game_model = api.model(
     "Game",
     {
+        "game_id": fields.String(description="Unique identifier for the game"),
         "game_date": fields.String(description="Date of the game"),
         "game_status": fields.String(description="Current status of the game"),
         "home_team": fields.Nested(
@@ -32,4 +33,15 @@ game_model = api.model(
             description="Time remaining in the current period"
         ),
     },
-) 
\ No newline at end of file
+) 
+today_games_response = api.model(
+    "TodayGamesResponse",
+    {
+        "date": fields.String(description="Date of the games (MM/DD/YYYY)"),
+        "version": fields.Integer(
+            description="Snapshot version, incremented whenever the games change"
+        ),
+        "fetched_at": fields.String(description="When the scoreboard was fetched"),
+        "games": fields.List(fields.Nested(game_model)),
+    },
+)
@@ -66,8 +66,103 @@ player_stats_response = api.model(
     "PlayerStatsResponse",
     {
         "player_id": fields.Integer(description="Player ID"),
-        "season": fields.String(description="NBA season"),
+        "season": fields.String(description="NBA season or season range"),
+        "seasons": fields.List(fields.String, description="Seasons covered, oldest first"),
         "games_played": fields.Integer(description="Number of games played"),
         "stats": fields.List(fields.Nested(player_stats_model)),
     },
-) 
\ No newline at end of file
+) 
+prop_model = api.model(
+    "Prop",
+    {
+        "stat": fields.String(
+            required=True,
+            description="Stat column or combo (e.g., PTS, FG3M, PTS+REB+AST, PRA)",
+        ),
+        "line": fields.Float(required=True, description="Betting line"),
+        "last_n": fields.Integer(
+            description="Most recent games to evaluate; overrides the request default"
+        ),
+    },
+)
+
+prop_result_model = api.model(
+    "PropResult",
+    {
+        "stat": fields.String(description="Canonical stat or combo"),
+        "line": fields.Float(description="Betting line"),
+        "games": fields.Integer(description="Games evaluated"),
+        "over": fields.Integer(description="Games above the line"),
+        "under": fields.Integer(description="Games below the line"),
+        "push": fields.Integer(description="Games exactly on the line"),
+        "hit_rate": fields.Float(description="Share of games above the line"),
+        "under_rate": fields.Float(description="Share of games below the line"),
+        "average": fields.Float(description="Average of the stat"),
+        "median": fields.Float(description="Median of the stat"),
+        "std_dev": fields.Float(description="Sample standard deviation of the stat"),
+        "margin": fields.Float(description="Average minus the line"),
+    },
+)
+
+player_props_request = api.model(
+    "PlayerPropsRequest",
+    {
+        "season": fields.String(description="NBA season (e.g., 2023-24)"),
+        "last_n": fields.Integer(description="Default number of most recent games"),
+        "props": fields.List(fields.Nested(prop_model), required=True),
+    },
+)
+
+player_props_response = api.model(
+    "PlayerPropsResponse",
+    {
+        "player_id": fields.Integer(description="Player ID"),
+        "season": fields.String(description="NBA season"),
+        "games_played": fields.Integer(description="Games in the season"),
+        "props": fields.List(fields.Nested(prop_result_model)),
+    },
+)
+
+player_batch_request = api.model(
+    "PlayerBatchRequest",
+    {
+        "player_ids": fields.List(fields.Integer, required=True, description="Player IDs"),
+        "season": fields.Raw(
+            description="NBA season, season range (e.g., 2015-16..2023-24) or a list of them"
+        ),
+        "include": fields.List(
+            fields.String, description="Parts to return: info and/or stats (default both)"
+        ),
+    },
+)
+
+batch_error_model = api.model(
+    "BatchError",
+    {
+        "resource": fields.String(description="Part that failed (info or stats)"),
+        "season": fields.String(description="Season of the failed call, if any"),
+        "error": fields.String(description="Error message"),
+    },
+)
+
+player_batch_item_model = api.model(
+    "PlayerBatchItem",
+    {
+        "player_id": fields.Integer(description="Player ID"),
+        "info": fields.Nested(player_info_model),
+        "stats": fields.Raw(description="games_played and stats, most recent first"),
+        "errors": fields.List(fields.Nested(batch_error_model)),
+    },
+)
+
+player_batch_response = api.model(
+    "PlayerBatchResponse",
+    {
+        "season": fields.Raw(description="Requested season(s)"),
+        "seasons": fields.List(fields.String, description="Seasons covered, oldest first"),
+        "count": fields.Integer(description="Number of distinct players"),
+        "failed": fields.Integer(description="Players with at least one error"),
+        "partial": fields.Boolean(description="Whether some calls missed the request deadline"),
+        "results": fields.List(fields.Nested(player_batch_item_model)),
+    },
+)
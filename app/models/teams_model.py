@@ -36,10 +36,84 @@ game_log_model = api.model(
 
 team_games_response = api.model(
     "TeamGamesResponse",
+    {
+        "team_id": fields.Integer(description="Team ID"),
+        "season": fields.String(description="NBA season or season range"),
+        "seasons": fields.List(fields.String, description="Seasons covered, oldest first"),
+        "games_played": fields.Integer(description="Number of games played"),
+        "games": fields.List(fields.Nested(game_log_model)),
+    },
+) 
+aggregate_split_model = api.model(
+    "AggregateSplit",
+    {
+        "games": fields.Integer(description="Number of games in the split"),
+        "averages": fields.Raw(description="Per-game averages keyed by stat"),
+        "rates": fields.Raw(
+            description="Pace, offensive rating and shooting rates from summed totals"
+        ),
+    },
+)
+
+team_aggregates_response = api.model(
+    "TeamAggregatesResponse",
     {
         "team_id": fields.Integer(description="Team ID"),
         "season": fields.String(description="NBA season"),
+        "season_types": fields.List(fields.String, description="Game types included"),
+        "games_played": fields.Integer(description="Number of games played"),
+        "full_season": fields.Nested(aggregate_split_model),
+        "last_n": fields.Raw(description="Split over the most recent games"),
+        "splits": fields.Raw(description="Home/away and win/loss splits"),
+        "rolling": fields.Raw(
+            description="Rolling averages per stat, oldest first (when requested)"
+        ),
+    },
+)
+
+team_batch_request = api.model(
+    "TeamBatchRequest",
+    {
+        "team_ids": fields.List(
+            fields.Raw, required=True, description="Team IDs or abbreviations (e.g., BOS)"
+        ),
+        "season": fields.Raw(
+            description="NBA season, season range (e.g., 2015-16..2023-24) or a list of them"
+        ),
+        "season_types": fields.List(
+            fields.String, description="Game types to include (default Regular Season)"
+        ),
+    },
+)
+
+team_batch_error_model = api.model(
+    "TeamBatchError",
+    {
+        "season": fields.String(description="Season of the failed call"),
+        "season_type": fields.String(description="Game type of the failed call"),
+        "error": fields.String(description="Error message"),
+    },
+)
+
+team_batch_item_model = api.model(
+    "TeamBatchItem",
+    {
+        "team_id": fields.Integer(description="Team ID"),
         "games_played": fields.Integer(description="Number of games played"),
         "games": fields.List(fields.Nested(game_log_model)),
+        "errors": fields.List(fields.Nested(team_batch_error_model)),
     },
-) 
\ No newline at end of file
+)
+
+team_batch_response = api.model(
+    "TeamBatchResponse",
+    {
+        "season": fields.Raw(description="Requested season(s)"),
+        "seasons": fields.List(fields.String, description="Seasons covered, oldest first"),
+        "season_types": fields.List(fields.String, description="Game types included"),
+        "count": fields.Integer(description="Number of distinct teams"),
+        "failed": fields.Integer(description="Teams with at least one error"),
+        "partial": fields.Boolean(description="Whether some calls missed the request deadline"),
+        "results": fields.List(fields.Nested(team_batch_item_model)),
+    },
+)
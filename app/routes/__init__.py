@@ -1,5 +1,6 @@
+from .admin import admin_bp
 from .games import games_bp
 from .players import players_bp
 from .teams import teams_bp
 
-__all__ = ["games_bp", "players_bp", "teams_bp"]
+__all__ = ["admin_bp", "games_bp", "players_bp", "teams_bp"]
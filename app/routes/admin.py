@@ -0,0 +1,177 @@
+import os
+from flask import Blueprint, Response, request
+from flask_restx import Resource
+from app.models.admin_model import (
+    api,
+    cache_stats_response,
+    coalescing_stats_response,
+    memory_cache_stats_response,
+    profile_list_response,
+    response_cache_stats_response,
+    startup_report_response,
+    upstream_stats_response,
+    warmer_stats_response,
+)
+from app.services.cache_warmer import get_cache_warmer
+from app.services.executor import get_executor
+from app.services.memory_cache import get_memory_cache
+from app.services.metrics import render_metrics
+from app.services.nba_stats import get_single_flight, get_stats_cache
+from app.services.preload import get_startup_report
+from app.services.profiler import get_request_profiler
+from app.services.responses import get_response_cache
+from app.services.stats_gateway import get_stats_gateway
+
+admin_bp = Blueprint("admin", __name__)
+
+
+def authorized_profiler():
+    """Return the profiler and an error response if the request may not use it"""
+    profiler = get_request_profiler()
+    if profiler is None:
+        return None, ({"error": "Profiling is disabled"}, 404)
+    if not profiler.authorized(request.headers):
+        return None, ({"error": "Profiling token required"}, 403)
+    return profiler, None
+
+
+# Prometheus scrapes plain text at the root, outside the API namespaces
+@admin_bp.route("/metrics")
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+@api.route("/cache")
+class CacheStats(Resource):
+    @api.doc("get_cache_stats")
+    @api.response(200, "Success", cache_stats_response)
+    def get(self):
+        """Get hit/miss counters of the upstream response cache"""
+        return get_stats_cache().stats()
+
+
+@api.route("/memory")
+class MemoryCacheStats(Resource):
+    @api.doc("get_memory_cache_stats")
+    @api.response(200, "Success", memory_cache_stats_response)
+    def get(self):
+        """Get size and per-namespace counters of the in-memory projection cache"""
+        return get_memory_cache().stats()
+
+
+@api.route("/responses")
+class ResponseCacheStats(Resource):
+    @api.doc("get_response_cache_stats")
+    @api.response(200, "Success", response_cache_stats_response)
+    def get(self):
+        """Get hit/miss counters and size of the encoded response cache"""
+        return get_response_cache().stats()
+
+
+@api.route("/coalescing")
+class CoalescingStats(Resource):
+    @api.doc("get_coalescing_stats")
+    @api.response(200, "Success", coalescing_stats_response)
+    def get(self):
+        """Get how many concurrent upstream calls were collapsed into one"""
+        return get_single_flight().stats()
+
+
+@api.route("/upstream")
+class UpstreamStats(Resource):
+    @api.doc("get_upstream_stats")
+    @api.response(200, "Success", upstream_stats_response)
+    def get(self):
+        """Get queue depth and wait times of the executor and upstream limiter"""
+        return {
+            "executor": get_executor().stats(),
+            "gateway": get_stats_gateway().stats(),
+        }
+
+
+@api.route("/warmer")
+class WarmerStats(Resource):
+    @api.doc("get_warmer_stats")
+    @api.response(200, "Success", warmer_stats_response)
+    @api.response(404, "Cache warming disabled")
+    def get(self):
+        """Get progress of the pre-tipoff cache warmer"""
+        warmer = get_cache_warmer()
+        if warmer is None:
+            return {"error": "Cache warming is disabled"}, 404
+        return warmer.stats()
+
+
+@api.route("/startup")
+class StartupReport(Resource):
+    @api.doc("get_startup_report")
+    @api.response(200, "Success", startup_report_response)
+    def get(self):
+        """Get import and init times of the app's startup"""
+        report = get_startup_report().as_dict()
+        report["worker_pid"] = os.getpid()
+        return report
+
+
+@api.route("/profiles")
+class Profiles(Resource):
+    @api.doc("list_profiles")
+    @api.response(200, "Success", profile_list_response)
+    @api.response(403, "Profiling token required")
+    @api.response(404, "Profiling disabled")
+    def get(self):
+        """List captured request profiles, newest first"""
+        profiler, error = authorized_profiler()
+        if error is not None:
+            return error
+        return profiler.list()
+
+    @api.doc("clear_profiles")
+    @api.response(204, "Cleared")
+    @api.response(403, "Profiling token required")
+    @api.response(404, "Profiling disabled")
+    def delete(self):
+        """Drop every captured profile"""
+        profiler, error = authorized_profiler()
+        if error is not None:
+            return error
+        profiler.clear()
+        return "", 204
+
+
+@api.route("/profiles/<string:profile_id>")
+class Profile(Resource):
+    @api.doc(
+        "get_profile",
+        params={
+            "format": "prof (default) to download the pstats file, or text for a summary",
+            "sort": "pstats sort key for the text summary. Defaults to cumulative.",
+        },
+    )
+    @api.response(200, "Success")
+    @api.response(400, "Bad Request")
+    @api.response(403, "Profiling token required")
+    @api.response(404, "Profile Not Found")
+    def get(self, profile_id):
+        """Download a captured profile"""
+        profiler, error = authorized_profiler()
+        if error is not None:
+            return error
+        profile = profiler.get(profile_id)
+        if profile is None:
+            return {"error": "Profile not found"}, 404
+
+        output_format = request.args.get("format", "prof")
+        if output_format == "text":
+            try:
+                text = profile.text(sort=request.args.get("sort", "cumulative"))
+            except KeyError:
+                return {"error": "Unknown sort key"}, 400
+            return Response(text, mimetype="text/plain")
+        if output_format != "prof":
+            return {"error": "format must be prof or text"}, 400
+        return Response(
+            profile.data,
+            mimetype="application/octet-stream",
+            headers={"Content-Disposition": f"attachment; filename={profile_id}.prof"},
+        )
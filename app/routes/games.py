@@ -1,19 +1,71 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, request
 from flask_restx import Resource, Namespace
-from app.services.game_service import get_today_games
-from app.models.games_model import api, game_model
+from app.services.game_service import get_today_games, today_snapshot
+from app.services.responses import LIVE_CACHE_CONTROL, Conditional, conditional_response
+from app.services.scoreboard_stream import get_scoreboard_stream
+from app.models.games_model import api, game_model, today_games_response
 
 games_bp = Blueprint("games", __name__)
 
+
+def today_version(snapshot):
+    """Digest and change time of a snapshot of today's games"""
+    if snapshot is None:
+        return None
+    return (snapshot["date"], snapshot["digest"]), snapshot["modified_at"]
+
+
 @api.route("/today")
 class TodayGames(Resource):
     @api.doc("get_today_games")
-    @api.response(200, "Success", game_model)
+    @api.response(200, "Success", today_games_response)
+    @api.response(304, "Not Modified")
     @api.response(500, "Internal Server Error")
     def get(self):
         """Get today's NBA games"""
         try:
-            games_data = get_today_games()
-            return games_data
+            # Validators and body come from one read of the poller's snapshot
+            snapshot = today_snapshot()
+            return conditional_response(
+                # Weak: fetched_at and version move on even when games don't
+                Conditional(
+                    ("today_games",),
+                    lambda: today_version(snapshot),
+                    LIVE_CACHE_CONTROL,
+                    weak=True,
+                ),
+                lambda: get_today_games(snapshot),
+            )
         except Exception as e:
             return {"error": str(e)}, 500
+
+
+@api.route("/stream")
+class GamesStream(Resource):
+    @api.doc(
+        "stream_today_games",
+        description=(
+            "Server-Sent Events stream of today's games. A `snapshot` event "
+            "with every game is sent on connect, followed by `delta` events "
+            "holding only the changed score, period, clock and status fields "
+            "of each game. Event IDs identify the scoreboard state, so "
+            "reconnecting with `Last-Event-ID` to any worker replays missed "
+            "deltas when they are still buffered and sends a snapshot otherwise. "
+            "Every open stream holds one server thread."
+        ),
+    )
+    @api.response(200, "text/event-stream of snapshot and delta events")
+    @api.response(503, "Scoreboard polling is disabled")
+    def get(self):
+        """Stream live scoreboard changes"""
+        stream = get_scoreboard_stream()
+        if stream is None:
+            return {"error": "Scoreboard streaming is not enabled"}, 503
+
+        last_event_id = request.headers.get("Last-Event-ID", "").strip() or None
+
+        return Response(
+            stream.subscribe(last_event_id),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
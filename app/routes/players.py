@@ -1,6 +1,5 @@
 from flask import Blueprint, jsonify, request
 from flask_restx import Resource, Namespace
-from nba_api.stats.endpoints import PlayerGameLogs, CommonPlayerInfo, CommonAllPlayers
 from nba_api.stats.library.parameters import SeasonAll
 from app.models.players_model import (
     api,
@@ -9,139 +8,498 @@ from app.models.players_model import (
     player_info_model,
     player_stats_model,
     player_stats_response,
+    player_props_request,
+    player_props_response,
+    player_batch_request,
+    player_batch_response,
+)
+from app.services.batch import (
+    BatchError,
+    fetch_all,
+    is_partial,
+    parse_ids,
+    parse_season_list,
+)
+from app.services.deadline import request_deadline
+from app.services.executor import get_executor
+from app.services.metrics import timed
+from app.services.nba_stats import (
+    combined_version,
+    get_player_info,
+    get_player_game_logs,
+    player_game_logs_version,
+    player_info_version,
+)
+from app.services.player_index import get_player_index
+from app.services.prop_engine import PropError, get_player_columns, parse_last_n
+from app.services.responses import (
+    DEFAULT_CACHE_CONTROL,
+    Conditional,
+    conditional_response,
+    ndjson_response,
+    season_cache_control,
+)
+from app.services.stats_cache import season_is_final
+from app.utils.rowsets import Projection, result_set, sort_rows
+from app.utils.seasons import merge_by_date, parse_seasons
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_LIMIT = 25
+
+# Player bios change rarely (see PLAYER_INFO_TTL)
+PLAYER_INFO_CACHE_CONTROL = "public, max-age=3600"
+
+
+def cache_version(stored_at):
+    """Version token and last-modified time of one cached upstream call"""
+    return None if stored_at is None else (stored_at, stored_at)
+
+
+PLAYER_INFO = Projection(
+    {
+        "player_id": "PERSON_ID",
+        "name": "DISPLAY_FIRST_LAST",
+        "team_city": "TEAM_CITY",
+        "team_name": "TEAM_NAME",
+        "position": "POSITION",
+        "height": "HEIGHT",
+        "weight": "WEIGHT",
+        "birth_date": "BIRTHDATE",
+        "country": "COUNTRY",
+        "jersey_number": "JERSEY",
+        "roster_status": "ROSTERSTATUS",
+    },
+    defaults={
+        "position": "N/A",
+        "height": "N/A",
+        "weight": "N/A",
+        "birth_date": "N/A",
+        "country": "N/A",
+        "jersey_number": "N/A",
+        "roster_status": "N/A",
+    },
+)
+
+PLAYER_GAME = Projection(
+    {
+        "game_id": "GAME_ID",
+        "game_date": "GAME_DATE",
+        "matchup": "MATCHUP",
+        "result": "WL",
+        "minutes": "MIN",
+        "points": "PTS",
+        "rebounds": "REB",
+        "assists": "AST",
+        "steals": "STL",
+        "blocks": "BLK",
+        "field_goals_made": "FGM",
+        "field_goals_attempted": "FGA",
+        "three_pointers_made": "FG3M",
+        "three_pointers_attempted": "FG3A",
+        "free_throws_made": "FTM",
+        "free_throws_attempted": "FTA",
+        "turnovers": "TOV",
+        "plus_minus": "PLUS_MINUS",
+    }
 )
 
+# Parts of a player a batch request can ask for
+BATCH_INCLUDES = ("info", "stats")
+
 players_bp = Blueprint("players", __name__)
 
+
+def player_info_payload(table):
+    """Build a player's info from CommonPlayerInfo, None if it is empty"""
+    if not table["data"]:
+        return None
+    player = PLAYER_INFO.row(table, table["data"][0])
+    player["team"] = player.pop("team_city") + " " + player.pop("team_name")
+    player["active"] = player.pop("roster_status") == "ACTIVE"
+    return player
+
+
 @api.route("/search")
 class PlayerSearch(Resource):
-    @api.doc("search_players", params={"name": "Player name to search for"})
+    @api.doc(
+        "search_players",
+        params={
+            "name": "Player name to search for",
+            "limit": f"Maximum number of players to return. Defaults to {DEFAULT_SEARCH_LIMIT}.",
+        },
+    )
     @api.response(200, "Success", player_search_response)
+    @api.response(304, "Not Modified")
     @api.response(400, "Bad Request")
     @api.response(404, "Not Found")
     @api.response(500, "Internal Server Error")
+    @api.response(503, "Player index not available")
     def get(self):
         """Search for players by name"""
         try:
             name = request.args.get("name")
             if not name:
                 return {"error": "Name parameter is required"}, 400
-                
-            # Get all players and filter by name
-            all_players = CommonAllPlayers()
-            data = all_players.get_normalized_dict()
-            
-            # Filter players by name
-            matching_players = [
-                player for player in data["CommonAllPlayers"]
-                if name.lower() in f"{player['DISPLAY_FIRST_LAST']}".lower()
-            ]
-            
-            if not matching_players:
+
+            limit = request.args.get("limit", DEFAULT_SEARCH_LIMIT, type=int)
+            if limit is None or limit < 1:
+                return {"error": "limit must be a positive integer"}, 400
+
+            index = get_player_index()
+            if index is None:
+                return {"error": "Player index is not available"}, 503
+
+            players = index.search(name, limit=limit)
+
+            if not players:
                 return {"error": "No players found"}, 404
-                
-            players = []
-            for player in matching_players:
-                players.append({
-                    "player_id": player["PERSON_ID"],
-                    "name": player["DISPLAY_FIRST_LAST"],
-                    "team": player["TEAM_CITY"] + " " + player["TEAM_NAME"],
-                    "position": player.get("POSITION", "N/A"),
-                    "jersey_number": player.get("JERSEY", "N/A")
-                })
-                
-            return {
-                "count": len(players),
-                "players": players
-            }
-            
+
+            # Served from the in-memory index; the body hash is the ETag
+            return (
+                {"count": len(players), "players": players},
+                200,
+                {"Cache-Control": DEFAULT_CACHE_CONTROL},
+            )
+
         except Exception as e:
             return {"error": str(e)}, 500
 
+
 @api.route("/<int:player_id>")
 class PlayerInfo(Resource):
     @api.doc("get_player_info")
     @api.response(200, "Success", player_info_model)
+    @api.response(304, "Not Modified")
     @api.response(404, "Player Not Found")
     @api.response(500, "Internal Server Error")
     def get(self, player_id):
         """Get detailed information about a specific player"""
         try:
-            player_info = CommonPlayerInfo(player_id=player_id)
-            data = player_info.get_normalized_dict()
-            
-            if not data["CommonPlayerInfo"]:
-                return {"error": "Player not found"}, 404
-                
-            player = data["CommonPlayerInfo"][0]
-            return {
-                "player_id": player["PERSON_ID"],
-                "name": player["DISPLAY_FIRST_LAST"],
-                "team": player["TEAM_CITY"] + " " + player["TEAM_NAME"],
-                "position": player.get("POSITION", "N/A"),
-                "height": player.get("HEIGHT", "N/A"),
-                "weight": player.get("WEIGHT", "N/A"),
-                "birth_date": player.get("BIRTHDATE", "N/A"),
-                "country": player.get("COUNTRY", "N/A"),
-                "jersey_number": player.get("JERSEY", "N/A"),
-                "active": player.get("ROSTERSTATUS", "N/A") == "ACTIVE"
-            }
-            
+
+            def build():
+                table = result_set(get_player_info(player_id), "CommonPlayerInfo")
+                with timed("projection"):
+                    player = player_info_payload(table)
+
+                if player is None:
+                    return {"error": "Player not found"}, 404
+                return player
+
+            return conditional_response(
+                Conditional(
+                    ("player_info", player_id),
+                    lambda: cache_version(player_info_version(player_id)),
+                    PLAYER_INFO_CACHE_CONTROL,
+                ),
+                build,
+            )
+
         except Exception as e:
             return {"error": str(e)}, 500
 
+
+def iter_player_games(table):
+    """Yield the projected rows of a player's game logs, most recent first"""
+    build = PLAYER_GAME.compile(table["headers"])
+    for row in sort_rows(table, "GAME_DATE", reverse=True)["data"]:
+        yield build(row)
+
+
+def get_player_season_table(player_id, season):
+    """Get a player's game log table for one season, None on error"""
+    try:
+        return result_set(get_player_game_logs(player_id, season), "PlayerGameLogs")
+    except Exception as e:
+        logger.error(f"Error fetching {season} stats of player {player_id}: {str(e)}")
+        return None
+
+
+def player_season_tables(player_id, seasons):
+    """Fetch a player's game logs for every season concurrently, None for failed seasons"""
+    return get_executor().map(
+        lambda season: get_player_season_table(player_id, season),
+        seasons,
+    )
+
+
+def iter_player_season_games(player_id, seasons, failed):
+    """Yield a player's games most recent first, one season at a time
+
+    The next season is fetched while the current one is streamed, so at most
+    two seasons are held. Failed seasons are skipped, as in the JSON response,
+    and appended to ``failed``.
+    """
+    executor = get_executor()
+    newest_first = seasons[::-1]
+    pending = executor.submit(get_player_season_table, player_id, newest_first[0])
+    for season, next_season in zip(newest_first, newest_first[1:] + [None]):
+        table = pending.result()
+        if next_season is not None:
+            pending = executor.submit(get_player_season_table, player_id, next_season)
+        if table is None:
+            failed.append(season)
+        else:
+            yield from iter_player_games(table)
+
+
 @api.route("/<int:player_id>/stats")
 class PlayerStats(Resource):
     @api.doc(
         "get_player_stats",
-        params={"season": "NBA season (e.g., 2023-24). Defaults to current season."},
+        params={
+            "season": "NBA season (e.g., 2023-24) or inclusive range (e.g., 2015-16..2023-24). Defaults to current season.",
+            "format": "json (default) or ndjson to stream one game per line, most recent first.",
+        },
     )
     @api.response(200, "Success", player_stats_response)
+    @api.response(304, "Not Modified")
+    @api.response(400, "Bad Request")
     @api.response(404, "Player Not Found")
     @api.response(500, "Internal Server Error")
     def get(self, player_id):
         """Get game statistics for a specific player"""
         try:
             season = request.args.get("season", SeasonAll.current_season)
-            
-            player_logs = PlayerGameLogs(
-                player_id_nullable=player_id,
-                season_nullable=season
+            output_format = request.args.get("format", "json")
+            if output_format not in ("json", "ndjson"):
+                return {"error": "format must be json or ndjson"}, 400
+            try:
+                seasons = parse_seasons(season)
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            conditional = Conditional(
+                ("player_stats", player_id, tuple(seasons), output_format),
+                lambda: combined_version(
+                    player_game_logs_version(player_id, season) for season in seasons
+                ),
+                season_cache_control(seasons[-1]),
+            )
+
+            if output_format == "ndjson":
+                not_modified, headers = conditional.evaluate()
+                if not_modified is not None:
+                    return not_modified
+                # Stream season by season; the first game tells a 404 apart
+                failed = []
+                games = iter_player_season_games(player_id, seasons, failed)
+                first = next(games, None)
+                if first is None:
+                    if failed:
+                        return {
+                            "error": f"Could not fetch stats for {', '.join(failed)}"
+                        }, 500
+                    return {"error": "No stats found for this player"}, 404
+                return ndjson_response(itertools.chain([first], games), headers)
+
+            def build():
+                tables = player_season_tables(player_id, seasons)
+
+                if not any(table and table["data"] for table in tables):
+                    if None in tables:
+                        failed = [
+                            season
+                            for season, table in zip(seasons, tables)
+                            if table is None
+                        ]
+                        return {
+                            "error": f"Could not fetch stats for {', '.join(failed)}"
+                        }, 500
+                    return {"error": "No stats found for this player"}, 404
+
+                # Each season is most recent first: merge them instead of sorting
+                with timed("projection"):
+                    stats = list(
+                        merge_by_date(
+                            iter_player_games(table) for table in tables if table
+                        )
+                    )
+
+                result = {
+                    "player_id": player_id,
+                    "season": season,
+                    "seasons": seasons,
+                    "games_played": len(stats),
+                    "stats": stats,
+                }
+                # Partial results are never cached
+                return result if None not in tables else (result, 200)
+
+            # Logs of finished seasons never change: serve encoded bytes
+            return conditional_response(
+                conditional, build, cache=season_is_final(seasons[-1])
+            )
+
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+
+def evaluate_player_props(player_id, season, props, last_n):
+    """Evaluate props for a player and build the response"""
+    columns = get_player_columns(player_id, season)
+    if not len(columns):
+        return {"error": "No stats found for this player"}, 404
+    return {
+        "player_id": player_id,
+        "season": season,
+        "games_played": len(columns),
+        "props": columns.evaluate(props, last_n=last_n),
+    }
+
+
+@api.route("/<int:player_id>/props")
+class PlayerProps(Resource):
+    @api.doc(
+        "get_player_props",
+        params={
+            "season": "NBA season (e.g., 2023-24). Defaults to current season.",
+            "props": "Comma-separated stat:line pairs (e.g., PTS:24.5,PTS+REB+AST:35.5,FG3M:2.5)",
+            "last_n": "Only evaluate the most recent N games. Defaults to the whole season.",
+        },
+    )
+    @api.response(200, "Success", player_props_response)
+    @api.response(304, "Not Modified")
+    @api.response(400, "Bad Request")
+    @api.response(404, "Player Not Found")
+    @api.response(500, "Internal Server Error")
+    def get(self, player_id):
+        """Get hit rates of stat lines over a player's recent games"""
+        try:
+            season = request.args.get("season", SeasonAll.current_season)
+            last_n = parse_last_n(request.args.get("last_n"))
+            raw_props = request.args.get("props")
+            if not raw_props:
+                return {"error": "props parameter is required (e.g., PTS:24.5)"}, 400
+
+            props = []
+            for raw_prop in raw_props.split(","):
+                stat, _, line = raw_prop.rpartition(":")
+                props.append({"stat": stat, "line": line})
+
+            return conditional_response(
+                Conditional(
+                    ("player_props", player_id, season, raw_props, last_n),
+                    lambda: cache_version(player_game_logs_version(player_id, season)),
+                    season_cache_control(season),
+                ),
+                lambda: evaluate_player_props(player_id, season, props, last_n),
             )
-            data = player_logs.get_normalized_dict()
-            
-            if not data["PlayerGameLogs"]:
-                return {"error": "No stats found for this player"}, 404
-                
-            stats = []
-            for game in data["PlayerGameLogs"]:
-                stats.append({
-                    "game_id": game["GAME_ID"],
-                    "game_date": game["GAME_DATE"],
-                    "matchup": game["MATCHUP"],
-                    "result": game["WL"],
-                    "minutes": game["MIN"],
-                    "points": game["PTS"],
-                    "rebounds": game["REB"],
-                    "assists": game["AST"],
-                    "steals": game["STL"],
-                    "blocks": game["BLK"],
-                    "field_goals_made": game["FGM"],
-                    "field_goals_attempted": game["FGA"],
-                    "three_pointers_made": game["FG3M"],
-                    "three_pointers_attempted": game["FG3A"],
-                    "free_throws_made": game["FTM"],
-                    "free_throws_attempted": game["FTA"],
-                    "turnovers": game["TOV"],
-                    "plus_minus": game["PLUS_MINUS"]
-                })
-                
+
+        except PropError as e:
+            return {"error": str(e)}, 400
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+    @api.doc("evaluate_player_props")
+    @api.expect(player_props_request)
+    @api.response(200, "Success", player_props_response)
+    @api.response(400, "Bad Request")
+    @api.response(404, "Player Not Found")
+    @api.response(500, "Internal Server Error")
+    def post(self, player_id):
+        """Evaluate a batch of stat lines for a player in one call"""
+        try:
+            body = request.get_json(silent=True) or {}
+            props = body.get("props")
+            if not isinstance(props, list) or not props:
+                return {"error": "props must be a non-empty list"}, 400
+
+            season = body.get("season", SeasonAll.current_season)
+            last_n = parse_last_n(body.get("last_n"))
+            return evaluate_player_props(player_id, season, props, last_n)
+
+        except PropError as e:
+            return {"error": str(e)}, 400
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+
+def build_player_batch_item(player_id, include, seasons, fetched):
+    """Assemble one batch result from the fetched upstream data"""
+    item = {"player_id": player_id}
+    errors = []
+
+    if "info" in include:
+        data, error = fetched[(get_player_info, player_id)]
+        if error is not None:
+            errors.append({"resource": "info", "error": error})
+        else:
+            player = player_info_payload(result_set(data, "CommonPlayerInfo"))
+            if player is None:
+                errors.append({"resource": "info", "error": "Player not found"})
+            else:
+                item["info"] = player
+
+    if "stats" in include:
+        tables = []
+        for season in seasons:
+            data, error = fetched[(get_player_game_logs, player_id, season)]
+            if error is not None:
+                errors.append({"resource": "stats", "season": season, "error": error})
+            else:
+                tables.append(result_set(data, "PlayerGameLogs"))
+        stats = list(merge_by_date(iter_player_games(table) for table in tables))
+        if stats:
+            item["stats"] = {"games_played": len(stats), "stats": stats}
+        elif tables:
+            errors.append(
+                {"resource": "stats", "error": "No stats found for this player"}
+            )
+
+    if errors:
+        item["errors"] = errors
+    return item
+
+
+@api.route("/batch")
+class PlayerBatch(Resource):
+    @api.doc("get_player_batch")
+    @api.expect(player_batch_request)
+    @api.response(200, "Success", player_batch_response)
+    @api.response(400, "Bad Request")
+    @api.response(500, "Internal Server Error")
+    def post(self):
+        """Get info and game statistics for many players in one call"""
+        try:
+            body = request.get_json(silent=True) or {}
+            player_ids = parse_ids(body.get("player_ids"), "player_ids")
+            season = body.get("season", SeasonAll.current_season)
+            seasons = parse_season_list(season)
+            include = body.get("include", list(BATCH_INCLUDES))
+            if not isinstance(include, list) or not set(include) <= set(BATCH_INCLUDES):
+                return {
+                    "error": f"include must be a list of {', '.join(BATCH_INCLUDES)}"
+                }, 400
+
+            # Every distinct upstream call runs once, in parallel on the shared executor
+            calls = []
+            for player_id in player_ids:
+                if "info" in include:
+                    calls.append((get_player_info, player_id))
+                if "stats" in include:
+                    calls.extend(
+                        (get_player_game_logs, player_id, season) for season in seasons
+                    )
+            with request_deadline():
+                fetched = fetch_all(calls)
+
+            results = [
+                build_player_batch_item(player_id, include, seasons, fetched)
+                for player_id in player_ids
+            ]
             return {
-                "player_id": player_id,
                 "season": season,
-                "games_played": len(stats),
-                "stats": stats
+                "seasons": seasons,
+                "count": len(results),
+                "failed": sum(1 for item in results if "errors" in item),
+                "partial": is_partial(fetched),
+                "results": results,
             }
-            
+
+        except BatchError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             return {"error": str(e)}, 500
@@ -1,15 +1,46 @@
 from flask import Blueprint, jsonify, request
 from flask_restx import Resource, Namespace
-from nba_api.stats.endpoints import TeamGameLogs, BoxScoreTraditionalV2
 from nba_api.stats.library.parameters import SeasonAll, SeasonType
-from app.models.teams_model import api, game_log_model, team_games_response
+from app.models.teams_model import (
+    api,
+    game_log_model,
+    team_games_response,
+    team_aggregates_response,
+    team_batch_request,
+    team_batch_response,
+)
 from app.constants import TEAM_ABBREVIATIONS, TEAM_IDS
+from app.services.batch import (
+    BatchError,
+    fetch_all,
+    is_partial,
+    parse_ids,
+    parse_season_list,
+)
+from app.services.deadline import request_deadline, wait_until_deadline
+from app.services.executor import get_executor
+from app.services.metrics import timed
+from app.services.nba_stats import (
+    combined_version,
+    get_team_game_logs,
+    league_team_logs_version,
+    team_game_logs_version,
+)
+from app.services.responses import (
+    Conditional,
+    conditional_response,
+    ndjson_response,
+    season_cache_control,
+)
+from app.services.season_store import get_season_store, held_season_store
+from app.services.stats_cache import season_is_final
+from app.services.team_log_store import get_team_columns
+from app.utils.rowsets import Projection, result_set, sort_rows
+from app.utils.seasons import merge_by_date, parse_seasons
 import re
 import logging
 import traceback
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
 import threading
 
 # Configure logging
@@ -18,109 +49,181 @@ logger = logging.getLogger(__name__)
 
 teams_bp = Blueprint("teams", __name__)
 
-# Cache for team game logs
-@lru_cache(maxsize=128)
-def get_cached_team_logs(team_id, season, season_type):
-    """Get cached team game logs"""
-    return TeamGameLogs(
-        team_id_nullable=team_id,
-        season_nullable=season,
-        season_type_nullable=season_type
-    ).get_normalized_dict()
-
-# Cache for box scores
-@lru_cache(maxsize=256)
-def get_cached_box_score(game_id):
-    """Get cached box score data"""
-    return BoxScoreTraditionalV2(game_id=game_id).get_normalized_dict()
-
-def process_game(game, team1_id, team2_id, season_type):
-    """Process a single game and return its data"""
+DEFAULT_LAST_N = 10
+
+
+def team_logs_version(team_id, seasons, season_types):
+    return combined_version(
+        team_game_logs_version(team_id, season, season_type)
+        for season in seasons
+        for season_type in season_types
+    )
+
+
+# Per-team stats block of a matchup game
+TEAM_STATS = Projection(
+    {
+        "points": "PTS",
+        "field_goals_made": "FGM",
+        "field_goals_attempted": "FGA",
+        "field_goal_percentage": "FG_PCT",
+        "three_pointers_made": "FG3M",
+        "three_pointers_attempted": "FG3A",
+        "three_point_percentage": "FG3_PCT",
+        "free_throws_made": "FTM",
+        "free_throws_attempted": "FTA",
+        "free_throw_percentage": "FT_PCT",
+        "offensive_rebounds": "OREB",
+        "defensive_rebounds": "DREB",
+        "total_rebounds": "REB",
+        "assists": "AST",
+        "turnovers": "TOV",
+        "steals": "STL",
+        "blocks": "BLK",
+        "blocks_against": "BLKA",
+        "personal_fouls": "PF",
+        "personal_fouls_drawn": "PFD",
+        "plus_minus": "PLUS_MINUS",
+    },
+    defaults={
+        "turnovers": 0,
+        "steals": 0,
+        "blocks": 0,
+        "blocks_against": 0,
+        "personal_fouls": 0,
+        "personal_fouls_drawn": 0,
+        "plus_minus": 0,
+    },
+)
+
+MATCHUP_GAME = Projection(
+    {
+        "game_id": "GAME_ID",
+        "game_date": "GAME_DATE",
+        "matchup": "MATCHUP",
+        "result": "WL",
+    }
+)
+
+TEAM_GAME_LOG = Projection(
+    {
+        "game_id": "GAME_ID",
+        "game_date": "GAME_DATE",
+        "matchup": "MATCHUP",
+        "result": "WL",
+        "points": "PTS",
+        "field_goals_made": "FGM",
+        "field_goals_attempted": "FGA",
+        "field_goal_percentage": "FG_PCT",
+        "three_pointers_made": "FG3M",
+        "three_pointers_attempted": "FG3A",
+        "three_point_percentage": "FG3_PCT",
+        "free_throws_made": "FTM",
+        "free_throws_attempted": "FTA",
+        "free_throw_percentage": "FT_PCT",
+        "offensive_rebounds": "OREB",
+        "defensive_rebounds": "DREB",
+        "total_rebounds": "REB",
+        "assists": "AST",
+        "turnovers": "TOV",
+        "steals": "STL",
+        "blocks": "BLK",
+        "blocks_against": "BLKA",
+        "personal_fouls": "PF",
+        "personal_fouls_drawn": "PFD",
+        "plus_minus": "PLUS_MINUS",
+    }
+)
+
+
+def process_game(store, game_id, team1_id, team2_id, season_type):
+    """Process a single game from the season store and return its data"""
     try:
-        game_id = game["GAME_ID"]
-        logger.info(f"Processing game {game_id}")
-        
-        # Get box score data from cache
-        box_score_data = get_cached_box_score(game_id)
-        
         # Get stats for both teams
-        team1_stats = None
-        team2_stats = None
-        for team in box_score_data["TeamStats"]:
-            if team["TEAM_ID"] == team1_id:
-                team1_stats = {
-                    "points": team["PTS"],
-                    "field_goals_made": team["FGM"],
-                    "field_goals_attempted": team["FGA"],
-                    "field_goal_percentage": team["FG_PCT"],
-                    "three_pointers_made": team["FG3M"],
-                    "three_pointers_attempted": team["FG3A"],
-                    "three_point_percentage": team["FG3_PCT"],
-                    "free_throws_made": team["FTM"],
-                    "free_throws_attempted": team["FTA"],
-                    "free_throw_percentage": team["FT_PCT"],
-                    "offensive_rebounds": team["OREB"],
-                    "defensive_rebounds": team["DREB"],
-                    "total_rebounds": team["REB"],
-                    "assists": team["AST"],
-                    "turnovers": team.get("TOV", 0),
-                    "steals": team.get("STL", 0),
-                    "blocks": team.get("BLK", 0),
-                    "blocks_against": team.get("BLKA", 0),
-                    "personal_fouls": team.get("PF", 0),
-                    "personal_fouls_drawn": team.get("PFD", 0),
-                    "plus_minus": team.get("PLUS_MINUS", 0)
-                }
-            elif team["TEAM_ID"] == team2_id:
-                team2_stats = {
-                    "points": team["PTS"],
-                    "field_goals_made": team["FGM"],
-                    "field_goals_attempted": team["FGA"],
-                    "field_goal_percentage": team["FG_PCT"],
-                    "three_pointers_made": team["FG3M"],
-                    "three_pointers_attempted": team["FG3A"],
-                    "three_point_percentage": team["FG3_PCT"],
-                    "free_throws_made": team["FTM"],
-                    "free_throws_attempted": team["FTA"],
-                    "free_throw_percentage": team["FT_PCT"],
-                    "offensive_rebounds": team["OREB"],
-                    "defensive_rebounds": team["DREB"],
-                    "total_rebounds": team["REB"],
-                    "assists": team["AST"],
-                    "turnovers": team.get("TOV", 0),
-                    "steals": team.get("STL", 0),
-                    "blocks": team.get("BLK", 0),
-                    "blocks_against": team.get("BLKA", 0),
-                    "personal_fouls": team.get("PF", 0),
-                    "personal_fouls_drawn": team.get("PFD", 0),
-                    "plus_minus": team.get("PLUS_MINUS", 0)
-                }
-        
-        if team1_stats and team2_stats:
-            return {
-                "game_id": game["GAME_ID"],
-                "game_date": game["GAME_DATE"],
-                "matchup": game["MATCHUP"],
-                "result": game["WL"],
-                "team1_stats": team1_stats,
-                "team2_stats": team2_stats,
-                "season_type": season_type
-            }
+        team1 = store.team_stats(game_id, team1_id)
+        team2 = store.team_stats(game_id, team2_id)
+
+        if team1 and team2:
+            game_data = MATCHUP_GAME.compile(store.headers)(team1)
+            build_team_stats = TEAM_STATS.compile(store.headers)
+            game_data["team1_stats"] = build_team_stats(team1)
+            game_data["team2_stats"] = build_team_stats(team2)
+            game_data["season_type"] = season_type
+            return game_data
         return None
     except Exception as e:
-        logger.error(f"Error processing game {game.get('GAME_ID', 'unknown')}: {str(e)}")
+        logger.error(f"Error processing game {game_id}: {str(e)}")
         return None
 
+
+def get_team_season_games(team_id, season, season_type):
+    """Get one team's game log rows for a season and season type, None on error"""
+    games = None
+    try:
+        data = get_team_game_logs(team_id, season, season_type)
+
+        # Project the relevant game data straight from the raw rows
+        with timed("projection"):
+            games = list(
+                iter_team_log_rows(result_set(data, "TeamGameLogs"), season_type)
+            )
+    except Exception as e:
+        logger.error(
+            f"Error fetching {season} {season_type} games of team {team_id}: {str(e)}"
+        )
+    return games
+
+
+def iter_team_log_rows(table, season_type):
+    """Yield the projected rows of one game log table, most recent first"""
+    build = TEAM_GAME_LOG.compile(table["headers"])
+    for row in sort_rows(table, "GAME_DATE", reverse=True)["data"]:
+        game_data = build(row)
+        game_data["season_type"] = season_type
+        yield game_data
+
+
+def season_slices(seasons, season_types):
+    """Every (season, season type) pair of a request"""
+    return [(season, season_type) for season in seasons for season_type in season_types]
+
+
+def iter_team_games(team_id, seasons, season_types):
+    """Yield a team's games most recent first, one season at a time
+
+    The season types of a season are fetched concurrently, and the next season
+    while the current one is streamed, so at most two seasons are held. Failed
+    slices are skipped, as in the JSON response.
+    """
+    executor = get_executor()
+
+    def fetch(season):
+        return [
+            executor.submit(get_team_season_games, team_id, season, season_type)
+            for season_type in season_types
+        ]
+
+    newest_first = seasons[::-1]
+    pending = fetch(newest_first[0])
+    for next_season in newest_first[1:] + [None]:
+        current = pending
+        pending = fetch(next_season) if next_season is not None else None
+        yield from merge_by_date(future.result() or [] for future in current)
+
+
 @api.route("/<int:team_id>/games")
 class TeamGames(Resource):
     @api.doc(
         "get_team_games",
         params={
-            "season": "NBA season (e.g., 2023-24). Defaults to current season.",
-            "season_type": "Comma-separated list of game types (Regular Season, Playoffs, Pre Season, All Star). Defaults to Regular Season."
+            "season": "NBA season (e.g., 2023-24) or inclusive range (e.g., 2015-16..2023-24). Defaults to current season.",
+            "season_type": "Comma-separated list of game types (Regular Season, Playoffs, Pre Season, All Star). Defaults to Regular Season.",
+            "format": "json (default) or ndjson to stream one game per line, most recent first.",
         },
     )
     @api.response(200, "Success", team_games_response)
+    @api.response(304, "Not Modified")
+    @api.response(400, "Bad Request")
     @api.response(500, "Internal Server Error")
     def get(self, team_id):
         """Get game logs for a specific team"""
@@ -128,70 +231,166 @@ class TeamGames(Resource):
             # Get season from query parameter, default to current season
             season = request.args.get("season", SeasonAll.current_season)
             season_types = request.args.get("season_type", "Regular Season").split(",")
-            
-            # Get team's game logs for each season type and combine them
-            all_games = []
-            for season_type in season_types:
-                season_type = season_type.strip()  # Remove any whitespace
-                try:
-                    team_logs = TeamGameLogs(
-                        team_id_nullable=team_id,
-                        season_nullable=season,
-                        season_type_nullable=season_type
+            output_format = request.args.get("format", "json")
+            if output_format not in ("json", "ndjson"):
+                return {"error": "format must be json or ndjson"}, 400
+            try:
+                seasons = parse_seasons(season)
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            season_types = [season_type.strip() for season_type in season_types]
+            conditional = Conditional(
+                (
+                    "team_games",
+                    team_id,
+                    tuple(seasons),
+                    tuple(season_types),
+                    output_format,
+                ),
+                lambda: team_logs_version(team_id, seasons, season_types),
+                season_cache_control(seasons[-1]),
+            )
+
+            if output_format == "ndjson":
+                not_modified, headers = conditional.evaluate()
+                if not_modified is not None:
+                    return not_modified
+                games = iter_team_games(team_id, seasons, season_types)
+                return ndjson_response(games, headers)
+
+            def build():
+                # Fetch every season/season type slice in parallel on the shared executor
+                slices = season_slices(seasons, season_types)
+                slice_games = get_executor().map(
+                    lambda season, season_type: get_team_season_games(
+                        team_id, season, season_type
+                    ),
+                    *zip(*slices),
+                )
+                complete = None not in slice_games
+
+                # Each slice is most recent first: merge them instead of sorting
+                with timed("projection"):
+                    all_games = list(
+                        merge_by_date(games or [] for games in slice_games)
                     )
-                    
-                    # Get the data as a dictionary
-                    data = team_logs.get_normalized_dict()
-                    
-                    # Extract relevant game data
-                    for game in data["TeamGameLogs"]:
-                        game_data = {
-                            "game_id": game["GAME_ID"],
-                            "game_date": game["GAME_DATE"],
-                            "matchup": game["MATCHUP"],
-                            "result": game["WL"],
-                            "points": game["PTS"],
-                            "field_goals_made": game["FGM"],
-                            "field_goals_attempted": game["FGA"],
-                            "field_goal_percentage": game["FG_PCT"],
-                            "three_pointers_made": game["FG3M"],
-                            "three_pointers_attempted": game["FG3A"],
-                            "three_point_percentage": game["FG3_PCT"],
-                            "free_throws_made": game["FTM"],
-                            "free_throws_attempted": game["FTA"],
-                            "free_throw_percentage": game["FT_PCT"],
-                            "offensive_rebounds": game["OREB"],
-                            "defensive_rebounds": game["DREB"],
-                            "total_rebounds": game["REB"],
-                            "assists": game["AST"],
-                            "turnovers": game["TOV"],
-                            "steals": game["STL"],
-                            "blocks": game["BLK"],
-                            "blocks_against": game["BLKA"],
-                            "personal_fouls": game["PF"],
-                            "personal_fouls_drawn": game["PFD"],
-                            "plus_minus": game["PLUS_MINUS"],
-                            "season_type": season_type  # Add season type to each game
-                        }
-                        all_games.append(game_data)
-                except Exception as e:
-                    print(f"Error fetching {season_type} games: {str(e)}")
-                    continue
-            
-            # Sort games by date in reverse order (most recent first)
-            all_games.sort(key=lambda x: x["game_date"], reverse=True)
-            
-            return {
-                "team_id": team_id,
-                "season": season,
-                "season_types": season_types,
-                "games_played": len(all_games),
-                "games": all_games
-            }
-            
+
+                result = {
+                    "team_id": team_id,
+                    "season": season,
+                    "seasons": seasons,
+                    "season_types": season_types,
+                    "games_played": len(all_games),
+                    "games": all_games,
+                }
+                # Partial results are never cached
+                return result if complete else (result, 200)
+
+            # Logs of finished seasons never change: serve encoded bytes
+            return conditional_response(
+                conditional, build, cache=season_is_final(seasons[-1])
+            )
+
+        except Exception as e:
+            return {"error": str(e)}, 500
+
+
+@api.route("/<int:team_id>/aggregates")
+class TeamAggregates(Resource):
+    @api.doc(
+        "get_team_aggregates",
+        params={
+            "season": "NBA season (e.g., 2023-24). Defaults to current season.",
+            "season_type": "Comma-separated list of game types (Regular Season, Playoffs, Pre Season, All Star). Defaults to Regular Season.",
+            "last_n": f"Number of most recent games for the last-N split. Defaults to {DEFAULT_LAST_N}.",
+            "rolling": "Optional window size; include rolling averages over that many games.",
+        },
+    )
+    @api.response(200, "Success", team_aggregates_response)
+    @api.response(304, "Not Modified")
+    @api.response(400, "Bad Request")
+    @api.response(500, "Internal Server Error")
+    def get(self, team_id):
+        """Get season, last-N, home/away and win/loss aggregates for a team"""
+        try:
+            season = request.args.get("season", SeasonAll.current_season)
+            season_types = [
+                season_type.strip()
+                for season_type in request.args.get(
+                    "season_type", "Regular Season"
+                ).split(",")
+            ]
+            try:
+                last_n = int(request.args.get("last_n", DEFAULT_LAST_N))
+                rolling = request.args.get("rolling")
+                rolling = None if rolling is None else int(rolling)
+            except ValueError:
+                last_n = 0
+            if last_n < 1 or (rolling is not None and rolling < 1):
+                return {"error": "last_n and rolling must be positive integers"}, 400
+
+            def build():
+                columns = get_team_columns(team_id, season, season_types)
+                result = {
+                    "team_id": team_id,
+                    "season": season,
+                    "season_types": season_types,
+                }
+                result.update(columns.summary(last_n))
+                if rolling is not None:
+                    result["rolling"] = dict(
+                        window=rolling,
+                        game_ids=columns.game_ids[rolling - 1 :].tolist(),
+                        averages=columns.rolling_averages(rolling),
+                    )
+                return result
+
+            return conditional_response(
+                Conditional(
+                    (
+                        "team_aggregates",
+                        team_id,
+                        season,
+                        tuple(season_types),
+                        last_n,
+                        rolling,
+                    ),
+                    lambda: team_logs_version(team_id, [season], season_types),
+                    season_cache_control(season),
+                ),
+                build,
+                cache=season_is_final(season),
+            )
+
         except Exception as e:
             return {"error": str(e)}, 500
 
+
+def get_matchup_games(team1, team2, team1_id, team2_id, season, season_type):
+    """Get the processed games between two teams for a season and season type, None on error"""
+    all_games = None
+    try:
+        logger.info(f"Looking up {season_type} games between {team1} and {team2}")
+        # Season-wide store indexed by team pair
+        store = get_season_store(season, season_type)
+        game_ids = store.pair_games(team1_id, team2_id)
+        logger.info(f"Found {len(game_ids)} matchup games in {season_type}")
+
+        all_games = []
+        with timed("projection"):
+            for game_id in game_ids:
+                game_data = process_game(
+                    store, game_id, team1_id, team2_id, season_type
+                )
+                if game_data:
+                    all_games.append(game_data)
+
+    except Exception as e:
+        logger.error(f"Error fetching {season_type} games: {str(e)}")
+    return all_games
+
+
 @api.route("/matchups")
 class TeamMatchups(Resource):
     @api.doc(
@@ -200,10 +399,11 @@ class TeamMatchups(Resource):
             "team1": "First team abbreviation (e.g., BOS)",
             "team2": "Second team abbreviation (e.g., NYK)",
             "season": "NBA season (e.g., 2023-24). Defaults to current season.",
-            "season_type": "Comma-separated list of game types (Regular Season, Playoffs, Pre Season, All Star). Defaults to Regular Season."
+            "season_type": "Comma-separated list of game types (Regular Season, Playoffs, Pre Season, All Star). Defaults to Regular Season.",
         },
     )
     @api.response(200, "Success")
+    @api.response(304, "Not Modified")
     @api.response(400, "Invalid team abbreviation")
     @api.response(500, "Internal Server Error")
     def get(self):
@@ -212,74 +412,190 @@ class TeamMatchups(Resource):
             # Get team abbreviations from query parameters
             team1 = request.args.get("team1", "").upper()
             team2 = request.args.get("team2", "").upper()
-            
+
             logger.info(f"Received request for matchup between {team1} and {team2}")
-            
+
             if not team1 or not team2:
                 logger.error("Missing team parameters")
                 return {"error": "Both team1 and team2 parameters are required"}, 400
-                
+
             if team1 not in TEAM_ABBREVIATIONS or team2 not in TEAM_ABBREVIATIONS:
-                logger.error(f"Invalid team abbreviation. team1: {team1}, team2: {team2}")
-                return {"error": "Invalid team abbreviation. Use standard NBA team abbreviations (e.g., BOS, NYK)"}, 400
-                
+                logger.error(
+                    f"Invalid team abbreviation. team1: {team1}, team2: {team2}"
+                )
+                return {
+                    "error": "Invalid team abbreviation. Use standard NBA team abbreviations (e.g., BOS, NYK)"
+                }, 400
+
             team1_id = TEAM_ABBREVIATIONS[team1]
             team2_id = TEAM_ABBREVIATIONS[team2]
             logger.info(f"Team IDs - {team1}: {team1_id}, {team2}: {team2_id}")
-            
+
             # Get season from query parameter, default to current season
             season = request.args.get("season", SeasonAll.current_season)
             season_types = request.args.get("season_type", "Regular Season").split(",")
             logger.info(f"Fetching data for season {season} and types {season_types}")
-            
-            # Get games for both teams
-            all_games = []
-            for season_type in season_types:
-                season_type = season_type.strip()
-                try:
-                    logger.info(f"Fetching {season_type} games for {team1}")
-                    # Get team1's games from cache
-                    team1_data = get_cached_team_logs(team1_id, season, season_type)
-                    logger.info(f"Found {len(team1_data['TeamGameLogs'])} total games for {team1} in {season_type}")
-                    
-                    # Filter for games against team2
-                    matchup_games = []
-                    for game in team1_data["TeamGameLogs"]:
-                        matchup = game["MATCHUP"]
-                        if team2 in matchup:
-                            matchup_games.append(game)
-                    
-                    logger.info(f"Found {len(matchup_games)} matchup games in {season_type}")
-                    
-                    # Process games in parallel
-                    with ThreadPoolExecutor(max_workers=5) as executor:
-                        future_to_game = {
-                            executor.submit(process_game, game, team1_id, team2_id, season_type): game 
-                            for game in matchup_games
-                        }
-                        
-                        for future in as_completed(future_to_game):
-                            game_data = future.result()
-                            if game_data:
-                                all_games.append(game_data)
-                    
-                except Exception as e:
-                    logger.error(f"Error fetching {season_type} games: {str(e)}")
-                    continue
-            
-            # Sort games by date in reverse order (most recent first)
-            all_games.sort(key=lambda x: x["game_date"], reverse=True)
-            logger.info(f"Total games found: {len(all_games)}")
-            
+
+            season_types = [season_type.strip() for season_type in season_types]
+
+            def build():
+                # Get games for both teams, one season type per task on the shared executor,
+                # waiting for them no longer than the request deadline
+                with request_deadline():
+                    futures = [
+                        get_executor().submit(
+                            get_matchup_games,
+                            team1,
+                            team2,
+                            team1_id,
+                            team2_id,
+                            season,
+                            season_type,
+                        )
+                        for season_type in season_types
+                    ]
+                    pending = wait_until_deadline(futures)
+
+                all_games = []
+                missing_season_types = []
+                missing_game_ids = []
+                for season_type, future in zip(season_types, futures):
+                    games = None if future in pending else future.result()
+                    if games is None:
+                        missing_season_types.append(season_type)
+                        # Name the games an earlier ingest of this season type knew of
+                        store = held_season_store(season, season_type)
+                        if store is not None:
+                            missing_game_ids.extend(
+                                store.pair_games(team1_id, team2_id)
+                            )
+                        continue
+                    all_games.extend(games)
+                if missing_season_types:
+                    logger.warning(
+                        f"Matchup {team1}-{team2} is missing {', '.join(missing_season_types)} games"
+                    )
+
+                # Sort games by date in reverse order (most recent first)
+                all_games.sort(key=lambda x: x["game_date"], reverse=True)
+                logger.info(f"Total games found: {len(all_games)}")
+
+                result = {
+                    "team1": team1,
+                    "team2": team2,
+                    "season": season,
+                    "season_types": season_types,
+                    "games_played": len(all_games),
+                    "games": all_games,
+                    "partial": bool(missing_season_types),
+                    "missing_season_types": missing_season_types,
+                    "missing_game_ids": missing_game_ids,
+                }
+                # Partial results are never cached
+                return (result, 200) if missing_season_types else result
+
+            # Matchups of a finished season never change: serve encoded bytes
+            return conditional_response(
+                Conditional(
+                    ("team_matchups", team1, team2, season, tuple(season_types)),
+                    lambda: combined_version(
+                        league_team_logs_version(season, season_type)
+                        for season_type in season_types
+                    ),
+                    season_cache_control(season),
+                ),
+                build,
+                cache=season_is_final(season),
+            )
+
+        except Exception as e:
+            logger.error(f"Error in get_team_matchups: {str(e)}")
+            return {"error": str(e)}, 500
+
+
+def build_team_batch_item(team_id, slices, fetched):
+    """Assemble one batch result from the fetched game logs"""
+    item = {"team_id": team_id}
+    errors = []
+    games = []
+    for season, season_type in slices:
+        data, error = fetched[(get_team_game_logs, team_id, season, season_type)]
+        if error is not None:
+            errors.append(
+                {"season": season, "season_type": season_type, "error": error}
+            )
+        else:
+            games.append(
+                iter_team_log_rows(result_set(data, "TeamGameLogs"), season_type)
+            )
+
+    item["games"] = list(merge_by_date(games))
+    item["games_played"] = len(item["games"])
+    if errors:
+        item["errors"] = errors
+    return item
+
+
+@api.route("/batch")
+class TeamBatch(Resource):
+    @api.doc("get_team_batch")
+    @api.expect(team_batch_request)
+    @api.response(200, "Success", team_batch_response)
+    @api.response(400, "Bad Request")
+    @api.response(500, "Internal Server Error")
+    def post(self):
+        """Get game logs for many teams in one call"""
+        try:
+            body = request.get_json(silent=True) or {}
+            team_ids = body.get("team_ids")
+            if isinstance(team_ids, list):
+                # Accept abbreviations alongside numeric IDs
+                team_ids = [
+                    (
+                        TEAM_ABBREVIATIONS.get(team_id.upper(), team_id)
+                        if isinstance(team_id, str)
+                        else team_id
+                    )
+                    for team_id in team_ids
+                ]
+            team_ids = parse_ids(team_ids, "team_ids")
+            season = body.get("season", SeasonAll.current_season)
+            seasons = parse_season_list(season)
+            season_types = body.get("season_types", ["Regular Season"])
+            if (
+                not isinstance(season_types, list)
+                or not season_types
+                or not all(isinstance(season_type, str) for season_type in season_types)
+            ):
+                return {
+                    "error": "season_types must be a non-empty list of strings"
+                }, 400
+            season_types = [season_type.strip() for season_type in season_types]
+
+            # Every distinct upstream call runs once, in parallel on the shared executor
+            slices = season_slices(seasons, season_types)
+            with request_deadline():
+                fetched = fetch_all(
+                    (get_team_game_logs, team_id, season, season_type)
+                    for team_id in team_ids
+                    for season, season_type in slices
+                )
+
+            results = [
+                build_team_batch_item(team_id, slices, fetched) for team_id in team_ids
+            ]
             return {
-                "team1": team1,
-                "team2": team2,
                 "season": season,
+                "seasons": seasons,
                 "season_types": season_types,
-                "games_played": len(all_games),
-                "games": all_games
+                "count": len(results),
+                "failed": sum(1 for item in results if "errors" in item),
+                "partial": is_partial(fetched),
+                "results": results,
             }
-            
+
+        except BatchError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
-            logger.error(f"Error in get_team_matchups: {str(e)}")
+            logger.error(f"Error in get_team_batch: {str(e)}")
             return {"error": str(e)}, 500
@@ -0,0 +1,89 @@
+"""
+Fan-out helpers for the batch endpoints.
+
+A batch request is reduced to the set of distinct upstream fetches it
+needs, so repeated IDs or seasons cost one call. The fetches run once on
+the shared executor, each through the stats cache, and failures are kept
+per fetch so one bad item never fails the whole batch. Fetches still
+running when the request deadline passes are reported as missed rather
+than waited for.
+"""
+
+from app.services.deadline import DeadlineExceeded, wait_until_deadline
+from app.services.executor import get_executor
+from app.utils.seasons import parse_seasons
+
+# Most distinct IDs a single batch request may name
+DEFAULT_MAX_ITEMS = 500
+
+DEADLINE_MISSED = "Not finished within the request deadline"
+
+
+class BatchError(ValueError):
+    """Raised for batch requests that cannot be run"""
+
+
+def unique(values):
+    """Return values without duplicates, keeping their first order"""
+    return list(dict.fromkeys(values))
+
+
+def parse_ids(values, name, max_items=DEFAULT_MAX_ITEMS):
+    """Validate a list of integer IDs and drop duplicates"""
+    if not isinstance(values, list) or not values:
+        raise BatchError(f"{name} must be a non-empty list")
+    ids = []
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise BatchError(f"Invalid {name} entry: {value!r}")
+        try:
+            ids.append(int(value))
+        except ValueError:
+            raise BatchError(f"Invalid {name} entry: {value!r}") from None
+    ids = unique(ids)
+    if len(ids) > max_items:
+        raise BatchError(f"{name} can name at most {max_items} distinct IDs")
+    return ids
+
+
+def parse_season_list(value):
+    """Expand a season, a range or a list of either, oldest first"""
+    values = value if isinstance(value, list) else [value]
+    if not values or not all(isinstance(season, str) for season in values):
+        raise BatchError("season must be a season string or a list of them")
+    try:
+        seasons = [season for value in values for season in parse_seasons(value)]
+    except ValueError as e:
+        raise BatchError(str(e)) from None
+    return sorted(unique(seasons))
+
+
+def _attempt(call):
+    fn, *args = call
+    try:
+        return fn(*args), None
+    except DeadlineExceeded:
+        return None, DEADLINE_MISSED
+    except Exception as e:
+        return None, str(e)
+
+
+def fetch_all(calls):
+    """Run each distinct ``(fn, *args)`` call once, all in parallel
+
+    Returns a dict of call to ``(result, error)``; error is None on success
+    and ``DEADLINE_MISSED`` for calls cut off by the request deadline.
+    """
+    calls = unique(calls)
+    executor = get_executor()
+    futures = [executor.submit(_attempt, call) for call in calls]
+    pending = wait_until_deadline(futures)
+    return {
+        call: (None, DEADLINE_MISSED) if future in pending else future.result()
+        for call, future in zip(calls, futures)
+    }
+
+
+def is_partial(fetched):
+    """Whether any call of a ``fetch_all`` result missed the deadline"""
+    return any(error == DEADLINE_MISSED for _, error in fetched.values())
@@ -0,0 +1,265 @@
+"""
+Pre-tipoff cache warming for today's games.
+
+The first request for a matchup used to pay for its upstream calls, and
+those requests cluster in the minutes before tipoff. The warmer reads
+today's games from ``get_today_games`` and, ``lead_time`` seconds before
+each scheduled tipoff, reloads both teams' game logs, the season store
+used by ``/teams/matchups`` and the logs and bios of both rosters, so
+peak-time requests are cache hits. Game logs that would expire before
+tipoff are reloaded, so they stay fresh through the game's first minutes;
+each worker runs a warmer, but a reload is leased across the workers
+sharing the stats cache and skipped once another worker has made it.
+"""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from nba_api.stats.library.parameters import SeasonAll
+
+from app.services.batch import unique
+from app.services.game_service import get_today_games
+from app.services.nba_stats import (
+    get_player_game_logs,
+    get_player_info,
+    get_team_game_logs,
+)
+from app.services.player_index import get_player_index
+from app.services.season_store import get_season_store
+from app.services.stats_cache import CURRENT_SEASON_LOGS_TTL
+
+try:
+    from zoneinfo import ZoneInfo
+
+    EASTERN = ZoneInfo("America/New_York")
+except Exception:  # pragma: no cover - no tz database
+    EASTERN = None
+
+logger = logging.getLogger(__name__)
+
+# Warm early enough to finish before tipoff, late enough that the reloaded
+# current-season logs are still fresh when the game starts
+DEFAULT_LEAD_TIME = CURRENT_SEASON_LOGS_TTL * 2 // 3
+DEFAULT_CONCURRENCY = 4
+DEFAULT_INTERVAL = 60
+DEFAULT_MAX_PLAYERS_PER_TEAM = 15
+
+# GAME_STATUS_TEXT of a scheduled game, e.g. "7:30 pm ET"
+TIPOFF_PATTERN = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*([ap])m\s*ET\s*$", re.IGNORECASE)
+
+
+def tipoff_time(game):
+    """Return a scheduled game's tipoff as a Unix timestamp, None if not scheduled"""
+    match = TIPOFF_PATTERN.match(game.get("game_status") or "")
+    if match is None or EASTERN is None:
+        return None
+    hour, minute, half = int(match.group(1)), int(match.group(2)), match.group(3)
+    hour = hour % 12 + (12 if half.lower() == "p" else 0)
+    day = datetime.fromisoformat(game["game_date"][:10])
+    tipoff = day.replace(hour=hour, minute=minute, tzinfo=EASTERN)
+    return tipoff.timestamp()
+
+
+def _attempt(call):
+    fn, *args = call
+    try:
+        fn(*args)
+        return None
+    except Exception as e:
+        return str(e)
+
+
+class CacheWarmer:
+    """Prefetches upstream data for games about to tip off"""
+
+    def __init__(
+        self,
+        lead_time=DEFAULT_LEAD_TIME,
+        concurrency=DEFAULT_CONCURRENCY,
+        interval=DEFAULT_INTERVAL,
+        season=None,
+        season_types=("Regular Season",),
+        max_players_per_team=DEFAULT_MAX_PLAYERS_PER_TEAM,
+    ):
+        self.lead_time = lead_time
+        self.concurrency = concurrency
+        self.interval = interval
+        self.season = season or SeasonAll.current_season
+        self.season_types = list(season_types)
+        self.max_players_per_team = max_players_per_team
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="cache-warmer"
+        )
+        self._warmed = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._calls = 0
+        self._errors = 0
+        self._last_run = None
+        self._last_duration = None
+
+    def calls_by_game(self, games):
+        """Return the upstream calls that warm each game, keyed by game ID"""
+        season_calls = [
+            (get_season_store, self.season, season_type)
+            for season_type in self.season_types
+        ]
+
+        index = None
+        if self.max_players_per_team:
+            try:
+                index = get_player_index()
+            except Exception as e:
+                logger.error(f"Player index not available for warming: {str(e)}")
+
+        calls = {}
+        for game in games:
+            game_calls = list(season_calls)
+            for team in (game["home_team"], game["visitor_team"]):
+                team_id = team["id"]
+                for season_type in self.season_types:
+                    game_calls.append(
+                        (
+                            get_team_game_logs,
+                            team_id,
+                            self.season,
+                            season_type,
+                            self.lead_time,
+                        )
+                    )
+                if index is None:
+                    continue
+                for player_id in index.roster(team_id)[: self.max_players_per_team]:
+                    game_calls.append(
+                        (get_player_game_logs, player_id, self.season, self.lead_time)
+                    )
+                    game_calls.append((get_player_info, player_id))
+            calls[game["game_id"]] = game_calls
+        return calls
+
+    def calls_for(self, games):
+        """Return the distinct upstream calls that warm the given games"""
+        return unique(
+            call for calls in self.calls_by_game(games).values() for call in calls
+        )
+
+    def warm(self, games):
+        """Run every call needed for the games; returns the games fully warmed"""
+        calls_by_game = self.calls_by_game(games)
+        calls = unique(call for calls in calls_by_game.values() for call in calls)
+        errors = list(self._pool.map(_attempt, calls))
+        failed = {call for call, error in zip(calls, errors) if error}
+        for error in [error for error in errors if error][:5]:
+            logger.error(f"Error warming cache: {error}")
+        with self._lock:
+            self._calls += len(calls)
+            self._errors += len(failed)
+        return [
+            game
+            for game in games
+            if not failed.intersection(calls_by_game[game["game_id"]])
+        ]
+
+    def due_games(self, games, now=None):
+        """Split today's games into those due for warming and the next due time"""
+        now = time.time() if now is None else now
+        due, next_due = [], None
+        for game in games:
+            if game["game_id"] in self._warmed:
+                continue
+            tipoff = tipoff_time(game)
+            if tipoff is None:
+                continue
+            warm_at = tipoff - self.lead_time
+            if warm_at <= now < tipoff:
+                due.append(game)
+            elif now < warm_at:
+                next_due = warm_at if next_due is None else min(next_due, warm_at)
+        return due, next_due
+
+    def run_once(self):
+        """Warm every game that is due; returns seconds until the next check"""
+        today = get_today_games()
+        with self._lock:
+            # Forget games from previous days
+            self._warmed = {
+                game_id: date
+                for game_id, date in self._warmed.items()
+                if date == today["date"]
+            }
+
+        due, next_due = self.due_games(today["games"])
+        if due:
+            started = time.perf_counter()
+            # Games with failed calls stay due and are retried next interval
+            warmed = self.warm(due)
+            with self._lock:
+                for game in warmed:
+                    self._warmed[game["game_id"]] = today["date"]
+                self._last_run = time.time()
+                self._last_duration = time.perf_counter() - started
+            logger.info(f"Warmed caches for {len(warmed)}/{len(due)} games")
+
+        if next_due is None:
+            return self.interval
+        return max(0, min(self.interval, next_due - time.time()))
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                delay = self.run_once()
+            except Exception as e:
+                logger.error(f"Error in cache warmer: {str(e)}")
+                delay = self.interval
+            self._stop_event.wait(delay)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="cache-warmer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._pool.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "lead_time": self.lead_time,
+                "concurrency": self.concurrency,
+                "season": self.season,
+                "games_warmed": len(self._warmed),
+                "calls": self._calls,
+                "errors": self._errors,
+                "last_run": self._last_run,
+                "last_duration": self._last_duration,
+            }
+
+
+_warmer = None
+
+
+def start_cache_warmer(**kwargs):
+    """Start the process-wide pre-tipoff cache warmer"""
+    global _warmer
+    if _warmer is not None:
+        _warmer.stop()
+    _warmer = CacheWarmer(**kwargs).start()
+    return _warmer
+
+
+def get_cache_warmer():
+    """Return the running warmer, or None if warming is disabled"""
+    return _warmer
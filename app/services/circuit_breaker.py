@@ -0,0 +1,87 @@
+"""
+Circuit breaker for upstream requests.
+
+After ``failure_threshold`` consecutive failures the circuit opens and
+calls are refused immediately instead of waiting on a failing upstream.
+After ``reset_timeout`` seconds one probe call is let through; its success
+closes the circuit again, its failure reopens it for another timeout.
+"""
+
+import threading
+import time
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(
+        self,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout=DEFAULT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trips = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return whether a call may be made now"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if (
+                self._state == OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                # Let a single probe through
+                self._state = HALF_OPEN
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._trips += 1
+
+    @property
+    def state(self):
+        return self._state
+
+    def stats(self):
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(
+                    0.0, self.reset_timeout - (time.monotonic() - self._opened_at)
+                )
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": retry_in,
+                "trips": self._trips,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,97 @@
+"""
+Per-request deadline budgets for fan-out endpoints.
+
+A fan-out endpoint runs inside ``request_deadline()``, which puts a
+``Deadline`` in a context variable. The shared executor runs tasks in a
+copy of the submitting context, so every task of the fan-out sees the same
+deadline: the upstream gateway hedges their calls, stops waiting on them
+when the budget is spent and refuses new ones after that, waits for
+another thread's or worker's fetch of the same call end there too, and
+``cached_fetch`` then falls back to stored data where it has any. The
+route stops waiting for its tasks when the deadline passes and answers
+with what has finished, marked as partial.
+
+Upstream requests are not cancelled: one already sent still completes and
+answers any other caller sharing it.
+"""
+
+import concurrent.futures
+import contextvars
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUDGET = 10.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is started or waited on after the request deadline"""
+
+
+class Deadline:
+    """An absolute point in time on the monotonic clock"""
+
+    __slots__ = ("budget", "expires_at")
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+
+_current = contextvars.ContextVar("request_deadline", default=None)
+_budget = DEFAULT_BUDGET
+
+
+def init_request_deadlines(budget=DEFAULT_BUDGET):
+    """Set the budget of fan-out requests in seconds; None disables deadlines"""
+    global _budget
+    _budget = budget
+
+
+def current_deadline():
+    return _current.get()
+
+
+def remaining(default=None):
+    """Return the seconds left before the current deadline, or ``default``"""
+    deadline = _current.get()
+    return default if deadline is None else deadline.remaining()
+
+
+def check_deadline(what="request"):
+    """Raise DeadlineExceeded if the current deadline has passed"""
+    deadline = _current.get()
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded(
+            f"{what} not started: {deadline.budget:g}s request deadline exceeded"
+        )
+
+
+@contextmanager
+def request_deadline(budget=None):
+    """Run a block under a deadline of ``budget`` seconds (the configured one by default)
+
+    An enclosing deadline that expires sooner is kept.
+    """
+    budget = _budget if budget is None else budget
+    outer = _current.get()
+    if budget is None or (outer is not None and outer.remaining() <= budget):
+        yield outer
+        return
+    deadline = Deadline(budget)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def wait_until_deadline(futures):
+    """Wait for futures until the current deadline; return the unfinished ones"""
+    _, pending = concurrent.futures.wait(futures, timeout=remaining())
+    return pending
@@ -0,0 +1,141 @@
+"""
+Process-wide bounded executor for route fan-out.
+
+Every route that runs work in parallel submits it here instead of creating
+its own thread pool, so the number of threads is fixed for the process.
+When the queue is full the task runs in the calling thread, which applies
+backpressure without deadlocking.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_MAX_QUEUE = 256
+
+
+class SharedExecutor:
+    """Bounded thread pool with queue depth and wait time accounting"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_queue=DEFAULT_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fanout"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._submitted = 0
+        self._ran_inline = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule ``fn`` and return a Future for its result
+
+        ``fn`` runs in a copy of the caller's context, so request-scoped
+        context variables such as the timing collector follow the task.
+        """
+        context = contextvars.copy_context()
+        if not self._slots.acquire(blocking=False):
+            # Queue is full: run in the caller's thread
+            with self._lock:
+                self._ran_inline += 1
+            future = Future()
+            try:
+                future.set_result(context.run(fn, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+
+        def run():
+            wait = time.perf_counter() - enqueued_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._slots.release()
+
+        return self._pool().submit(run)
+
+    def map(self, fn, *iterables):
+        """Run ``fn`` over the iterables in parallel and return results in order"""
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+        return [future.result() for future in futures]
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="fanout"
+                )
+            return self._executor
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads; the next submitted task starts new ones"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self):
+        """Return queue depth, active workers and wait time counters"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "submitted": self._submitted,
+                "ran_inline": self._ran_inline,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+                "wait_seconds_avg": (
+                    self._wait_total / self._submitted if self._submitted else 0.0
+                ),
+            }
+
+
+_executor = None
+
+
+def init_executor(max_workers=DEFAULT_MAX_WORKERS, max_queue=DEFAULT_MAX_QUEUE):
+    """Create the executor shared by all routes"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = SharedExecutor(max_workers=max_workers, max_queue=max_queue)
+    return _executor
+
+
+def get_executor():
+    """Return the shared executor, creating a default one if needed"""
+    if _executor is None:
+        init_executor()
+    return _executor
+
+
+def _reset_after_fork():
+    # Worker threads are not copied into the child
+    global _executor
+    if _executor is not None:
+        _executor = SharedExecutor(_executor.max_workers, _executor.max_queue)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
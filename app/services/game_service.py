@@ -1,12 +1,40 @@
 from datetime import datetime
-from nba_api.stats.endpoints import ScoreboardV2
+from app.services.metrics import timed
+from app.services.nba_stats import get_scoreboard
+from app.services.scoreboard_poller import get_scoreboard_poller, today_string
 from app.utils.games_util import extract_game_data
 
 
-def get_today_games():
-    today_str = datetime.now().strftime("%m/%d/%Y")
-    scoreboard = ScoreboardV2(game_date=today_str)
-    data = scoreboard.get_normalized_dict()
+def today_snapshot():
+    """The poller's snapshot of today's games, or None if it has none for today"""
+    poller = get_scoreboard_poller()
+    snapshot = poller.snapshot if poller is not None else None
+    if snapshot is None or snapshot["date"] != today_string():
+        return None
+    return snapshot
 
-    extracted_data = extract_game_data(data)
-    return {"date": today_str, "games": extracted_data}
+
+def get_today_games(snapshot=None):
+    # Serve the poller's in-memory snapshot when it is current; callers that
+    # already read it pass it in so they describe the same games
+    if snapshot is None:
+        snapshot = today_snapshot()
+    if snapshot is not None:
+        return {
+            "date": snapshot["date"],
+            "version": snapshot["version"],
+            "fetched_at": snapshot["fetched_at"],
+            "games": snapshot["games"],
+        }
+
+    today_str = today_string()
+    data = get_scoreboard(today_str)
+
+    with timed("projection"):
+        extracted_data = extract_game_data(data)
+    return {
+        "date": today_str,
+        "version": None,
+        "fetched_at": datetime.now().isoformat(),
+        "games": extracted_data,
+    }
@@ -0,0 +1,189 @@
+"""
+Byte-budgeted in-memory cache for projected upstream data.
+
+Values are compact projections (NumPy columns rather than row dicts) that
+report their own size in ``nbytes``, and the cache keeps as many as fit in
+one byte budget shared by every namespace. Eviction is least recently
+used, but a new entry only displaces older ones if it has been asked for
+more often than each of them (TinyLFU). Access frequencies, misses
+included, are kept in a small count-min sketch that is halved periodically
+so old popularity fades. A one-off scan, such as every player of a
+league-wide batch, cannot flush the working set this way.
+
+Hits, misses, evictions and rejected admissions are counted per namespace.
+"""
+
+import random
+import threading
+from array import array
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_SKETCH_WIDTH = 1 << 14
+SKETCH_DEPTH = 4
+# Counters saturate here, like the 4-bit counters of the TinyLFU paper
+SKETCH_MAX_COUNT = 15
+
+
+class FrequencySketch:
+    """Count-min sketch of recent access frequencies, aged by halving"""
+
+    def __init__(self, width=DEFAULT_SKETCH_WIDTH, seed=None):
+        self.width = width
+        rng = random.Random(seed)
+        self._seeds = [rng.getrandbits(32) for _ in range(SKETCH_DEPTH)]
+        self._rows = [array("B", bytes(width)) for _ in range(SKETCH_DEPTH)]
+        self._additions = 0
+        self._sample_size = 10 * width
+
+    def _slots(self, key):
+        h = hash(key)
+        return [hash((seed, h)) % self.width for seed in self._seeds]
+
+    def increment(self, key):
+        for row, slot in zip(self._rows, self._slots(key)):
+            if row[slot] < SKETCH_MAX_COUNT:
+                row[slot] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key):
+        return min(row[slot] for row, slot in zip(self._rows, self._slots(key)))
+
+    def _age(self):
+        self._rows = [array("B", bytes(b >> 1 for b in row)) for row in self._rows]
+        self._additions //= 2
+
+
+class MemoryCache:
+    """Size-aware LRU with TinyLFU admission, shared by several namespaces"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._sketch = FrequencySketch()
+        self._lock = threading.Lock()
+        self._namespaces = {}
+
+    def _stats(self, namespace):
+        stats = self._namespaces.get(namespace)
+        if stats is None:
+            stats = self._namespaces[namespace] = {
+                "entries": 0,
+                "bytes": 0,
+                "hits": 0,
+                "misses": 0,
+                "evictions": 0,
+                "rejected": 0,
+            }
+        return stats
+
+    def get(self, namespace, key):
+        """Return the cached value, or None"""
+        entry_key = (namespace, key)
+        with self._lock:
+            self._sketch.increment(entry_key)
+            stats = self._stats(namespace)
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                stats["misses"] += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            stats["hits"] += 1
+            return entry[0]
+
+    def put(self, namespace, key, value, size=None):
+        """Store ``value`` unless it loses admission; returns whether it was kept
+
+        ``size`` defaults to the value's ``nbytes``.
+        """
+        entry_key = (namespace, key)
+        size = value.nbytes if size is None else size
+        with self._lock:
+            stats = self._stats(namespace)
+            replaced = self._entries.pop(entry_key, None)
+            if replaced is not None:
+                self._forget(namespace, replaced[1])
+            if size > self.max_bytes:
+                stats["rejected"] += 1
+                return False
+
+            # Least recently used entries that must go to make room
+            victims = []
+            needed = self._bytes + size - self.max_bytes
+            for victim_key, (_, victim_size) in self._entries.items():
+                if needed <= 0:
+                    break
+                victims.append(victim_key)
+                needed -= victim_size
+
+            if victims and replaced is None:
+                frequency = self._sketch.estimate(entry_key)
+                if any(self._sketch.estimate(v) >= frequency for v in victims):
+                    stats["rejected"] += 1
+                    return False
+
+            for victim_key in victims:
+                _, victim_size = self._entries.pop(victim_key)
+                self._forget(victim_key[0], victim_size)
+                self._stats(victim_key[0])["evictions"] += 1
+
+            self._entries[entry_key] = (value, size)
+            self._bytes += size
+            stats["entries"] += 1
+            stats["bytes"] += size
+            return True
+
+    def _forget(self, namespace, size):
+        stats = self._stats(namespace)
+        stats["entries"] -= 1
+        stats["bytes"] -= size
+        self._bytes -= size
+
+    def discard(self, namespace, key):
+        with self._lock:
+            entry = self._entries.pop((namespace, key), None)
+            if entry is not None:
+                self._forget(namespace, entry[1])
+
+    def clear(self, namespace=None):
+        """Drop every entry, or only those of one namespace"""
+        with self._lock:
+            for entry_key in list(self._entries):
+                if namespace is None or entry_key[0] == namespace:
+                    _, size = self._entries.pop(entry_key)
+                    self._forget(entry_key[0], size)
+
+    def stats(self):
+        """Return the budget, total size and per-namespace counters"""
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._namespaces.items():
+                counters = dict(counters)
+                lookups = counters["hits"] + counters["misses"]
+                counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+                namespaces[namespace] = counters
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self._bytes,
+                "entries": len(self._entries),
+                "namespaces": namespaces,
+            }
+
+
+_cache = None
+
+
+def init_memory_cache(max_bytes=DEFAULT_MAX_BYTES):
+    """Create the process-wide cache of projected data"""
+    global _cache
+    _cache = MemoryCache(max_bytes)
+    return _cache
+
+
+def get_memory_cache():
+    if _cache is None:
+        init_memory_cache()
+    return _cache
@@ -0,0 +1,305 @@
+"""
+Request timing breakdown and Prometheus-style metrics.
+
+Each request gets a ``RequestTimings`` in a context variable. Upstream
+calls, cache lookups, projection and serialization add their durations to
+it, including work done on the shared executor, which runs tasks in a copy
+of the submitting context. The totals are returned in a ``Server-Timing``
+header; phases that run in parallel are summed, so they can exceed the
+request's wall time.
+
+The same measurements feed process-wide counters and histograms, labelled
+by route, upstream endpoint and cache, rendered in the Prometheus text
+format at ``/metrics``.
+
+Requests answered with expired upstream data are marked with a ``Warning``
+and an ``X-Stale-Data-Age`` header giving the age of the oldest data used.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram buckets in seconds
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Server-Timing entries in header order
+TIMING_PHASES = ("upstream", "cache", "projection", "serialize", "compress")
+
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+class RequestTimings:
+    """Durations and counts per phase of one request"""
+
+    __slots__ = ("durations", "counts", "stale_age", "_lock")
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        self.stale_age = None
+        self._lock = threading.Lock()
+
+    def add(self, phase, seconds):
+        with self._lock:
+            self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def mark_stale(self, age):
+        with self._lock:
+            self.stale_age = max(age, self.stale_age or 0.0)
+
+    def header(self, total=None):
+        """Return a Server-Timing header value"""
+        with self._lock:
+            entries = []
+            for phase in TIMING_PHASES:
+                if phase in self.durations:
+                    entries.append(
+                        f"{phase};dur={self.durations[phase] * 1000:.2f};"
+                        f'desc="{self.counts[phase]}x"'
+                    )
+        if total is not None:
+            entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+def start_request_timings():
+    """Begin collecting timings for the current request; returns a reset token"""
+    return _current.set(RequestTimings())
+
+
+def current_timings():
+    return _current.get()
+
+
+def end_request_timings(token):
+    _current.reset(token)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts, then the running sum and count
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(
+                        f"{self.name}_bucket{_labels(names, labels + (bound,))} {cumulative}"
+                    )
+                lines.append(
+                    f"{self.name}_bucket{_labels(names, labels + ('+Inf',))} {series[-1]}"
+                )
+                label_text = _labels(self.labels, labels)
+                lines.append(f"{self.name}_sum{label_text} {series[-2]}")
+                lines.append(f"{self.name}_count{label_text} {series[-1]}")
+        return lines
+
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status",
+    ("route", "method", "status"),
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to build a response", ("route",)
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total", "Calls to stats.nba.com", ("endpoint", "outcome")
+)
+UPSTREAM_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Duration of stats.nba.com calls",
+    ("endpoint",),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total", "Cache lookups by cache and result", ("cache", "result")
+)
+CACHE_DURATION = Histogram(
+    "cache_lookup_duration_seconds", "Duration of cache lookups", ("cache",)
+)
+PHASE_DURATION = Histogram(
+    "phase_duration_seconds",
+    "Duration of projection and serialization work",
+    ("phase",),
+)
+STALE_SERVED = Counter(
+    "stale_data_served_total",
+    "Expired upstream data served while revalidating or failing",
+    ("endpoint", "reason"),
+)
+
+METRICS = (
+    REQUESTS,
+    REQUEST_DURATION,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_DURATION,
+    CACHE_LOOKUPS,
+    CACHE_DURATION,
+    PHASE_DURATION,
+    STALE_SERVED,
+)
+
+
+def _record(phase, seconds):
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def record_upstream(endpoint, seconds, error=False):
+    UPSTREAM_REQUESTS.inc(endpoint, "error" if error else "ok")
+    UPSTREAM_DURATION.observe(seconds, endpoint)
+    _record("upstream", seconds)
+
+
+def record_cache(cache, seconds, hit):
+    CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+    CACHE_DURATION.observe(seconds, cache)
+    _record("cache", seconds)
+
+
+def record_stale(endpoint, age, reason):
+    STALE_SERVED.inc(endpoint, reason)
+    timings = _current.get()
+    if timings is not None:
+        timings.mark_stale(age)
+
+
+def record_phase(phase, seconds):
+    PHASE_DURATION.observe(seconds, phase)
+    _record(phase, seconds)
+
+
+@contextmanager
+def timed(phase):
+    """Time a block of projection, serialization or compression work"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
+
+
+def record_request(route, method, status, seconds):
+    REQUESTS.inc(route, method, str(status))
+    REQUEST_DURATION.observe(seconds, route)
+
+
+def render_metrics():
+    """Return every metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def init_request_metrics(app, server_timing=True):
+    """Time every request of ``app`` and add a Server-Timing header"""
+    from flask import g, request
+
+    @app.before_request
+    def start_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_token = start_request_timings()
+
+    @app.after_request
+    def record_response(response):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        record_request(route, request.method, response.status_code, elapsed)
+        timings = current_timings()
+        if timings is None:
+            return response
+        if server_timing:
+            response.headers["Server-Timing"] = timings.header(elapsed)
+        if timings.stale_age is not None:
+            response.headers["Warning"] = STALE_WARNING
+            response.headers["X-Stale-Data-Age"] = str(int(timings.stale_age))
+        return response
+
+    @app.teardown_request
+    def end_timer(exc=None):
+        token = g.pop("metrics_token", None)
+        if token is not None:
+            try:
+                end_request_timings(token)
+            except ValueError:
+                # Torn down in a different context than it was started in
+                pass
@@ -0,0 +1,425 @@
+"""
+Cached access to the stats.nba.com endpoints used by the routes.
+
+Every upstream call made by the app goes through one of the functions below
+so it is served from the persistent ``StatsCache`` whenever possible, and
+concurrent misses for the same call are coalesced into one upstream request.
+Cache misses are fetched through the pooled ``StatsGateway``.
+
+Expired entries are stale-while-revalidate: within the cache's stale window
+they are returned at once while one background refresh runs. When a fetch
+fails, including while the gateway's circuit is open, the last stored data
+is returned instead of the error, however old.
+
+Coalesced callers may run under different request deadlines. A caller
+waits on another's load only until its own deadline, and one that waited
+on a load which ran out of its leader's deadline loads the call again
+while its own deadline allows, rather than failing with it.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nba_api.stats.endpoints import (
+    CommonAllPlayers,
+    CommonPlayerInfo,
+    PlayerGameLogs,
+    ScoreboardV2,
+    TeamGameLogs,
+)
+
+from app.services.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    current_deadline,
+    remaining,
+)
+from app.services.metrics import record_cache, record_stale, record_upstream
+from app.services.single_flight import SingleFlight, WaitTimeout
+from app.services.stats_cache import StatsCache, make_key, ttl_for
+from app.services.stats_gateway import get_stats_gateway
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join("instance", "stats_cache.sqlite3")
+
+# Threads refreshing stale entries in the background
+REVALIDATE_WORKERS = 4
+
+_cache = None
+_single_flight = SingleFlight()
+_revalidator = None
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def init_stats_cache(path, **kwargs):
+    """Open the persistent cache used by all upstream calls"""
+    global _cache
+    _cache = StatsCache(path, **kwargs)
+    logger.info(f"Using stats cache at {path}")
+    return _cache
+
+
+def get_stats_cache():
+    """Return the active cache, opening the default one if needed"""
+    if _cache is None:
+        init_stats_cache(os.environ.get("STATS_CACHE_PATH", DEFAULT_CACHE_PATH))
+    return _cache
+
+
+def _reopen_after_fork():
+    # SQLite connections and the revalidation threads stay in the parent
+    global _cache, _revalidator
+    _revalidator = None
+    _revalidating.clear()
+    if _cache is not None:
+        _cache = StatsCache(
+            _cache.path,
+            _cache.mmap_size,
+            _cache.busy_timeout,
+            _cache.fill_lease,
+            _cache.stale_window,
+        )
+
+
+os.register_at_fork(after_in_child=_reopen_after_fork)
+
+
+def get_single_flight():
+    """Return the coalescing group shared by all upstream calls"""
+    return _single_flight
+
+
+def _cache_get(cache, endpoint, params, record=True):
+    started = time.perf_counter()
+    data = cache.get(endpoint, params, record=record)
+    record_cache("stats", time.perf_counter() - started, data is not None)
+    return data
+
+
+def _upstream(endpoint, call, *args, **kwargs):
+    """Make a gateway call, timing it as upstream work"""
+    started = time.perf_counter()
+    try:
+        result = call(*args, **kwargs)
+    except Exception:
+        record_upstream(endpoint, time.perf_counter() - started, error=True)
+        raise
+    record_upstream(endpoint, time.perf_counter() - started)
+    return result
+
+
+def _fill(cache, endpoint, params, fetch):
+    """Fetch and store a missing call, once across the workers sharing the cache"""
+    if not cache.acquire_fill(endpoint, params):
+        # Another worker is fetching it; use its result unless it fails
+        data = cache.wait_for_fill(endpoint, params)
+        if data is not None:
+            return data
+    try:
+        data = fetch()
+        cache.set(endpoint, params, data, ttl_for(endpoint, params))
+    finally:
+        cache.release_fill(endpoint, params)
+    return data
+
+
+def _expires_within(entry, seconds):
+    expires_at = entry[2]
+    return expires_at is not None and expires_at - time.time() < seconds
+
+
+def _renew(cache, endpoint, params, fetch, fresh_for):
+    """Reload a call expiring within ``fresh_for`` seconds, once across the workers"""
+    if not cache.acquire_fill(endpoint, params):
+        # Another worker is reloading it; its entry is still valid meanwhile
+        data = cache.wait_for_fill(endpoint, params)
+        if data is not None:
+            return data
+    try:
+        entry = cache.get_entry(endpoint, params)
+        if entry is not None and not _expires_within(entry, fresh_for):
+            # Reloaded by another worker since the lookup
+            return entry[0]
+        data = fetch()
+        cache.set(endpoint, params, data, ttl_for(endpoint, params))
+    finally:
+        cache.release_fill(endpoint, params)
+    return data
+
+
+def _loader(cache, endpoint_cls, params, kwargs):
+    """Return an upstream fetch for a call and a coalesced load that stores it"""
+    endpoint = endpoint_cls.__name__
+
+    def fetch():
+        return _upstream(endpoint, get_stats_gateway().call, endpoint_cls, **kwargs)
+
+    def load():
+        # A flight for this key may have completed since the lookup above
+        data = cache.get(endpoint, params, record=False)
+        if data is None:
+            data = _fill(cache, endpoint, params, fetch)
+        return data
+
+    return fetch, load
+
+
+def _serve_stale(endpoint, entry, reason):
+    data, stored_at, _ = entry
+    record_stale(endpoint, time.time() - stored_at, reason)
+    return data
+
+
+def _coalesced(key, load, endpoint):
+    """Run a load once for concurrent callers of a key
+
+    Waiting on another caller's load stops at this caller's deadline. A
+    DeadlineExceeded raised by that load is the other caller's deadline, so
+    it is only passed on once this caller's has passed too.
+    """
+    while True:
+        ran = []
+
+        def run():
+            ran.append(True)
+            return load()
+
+        try:
+            return _single_flight.do(key, run, group=endpoint, timeout=remaining())
+        except WaitTimeout:
+            deadline = current_deadline()
+            raise DeadlineExceeded(
+                f"Gave up waiting for {endpoint}: "
+                f"{deadline.budget:g}s request deadline exceeded"
+            ) from None
+        except DeadlineExceeded:
+            if ran:
+                raise
+            check_deadline(endpoint)
+
+
+def _revalidate(key, endpoint, load):
+    """Refresh an expired entry in the background, once per key at a time"""
+    global _revalidator
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+        if _revalidator is None:
+            _revalidator = ThreadPoolExecutor(
+                max_workers=REVALIDATE_WORKERS, thread_name_prefix="revalidate"
+            )
+
+    def run():
+        try:
+            _single_flight.do(key, load, group=endpoint)
+        except Exception as e:
+            logger.warning(f"Error revalidating {key}: {str(e)}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    _revalidator.submit(run)
+
+
+def cached_fetch(endpoint_cls, params, refresh=False, fresh_for=None, **kwargs):
+    """Return the data for an upstream call, loading and storing it on a miss
+
+    ``params`` identifies the call in the cache; ``kwargs`` are passed to the
+    nba_api endpoint class. ``refresh`` skips the lookup and always reloads,
+    without falling back to stale data. ``fresh_for`` reloads an entry that
+    expires within that many seconds, leased across the workers sharing the
+    cache; the stored entry is returned if the reload fails.
+    """
+    endpoint = endpoint_cls.__name__
+    cache = get_stats_cache()
+    key = make_key(endpoint, params)
+    fetch, load = _loader(cache, endpoint_cls, params, kwargs)
+
+    if refresh:
+
+        def reload():
+            data = fetch()
+            cache.set(endpoint, params, data, ttl_for(endpoint, params))
+            return data
+
+        return _coalesced(key, reload, endpoint)
+
+    if fresh_for is not None:
+        entry = cache.get_entry(endpoint, params)
+        if entry is not None and not _expires_within(entry, fresh_for):
+            return entry[0]
+        try:
+            return _coalesced(
+                key, lambda: _renew(cache, endpoint, params, fetch, fresh_for), endpoint
+            )
+        except Exception as e:
+            if entry is None or not (
+                entry[2] > time.time() or cache.in_stale_window(entry[2])
+            ):
+                raise
+            logger.warning(f"Keeping stored {endpoint} data after error: {str(e)}")
+            return entry[0]
+
+    data = _cache_get(cache, endpoint, params)
+    if data is not None:
+        return data
+
+    entry = cache.get_entry(endpoint, params)
+    if entry is not None and cache.in_stale_window(entry[2]):
+        _revalidate(key, endpoint, load)
+        return _serve_stale(endpoint, entry, "revalidating")
+
+    try:
+        return _coalesced(key, load, endpoint)
+    except Exception as e:
+        if entry is None:
+            raise
+        logger.warning(f"Serving stale {endpoint} data after error: {str(e)}")
+        return _serve_stale(endpoint, entry, "upstream_error")
+
+
+def get_team_game_logs(team_id, season, season_type, fresh_for=None):
+    """Get TeamGameLogs data for one team, season and season type"""
+    return cached_fetch(
+        TeamGameLogs,
+        {"team_id": team_id, "season": season, "season_type": season_type},
+        fresh_for=fresh_for,
+        team_id_nullable=team_id,
+        season_nullable=season,
+        season_type_nullable=season_type,
+    )
+
+
+def get_league_team_logs(season, season_type):
+    """Get TeamGameLogs data for every team in a season and season type"""
+    return cached_fetch(
+        TeamGameLogs,
+        {"team_id": None, "season": season, "season_type": season_type},
+        season_nullable=season,
+        season_type_nullable=season_type,
+    )
+
+
+def get_player_game_logs(player_id, season, fresh_for=None):
+    """Get PlayerGameLogs data for one player and season"""
+    return cached_fetch(
+        PlayerGameLogs,
+        {"player_id": player_id, "season": season},
+        fresh_for=fresh_for,
+        player_id_nullable=player_id,
+        season_nullable=season,
+    )
+
+
+def get_player_info(player_id):
+    """Get CommonPlayerInfo data for a player"""
+    return cached_fetch(CommonPlayerInfo, {"player_id": player_id}, player_id=player_id)
+
+
+def get_all_players():
+    """Get CommonAllPlayers data"""
+    return cached_fetch(CommonAllPlayers, {})
+
+
+def get_scoreboard(game_date, refresh=False):
+    """Get ScoreboardV2 data for a date (MM/DD/YYYY)"""
+    return cached_fetch(
+        ScoreboardV2, {"game_date": game_date}, refresh=refresh, game_date=game_date
+    )
+
+
+def cached_version(endpoint_cls, params, expired=False):
+    """Return when a call's data was cached, or None if it would go upstream
+
+    With ``expired``, the version of expired data still held is returned too.
+    """
+    return get_stats_cache().stored_at(endpoint_cls.__name__, params, expired)
+
+
+def load_versioned(endpoint_cls, params, load):
+    """Run ``load`` for a call, then return its stored data and version
+
+    The data is read back from the cache together with its ``stored_at``,
+    so the version names exactly the data returned even when a refresh
+    lands in between. Builders of in-memory copies keep that version and
+    rebuild once ``cached_version`` moves past it.
+    """
+    data = load()
+    entry = get_stats_cache().get_entry(endpoint_cls.__name__, params)
+    if entry is None:
+        return data, None
+    return entry[0], entry[1]
+
+
+def combined_version(versions):
+    """Combine the versions of several calls into a (token, last-modified) pair
+
+    Returns None if any of the calls is not cached.
+    """
+    versions = tuple(versions)
+    if not versions or None in versions:
+        return None
+    return versions, max(versions)
+
+
+def team_game_logs_version(team_id, season, season_type, expired=False):
+    """Cache version of ``get_team_game_logs``"""
+    return cached_version(
+        TeamGameLogs,
+        {"team_id": team_id, "season": season, "season_type": season_type},
+        expired,
+    )
+
+
+def league_team_logs_version(season, season_type, expired=False):
+    """Cache version of ``get_league_team_logs``"""
+    return cached_version(
+        TeamGameLogs,
+        {"team_id": None, "season": season, "season_type": season_type},
+        expired,
+    )
+
+
+def player_game_logs_version(player_id, season, expired=False):
+    """Cache version of ``get_player_game_logs``"""
+    return cached_version(
+        PlayerGameLogs, {"player_id": player_id, "season": season}, expired
+    )
+
+
+def versioned_team_game_logs(team_id, season, season_type):
+    """``get_team_game_logs`` with the version of the data returned"""
+    return load_versioned(
+        TeamGameLogs,
+        {"team_id": team_id, "season": season, "season_type": season_type},
+        lambda: get_team_game_logs(team_id, season, season_type),
+    )
+
+
+def versioned_league_team_logs(season, season_type):
+    """``get_league_team_logs`` with the version of the data returned"""
+    return load_versioned(
+        TeamGameLogs,
+        {"team_id": None, "season": season, "season_type": season_type},
+        lambda: get_league_team_logs(season, season_type),
+    )
+
+
+def versioned_player_game_logs(player_id, season):
+    """``get_player_game_logs`` with the version of the data returned"""
+    return load_versioned(
+        PlayerGameLogs,
+        {"player_id": player_id, "season": season},
+        lambda: get_player_game_logs(player_id, season),
+    )
+
+
+def player_info_version(player_id):
+    """Cache version of ``get_player_info``"""
+    return cached_version(CommonPlayerInfo, {"player_id": player_id})
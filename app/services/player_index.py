@@ -0,0 +1,204 @@
+"""
+In-memory player name search index.
+
+The index is built from ``CommonAllPlayers`` once and then refreshed by a
+background thread, so searches never wait on stats.nba.com. Names are
+accent-folded and tokenized; lookups go through a token prefix map with a
+trigram map as fallback for matches inside a word. Queries shorter than a
+trigram scan the names instead, so every query still matches anywhere in
+a name, as the substring search the index replaced did.
+"""
+
+import logging
+import threading
+import unicodedata
+
+from app.services.nba_stats import get_all_players
+from app.services.stats_cache import ALL_PLAYERS_TTL
+from app.utils.rowsets import Projection, column, result_set
+
+logger = logging.getLogger(__name__)
+
+MAX_PREFIX_LENGTH = 12
+NGRAM_SIZE = 3
+
+# Ranking tiers, lower is better
+EXACT_MATCH = 0
+NAME_PREFIX_MATCH = 1
+TOKEN_PREFIX_MATCH = 2
+SUBSTRING_MATCH = 3
+
+SEARCH_PLAYER = Projection(
+    {
+        "player_id": "PERSON_ID",
+        "name": "DISPLAY_FIRST_LAST",
+        "team_city": "TEAM_CITY",
+        "team_name": "TEAM_NAME",
+        "position": "POSITION",
+        "jersey_number": "JERSEY",
+        "roster_status": "ROSTERSTATUS",
+    },
+    defaults={"position": "N/A", "jersey_number": "N/A"},
+)
+
+
+def normalize_name(name):
+    """Lowercase and accent-fold a name, keeping letters, digits and spaces"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    cleaned = "".join(c if c.isalnum() else " " for c in folded)
+    return " ".join(cleaned.split())
+
+
+def _ngrams(text):
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class PlayerIndex:
+    """Immutable search structures over one CommonAllPlayers snapshot"""
+
+    def __init__(self, table):
+        self.players = []
+        self.names = []
+        self.tokens = []
+        self.active = []
+        self.rosters = {}
+        self.prefixes = {}
+        self.ngrams = {}
+
+        for team_id, player in zip(column(table, "TEAM_ID"), SEARCH_PLAYER.rows(table)):
+            position = len(self.players)
+            name = normalize_name(player["name"])
+            team_city, team_name = player.pop("team_city"), player.pop("team_name")
+            player["team"] = f"{team_city} {team_name}"
+            self.active.append(bool(player.pop("roster_status")))
+            if team_id and self.active[-1]:
+                self.rosters.setdefault(team_id, []).append(player["player_id"])
+            self.players.append(player)
+            self.names.append(name)
+            self.tokens.append(name.split())
+
+            for token in self.tokens[-1]:
+                for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                    self.prefixes.setdefault(token[:length], set()).add(position)
+            for gram in _ngrams(name):
+                self.ngrams.setdefault(gram, set()).add(position)
+
+    def __len__(self):
+        return len(self.players)
+
+    def roster(self, team_id):
+        """Return the IDs of a team's active players"""
+        return self.rosters.get(team_id, [])
+
+    def _token_candidates(self, tokens):
+        candidates = None
+        for token in tokens:
+            matches = self.prefixes.get(token[:MAX_PREFIX_LENGTH], set())
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return set()
+        return candidates
+
+    def _ngram_candidates(self, query):
+        grams = _ngrams(query)
+        if not grams:
+            # Too short for the n-gram map: scan the names
+            return {
+                position for position, name in enumerate(self.names) if query in name
+            }
+        candidates = None
+        for gram in grams:
+            matches = self.ngrams.get(gram, set())
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return set()
+        return candidates
+
+    def _tokens_match(self, position, tokens):
+        parts = self.tokens[position]
+        return all(any(part.startswith(token) for part in parts) for token in tokens)
+
+    def _rank(self, position, query, tokens):
+        name = self.names[position]
+        if name == query:
+            tier = EXACT_MATCH
+        elif name.startswith(query):
+            tier = NAME_PREFIX_MATCH
+        elif self._tokens_match(position, tokens):
+            tier = TOKEN_PREFIX_MATCH
+        else:
+            tier = SUBSTRING_MATCH
+        return (tier, not self.active[position], name)
+
+    def search(self, name, limit=None):
+        """Return the best matching players for a name, best first"""
+        query = normalize_name(name)
+        if not query:
+            return []
+        tokens = query.split()
+
+        candidates = self._token_candidates(tokens) | self._ngram_candidates(query)
+        matches = [
+            position
+            for position in candidates
+            if query in self.names[position] or self._tokens_match(position, tokens)
+        ]
+        matches.sort(key=lambda position: self._rank(position, query, tokens))
+        if limit is not None:
+            matches = matches[:limit]
+        return [self.players[position] for position in matches]
+
+
+_index = None
+_index_lock = threading.Lock()
+_refresher = None
+
+
+def refresh_player_index():
+    """Rebuild the index from CommonAllPlayers, keeping the old one on failure"""
+    global _index
+    try:
+        index = PlayerIndex(result_set(get_all_players(), "CommonAllPlayers"))
+    except Exception as e:
+        logger.error(f"Error refreshing player index: {str(e)}")
+        return _index
+
+    _index = index
+    logger.info(f"Player index built with {len(index)} players")
+    return index
+
+
+def _refresh_loop(interval, stop_event):
+    while not stop_event.wait(interval):
+        refresh_player_index()
+
+
+def start_player_index_refresher(interval=ALL_PLAYERS_TTL):
+    """Build the index in the background and keep refreshing it"""
+    global _refresher
+    with _index_lock:
+        if _refresher is not None:
+            return _refresher
+
+        stop_event = threading.Event()
+
+        def run():
+            if _index is None:
+                refresh_player_index()
+            _refresh_loop(interval, stop_event)
+
+        thread = threading.Thread(target=run, name="player-index", daemon=True)
+        thread.stop_event = stop_event
+        thread.start()
+        _refresher = thread
+        return thread
+
+
+def get_player_index():
+    """Return the current index, building it synchronously on first use"""
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                refresh_player_index()
+    return _index
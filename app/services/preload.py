@@ -0,0 +1,202 @@
+"""
+Preload mode for pre-fork servers, and the startup report.
+
+With ``PRELOAD_APP`` set, ``create_app`` is meant to run once in the
+master of a pre-fork server (``gunicorn --preload run:app``). The heavy
+imports, the flask-restx models and the static data -- the player
+directory and the team logs of finished seasons, which never change --
+are then built once and inherited by every worker instead of being
+rebuilt per worker. Once loaded, the heap is frozen with ``gc.freeze`` so
+the collector in the workers never writes to the inherited objects, which
+would copy their pages; the team logs are NumPy columns, whose buffers stay
+shared regardless.
+
+Threads do not survive a fork, so in preload mode the background services
+(scoreboard poller, player index refresher, season ingest, cache warmer)
+are started in each worker right after the fork instead of in the master.
+The upstream gateway, shared executor and SQLite cache reopen themselves
+in the child on their own.
+
+Every startup records how long each heavy import and each ``create_app``
+step took, and the peak RSS after it; the report is logged and served at
+``/admin/startup``.
+"""
+
+import gc
+import importlib
+import logging
+import os
+import resource
+import sys
+import time
+
+from nba_api.stats.library.parameters import SeasonAll
+
+from app.constants import TEAM_ABBREVIATIONS
+from app.utils.seasons import format_season, season_start_year
+
+logger = logging.getLogger(__name__)
+
+# Imported first and timed one by one; later imports reuse them
+HEAVY_MODULES = (
+    "numpy",
+    "aiohttp",
+    "flask_restx",
+    "nba_api.stats.endpoints",
+    "app.services.nba_stats",
+    "app.routes",
+)
+
+
+def peak_rss_kib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class StartupReport:
+    """Import and init durations of one ``create_app`` call"""
+
+    def __init__(self, preload=False):
+        self.preload = preload
+        self.pid = os.getpid()
+        self.imports = []
+        self.steps = []
+        self._started = self._last = time.perf_counter()
+
+    def import_modules(self, names=HEAVY_MODULES):
+        """Import modules one by one, recording what each one added"""
+        for name in names:
+            started = time.perf_counter()
+            cached = name in sys.modules
+            importlib.import_module(name)
+            self.imports.append(
+                {
+                    "module": name,
+                    "seconds": round(time.perf_counter() - started, 4),
+                    "cached": cached,
+                    "peak_rss_kib": peak_rss_kib(),
+                }
+            )
+        self._last = time.perf_counter()
+
+    def mark(self, step):
+        """Record the time since the previous mark as ``step``"""
+        now = time.perf_counter()
+        self.steps.append(
+            {
+                "step": step,
+                "seconds": round(now - self._last, 4),
+                "peak_rss_kib": peak_rss_kib(),
+            }
+        )
+        self._last = now
+
+    def as_dict(self):
+        return {
+            "pid": self.pid,
+            "preload": self.preload,
+            "total_seconds": round(self._last - self._started, 4),
+            "peak_rss_kib": peak_rss_kib(),
+            "imports": self.imports,
+            "steps": self.steps,
+        }
+
+    def log(self):
+        parts = [f"{entry['module']} {entry['seconds']:.3f}s" for entry in self.imports]
+        parts += [f"{entry['step']} {entry['seconds']:.3f}s" for entry in self.steps]
+        logger.info(
+            f"Started in {self._last - self._started:.3f}s "
+            f"({'preload' if self.preload else 'per worker'}): " + ", ".join(parts)
+        )
+
+
+_report = None
+_deferred = []
+
+
+def start_startup_report(preload=False):
+    global _report
+    _report = StartupReport(preload)
+    return _report
+
+
+def get_startup_report():
+    return _report
+
+
+def _run_deferred():
+    # Runs in the child right after a fork; a worker's own forks start nothing
+    deferred = list(_deferred)
+    _deferred.clear()
+    for fn, args, kwargs in deferred:
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error starting {fn.__name__} after fork: {str(e)}")
+
+
+os.register_at_fork(after_in_child=_run_deferred)
+
+
+def run_in_workers(preload, fn, *args, **kwargs):
+    """Call ``fn`` now, or in every worker after the fork in preload mode"""
+    if not preload:
+        return fn(*args, **kwargs)
+    _deferred.append((fn, args, kwargs))
+    return None
+
+
+def default_preload_seasons():
+    """The previous season, the most recent one whose logs never change"""
+    return [format_season(season_start_year(SeasonAll.current_season) - 1)]
+
+
+def load_static_data(seasons, season_types):
+    """Build the player index and the stores of finished seasons"""
+    from app.services.executor import get_executor
+    from app.services.player_index import refresh_player_index
+    from app.services.season_store import get_season_store
+    from app.services.stats_cache import season_is_final
+    from app.services.team_log_store import get_team_columns
+
+    refresh_player_index()
+    calls = []
+    for season in seasons:
+        if not season_is_final(season):
+            continue
+        for season_type in season_types:
+            calls.append((get_season_store, season, season_type))
+        for team_id in TEAM_ABBREVIATIONS.values():
+            calls.append((get_team_columns, team_id, season, tuple(season_types)))
+
+    def load(call):
+        try:
+            call[0](*call[1:])
+            return True
+        except Exception as e:
+            logger.error(f"Error preloading {call[0].__name__}{call[1:]}: {str(e)}")
+            return False
+
+    loaded = sum(get_executor().map(load, calls))
+    logger.info(f"Preloaded {loaded}/{len(calls)} stores for {', '.join(seasons)}")
+    return loaded
+
+
+def stop_preload_threads():
+    """Stop the threads static loading started
+
+    The gateway and executor start new ones when next used: in each worker
+    after a fork, or in this process if it serves requests itself.
+    """
+    from app.services.executor import get_executor
+    from app.services.stats_gateway import get_stats_gateway
+
+    get_stats_gateway().close()
+    get_executor().shutdown()
+
+
+def freeze_heap():
+    """Move every object allocated so far out of the collector's reach"""
+    gc.collect()
+    gc.freeze()
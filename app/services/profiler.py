@@ -0,0 +1,238 @@
+"""
+On-demand cProfile capture of individual requests.
+
+A request is profiled when it carries the profiling header set to the
+configured token, or when it is picked by the configured sample rate.
+Without a token the header is ignored, so clients cannot make the server
+profile their requests. Header-requested profiles are always
+kept; sampled ones only when the request took at least the slow threshold,
+so a low sample rate over production traffic collects the slow outliers.
+Only one request is profiled at a time; others run unprofiled while a
+capture is in progress. The profiler follows the request's own thread, so
+work fanned out to the shared executor shows up as time waiting on it.
+
+Captured profiles are kept in memory, newest first, and can be listed and
+downloaded from ``/admin/profiles`` as ``.prof`` files for ``pstats`` or
+snakeviz, or as a text summary. Those endpoints take the same header and
+token, since the profiles record request paths and query strings.
+"""
+
+import cProfile
+import hmac
+import io
+import itertools
+import logging
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADER = "X-Profile"
+DEFAULT_SAMPLE_RATE = 0.0
+DEFAULT_SLOW_THRESHOLD = 1.0
+DEFAULT_MAX_PROFILES = 50
+
+TRIGGER_HEADER = "header"
+TRIGGER_SAMPLED = "sampled"
+
+
+class CapturedProfile:
+    """One request's profile and what it was captured for"""
+
+    __slots__ = ("id", "method", "path", "route", "status", "duration", "started_at",
+                 "trigger", "data")  # fmt: skip
+
+    def __init__(
+        self, id, method, path, route, status, duration, started_at, trigger, data
+    ):
+        self.id = id
+        self.method = method
+        self.path = path
+        self.route = route
+        self.status = status
+        self.duration = duration
+        self.started_at = started_at
+        self.trigger = trigger
+        self.data = data
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "duration": self.duration,
+            "started_at": self.started_at,
+            "trigger": self.trigger,
+            "size": len(self.data),
+        }
+
+    def text(self, sort="cumulative", limit=40):
+        """Render the profile as a pstats listing"""
+        out = io.StringIO()
+        stats = pstats.Stats(stream=out)
+        stats.stats = marshal.loads(self.data)
+        stats.get_top_level_stats()
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+class RequestProfiler:
+    """Decides which requests to profile and keeps the captured profiles"""
+
+    def __init__(
+        self,
+        header=DEFAULT_HEADER,
+        token=None,
+        sample_rate=DEFAULT_SAMPLE_RATE,
+        slow_threshold=DEFAULT_SLOW_THRESHOLD,
+        max_profiles=DEFAULT_MAX_PROFILES,
+    ):
+        self.header = header
+        self.token = token
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.max_profiles = max_profiles
+
+        self._profiles = OrderedDict()
+        self._ids = itertools.count(1)
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._skipped = 0
+
+    def authorized(self, headers):
+        """Whether the request carries the profiling token; False without one"""
+        value = headers.get(self.header)
+        if not self.token or not value:
+            return False
+        return hmac.compare_digest(value.encode(), self.token.encode())
+
+    def trigger_for(self, headers):
+        """Return why a request should be profiled, or None"""
+        if self.authorized(headers):
+            return TRIGGER_HEADER
+        if self.sample_rate and self._random.random() < self.sample_rate:
+            return TRIGGER_SAMPLED
+        return None
+
+    def start(self, trigger):
+        """Start profiling the calling thread; None if another capture is running"""
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self._skipped += 1
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (a debugger, say) is already active
+            self._active.release()
+            return None
+        return profile, trigger, time.time(), time.perf_counter()
+
+    def stop(self, capture, method, path, route, status):
+        """Stop a capture and keep it if it qualifies; returns its ID or None"""
+        profile, trigger, started_at, started = capture
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+        duration = time.perf_counter() - started
+        if trigger != TRIGGER_HEADER and duration < self.slow_threshold:
+            return None
+
+        profile.create_stats()
+        with self._lock:
+            profile_id = f"{int(started_at)}-{next(self._ids)}"
+            self._profiles[profile_id] = CapturedProfile(
+                profile_id,
+                method,
+                path,
+                route,
+                status,
+                duration,
+                started_at,
+                trigger,
+                marshal.dumps(profile.stats),
+            )
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        logger.info(
+            f"Captured {trigger} profile {profile_id} of {path} ({duration:.3f}s)"
+        )
+        return profile_id
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self):
+        with self._lock:
+            profiles = [
+                profile.summary() for profile in reversed(self._profiles.values())
+            ]
+            skipped = self._skipped
+        return {
+            "header": self.header,
+            "sample_rate": self.sample_rate,
+            "slow_threshold": self.slow_threshold,
+            "skipped_concurrent": skipped,
+            "profiles": profiles,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+_profiler = None
+
+
+def init_request_profiler(app, **kwargs):
+    """Profile requests of ``app`` that ask for it or are sampled"""
+    from flask import g, request
+
+    global _profiler
+    _profiler = profiler = RequestProfiler(**kwargs)
+
+    @app.before_request
+    def start_profile():
+        trigger = profiler.trigger_for(request.headers)
+        if trigger is not None:
+            g.profile_capture = profiler.start(trigger)
+
+    @app.after_request
+    def stop_profile(response):
+        capture = g.pop("profile_capture", None)
+        if capture is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        profile_id = profiler.stop(
+            capture, request.method, request.full_path, route, response.status_code
+        )
+        if profile_id is not None:
+            response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    @app.teardown_request
+    def abandon_profile(exc=None):
+        # after_request is skipped for unhandled errors
+        capture = g.pop("profile_capture", None)
+        if capture is not None:
+            route = (
+                request.url_rule.rule if request.url_rule is not None else "unmatched"
+            )
+            profiler.stop(capture, request.method, request.full_path, route, 500)
+
+    return profiler
+
+
+def get_request_profiler():
+    """Return the app's profiler, or None if profiling is disabled"""
+    return _profiler
@@ -0,0 +1,238 @@
+"""
+Vectorized player prop hit-rate engine.
+
+A player's ``PlayerGameLogs`` are held as a stats x games NumPy matrix in
+chronological order. A batch of (stat, line, window) props is evaluated in
+one pass: the stat rows of every prop are stacked into a props x games
+matrix, games outside each prop's window are masked, and hits, averages,
+medians and standard deviations are reduced along the games axis.
+"""
+
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from app.services.memory_cache import get_memory_cache
+from app.services.nba_stats import (
+    player_game_logs_version,
+    versioned_player_game_logs,
+)
+from app.services.stats_cache import ttl_for
+from app.utils import rowsets
+
+STAT_COLUMNS = [
+    "PTS",
+    "REB",
+    "AST",
+    "STL",
+    "BLK",
+    "TOV",
+    "FGM",
+    "FGA",
+    "FG3M",
+    "FG3A",
+    "FTM",
+    "FTA",
+    "OREB",
+    "DREB",
+    "PF",
+    "MIN",
+    "PLUS_MINUS",
+]
+STAT_INDEX = {column: i for i, column in enumerate(STAT_COLUMNS)}
+
+# Common combo shorthands
+STAT_ALIASES = {
+    "PRA": "PTS+REB+AST",
+    "PR": "PTS+REB",
+    "PA": "PTS+AST",
+    "RA": "REB+AST",
+    "SB": "STL+BLK",
+    "3PM": "FG3M",
+}
+
+
+class PropError(ValueError):
+    """Raised for props that cannot be evaluated"""
+
+
+def parse_last_n(value):
+    """Return a ``last_n`` window as an int, None if not given
+
+    Raises PropError unless it is a positive integer or a string of one.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = int(value)
+        except ValueError:
+            raise PropError("last_n must be a positive integer")
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise PropError("last_n must be a positive integer")
+    return value
+
+
+@lru_cache(maxsize=1024)
+def parse_stat(stat):
+    """Return the canonical name and column indexes of a stat or combo stat"""
+    name = STAT_ALIASES.get(stat.strip().upper(), stat.strip().upper())
+    parts = [part.strip() for part in name.split("+") if part.strip()]
+    if not parts:
+        raise PropError(f"Invalid stat '{stat}'")
+    unknown = [part for part in parts if part not in STAT_INDEX]
+    if unknown:
+        raise PropError(
+            f"Unknown stat {', '.join(unknown)}. Use {', '.join(STAT_COLUMNS)} "
+            f"or combos like PTS+REB+AST"
+        )
+    return "+".join(parts), tuple(STAT_INDEX[part] for part in parts)
+
+
+class PlayerLogColumns:
+    """One player's game logs for a season in columnar form"""
+
+    def __init__(self, player_id, season, table, version=None):
+        self.player_id = player_id
+        self.season = season
+        # ``stored_at`` of the cached logs these columns were built from
+        self.version = version
+        self.built_at = time.time()
+
+        table = rowsets.sort_rows(table, "GAME_DATE")
+        self.game_ids = np.array(rowsets.column(table, "GAME_ID"), dtype=str)
+        self.values = np.array(
+            rowsets.columns(table, STAT_COLUMNS), dtype=np.float64
+        ).reshape(len(STAT_COLUMNS), len(table["data"]))
+        self._combos = {}
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self):
+        # Combo rows are built later and not counted
+        return self.values.nbytes + self.game_ids.nbytes
+
+    def stat_row(self, name, indexes):
+        """Return the per-game values of a stat, summing combo components"""
+        row = self._combos.get(name)
+        if row is None:
+            row = self.values[list(indexes)].sum(axis=0)
+            self._combos[name] = row
+        return row
+
+    def evaluate(self, props, last_n=None):
+        """Evaluate many props at once
+
+        ``props`` is a list of dicts with ``stat``, ``line`` and an optional
+        ``last_n`` overriding the default window. Results are returned in the
+        same order.
+        """
+        if not props:
+            return []
+        games = len(self)
+
+        names = []
+        rows = []
+        lines = np.empty(len(props))
+        windows = np.empty(len(props), dtype=np.int64)
+        for i, prop in enumerate(props):
+            if not isinstance(prop, dict) or "stat" not in prop:
+                raise PropError("Each prop needs a stat and a line")
+            name, indexes = parse_stat(str(prop["stat"]))
+            try:
+                lines[i] = float(prop["line"])
+                window = parse_last_n(prop.get("last_n", last_n))
+            except (KeyError, TypeError, ValueError):
+                raise PropError(f"Invalid line or last_n for {name}")
+            if not np.isfinite(lines[i]):
+                raise PropError(f"Invalid line or last_n for {name}")
+            window = games if window is None else window
+            windows[i] = min(window, games)
+            names.append(name)
+            rows.append(self.stat_row(name, indexes))
+
+        values = np.vstack(rows) if games else np.empty((len(props), 0))
+        # Only the most recent `window` games count for each prop
+        in_window = np.arange(games)[None, :] >= (games - windows)[:, None]
+        counted = windows.astype(np.float64)
+
+        over = ((values > lines[:, None]) & in_window).sum(axis=1)
+        under = ((values < lines[:, None]) & in_window).sum(axis=1)
+        push = windows - over - under
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = np.where(in_window, values, 0).sum(axis=1) / counted
+            deviations = np.where(in_window, values - averages[:, None], 0)
+            std_devs = np.sqrt((deviations**2).sum(axis=1) / (counted - 1))
+            hit_rates = over / counted
+            under_rates = under / counted
+
+        medians = np.full(len(props), np.nan)
+        has_games = windows > 0
+        if has_games.any():
+            masked = np.where(in_window[has_games], values[has_games], np.nan)
+            medians[has_games] = np.nanmedian(masked, axis=1)
+
+        columns = zip(
+            names,
+            lines.tolist(),
+            windows.tolist(),
+            over.tolist(),
+            under.tolist(),
+            push.tolist(),
+            hit_rates.tolist(),
+            under_rates.tolist(),
+            averages.tolist(),
+            medians.tolist(),
+            std_devs.tolist(),
+            (averages - lines).tolist(),
+        )
+        keys = (
+            "stat",
+            "line",
+            "games",
+            "over",
+            "under",
+            "push",
+            "hit_rate",
+            "under_rate",
+            "average",
+            "median",
+            "std_dev",
+            "margin",
+        )
+        return [
+            dict(zip(keys, row[:6] + tuple(_clean(value) for value in row[6:])))
+            for row in columns
+        ]
+
+    def is_stale(self):
+        ttl = ttl_for("PlayerGameLogs", {"season": self.season})
+        if ttl is not None and time.time() - self.built_at > ttl:
+            return True
+        # The cached logs were refreshed under us
+        return self.version != player_game_logs_version(
+            self.player_id, self.season, True
+        )
+
+
+def _clean(value):
+    return None if value != value else round(value, 3)
+
+
+def get_player_columns(player_id, season):
+    """Return the columnar logs for a player and season"""
+    key = (player_id, season)
+    columns = get_memory_cache().get("player_columns", key)
+    if columns is not None and not columns.is_stale():
+        return columns
+
+    data, version = versioned_player_game_logs(player_id, season)
+    columns = PlayerLogColumns(
+        player_id, season, rowsets.result_set(data, "PlayerGameLogs"), version
+    )
+    get_memory_cache().put("player_columns", key, columns)
+    return columns
@@ -0,0 +1,49 @@
+"""
+Token-bucket rate limiting for upstream requests.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return how many seconds to wait before using it
+
+        Tokens may go negative, so concurrent callers are queued in order
+        rather than all retrying at once.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available"""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    def stats(self):
+        """Return the configuration and current token level"""
+        with self._lock:
+            tokens = min(
+                self.burst,
+                self._tokens + (time.monotonic() - self._updated) * self.rate,
+            )
+        return {"rate": self.rate, "burst": self.burst, "tokens": tokens}
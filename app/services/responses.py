@@ -0,0 +1,389 @@
+"""
+JSON encoding, compression negotiation and an encoded-body cache.
+
+Every API response is serialized with ``orjson`` when it is installed (the
+standard library ``json`` otherwise) and compressed with brotli or gzip
+when the client accepts it. Results that can never change, such as
+finished seasons, are kept in ``ResponseCache`` as already-encoded bytes
+whose compressed variants are built once on first use, so repeat requests
+skip both serialization and compression.
+
+Responses carry strong ETags. Routes describe a resource with a
+``Conditional`` whose version comes from the cached upstream data, so a
+matching ``If-None-Match`` is answered with 304 before any upstream call
+or serialization; other responses fall back to a hash of their body.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from flask import request, Response, stream_with_context
+from werkzeug.http import http_date, quote_etag
+
+from app.services.metrics import record_cache, timed
+from app.services.stats_cache import season_is_final
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MIN_COMPRESS_SIZE = 1024
+
+# Dynamic bodies favour speed; cached bodies are compressed once, so harder
+DYNAMIC_GZIP_LEVEL = 6
+DYNAMIC_BROTLI_QUALITY = 4
+CACHED_GZIP_LEVEL = 9
+CACHED_BROTLI_QUALITY = 11
+
+MIMETYPE = "application/json"
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Rows serialized per streamed chunk
+DEFAULT_NDJSON_CHUNK_ROWS = 128
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=60"
+LIVE_CACHE_CONTROL = "public, max-age=5"
+
+
+def dumps(data):
+    """Serialize data to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(*parts):
+    """Return a strong ETag value for the given parts or body bytes"""
+    if len(parts) == 1 and isinstance(parts[0], bytes):
+        data = parts[0]
+    else:
+        data = repr(parts).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def season_cache_control(season):
+    """Cache-Control for data scoped to a season"""
+    return IMMUTABLE_CACHE_CONTROL if season_is_final(season) else DEFAULT_CACHE_CONTROL
+
+
+class Conditional:
+    """Validators of a resource derived from the version of its data
+
+    ``version`` returns a hashable version token and an optional
+    last-modified timestamp, or None while the data is not available without
+    an upstream call. It is read once, before the resource is built, so the
+    validators never name newer data than the body holds; without a version
+    the body's own hash becomes the ETag. Use ``weak`` when equal versions
+    can still differ in incidental fields.
+    """
+
+    def __init__(
+        self, resource, version, cache_control=DEFAULT_CACHE_CONTROL, weak=False
+    ):
+        self.resource = resource
+        self.version = version
+        self.cache_control = cache_control
+        self.weak = weak
+
+    def _validators(self):
+        version = self.version()
+        if version is None:
+            return None, None
+        token, modified = version
+        return make_etag(self.resource, token), modified
+
+    def _headers(self, etag, modified):
+        headers = {"Cache-Control": self.cache_control}
+        if etag is not None:
+            headers["ETag"] = quote_etag(etag, weak=self.weak)
+        if modified is not None:
+            headers["Last-Modified"] = http_date(modified)
+        return headers
+
+    def evaluate(self):
+        """Return ``(not_modified, headers)`` from one read of the version
+
+        ``not_modified`` is a 304 response if the client's copy is current,
+        else None; ``headers`` are the ETag, Last-Modified and Cache-Control
+        to send with the resource built after this call.
+        """
+        etag, modified = self._validators()
+        headers = self._headers(etag, modified)
+        if etag is not None and request.if_none_match.contains_weak(etag):
+            return not_modified_response(headers), headers
+        return None, headers
+
+
+def not_modified_response(headers):
+    response = Response(status=304, headers=headers)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def accepted_encodings(header):
+    """Return the content codings a client accepts, ignoring q=0"""
+    encodings = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if coding and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def choose_encoding(header):
+    """Pick the best supported encoding for an Accept-Encoding header"""
+    encodings = accepted_encodings(header)
+    if brotli is not None and "br" in encodings:
+        return "br"
+    if "gzip" in encodings or "*" in encodings:
+        return "gzip"
+    return None
+
+
+def compress(body, encoding, cached=False):
+    with timed("compress"):
+        if encoding == "br":
+            quality = CACHED_BROTLI_QUALITY if cached else DYNAMIC_BROTLI_QUALITY
+            return brotli.compress(body, quality=quality)
+        level = CACHED_GZIP_LEVEL if cached else DYNAMIC_GZIP_LEVEL
+        return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class EncodedBody:
+    """A serialized JSON body and its lazily built compressed variants
+
+    Variants of a body held by a ``ResponseCache`` are counted against its
+    size limit as they are built.
+    """
+
+    __slots__ = ("identity", "variants", "etag", "key", "cache")
+
+    def __init__(self, identity, key=None, cache=None):
+        self.identity = identity
+        self.variants = {}
+        self.etag = make_etag(identity)
+        self.key = key
+        self.cache = cache
+
+    def encoded(self, encoding):
+        body = self.variants.get(encoding)
+        if body is None:
+            body = compress(self.identity, encoding, cached=True)
+            if self.cache is None:
+                self.variants[encoding] = body
+            else:
+                body = self.cache.add_variant(self, encoding, body)
+        return body
+
+    @property
+    def size(self):
+        return len(self.identity) + sum(map(len, self.variants.values()))
+
+
+class ResponseCache:
+    """LRU of encoded response bodies bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        started = time.perf_counter()
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+        record_cache("responses", time.perf_counter() - started, body is not None)
+        return body
+
+    def put(self, key, data):
+        """Encode and store data, returning its EncodedBody"""
+        with timed("serialize"):
+            body = EncodedBody(dumps(data), key, self)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = body
+            self._bytes += body.size
+            self._evict()
+        return body
+
+    def add_variant(self, body, encoding, data):
+        """Keep a compressed variant of a body, counting it if still cached"""
+        with self._lock:
+            existing = body.variants.get(encoding)
+            if existing is not None:
+                # Built concurrently by another request
+                return existing
+            body.variants[encoding] = data
+            if self._entries.get(body.key) is body:
+                self._bytes += len(data)
+                self._evict()
+        return data
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = None
+_min_compress_size = DEFAULT_MIN_COMPRESS_SIZE
+
+
+def init_response_cache(
+    max_bytes=DEFAULT_MAX_BYTES, min_compress_size=DEFAULT_MIN_COMPRESS_SIZE
+):
+    """Create the process-wide encoded response cache"""
+    global _cache, _min_compress_size
+    _cache = ResponseCache(max_bytes)
+    _min_compress_size = min_compress_size
+    return _cache
+
+
+def get_response_cache():
+    if _cache is None:
+        init_response_cache()
+    return _cache
+
+
+def _build_response(identity, status, headers, encode, etag=None):
+    headers = dict(headers or {})
+    if status == 200 and request.method in ("GET", "HEAD"):
+        if "ETag" not in headers:
+            # No data version known: validate on the body itself
+            etag = etag or make_etag(identity)
+            headers["ETag"] = quote_etag(etag)
+            if request.if_none_match.contains_weak(etag):
+                return not_modified_response(headers)
+        elif request.if_none_match and request.if_none_match.contains_weak(
+            etag or make_etag(identity)
+        ):
+            # The client's copy was sent with the body's hash before the
+            # data had a version
+            return not_modified_response(headers)
+
+    response = Response(status=status, mimetype=MIMETYPE, headers=headers)
+    response.vary.add("Accept-Encoding")
+
+    encoding = None
+    if len(identity) >= _min_compress_size:
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        response.set_data(identity)
+    else:
+        response.set_data(encode(encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def json_response(data, status=200, headers=None):
+    """Serialize and (when accepted) compress a response body"""
+    with timed("serialize"):
+        identity = dumps(data)
+    return _build_response(
+        identity, status, headers, lambda encoding: compress(identity, encoding)
+    )
+
+
+def conditional_response(conditional, build, cache=False):
+    """Answer a GET for a versioned resource
+
+    Returns 304 when the client's copy is still current. Otherwise ``build``
+    returns the data, or a ``(data, status)`` tuple for errors and partial
+    results, which get no validators and are never cached. With ``cache``
+    (immutable results) the encoded body is kept under the resource key.
+    """
+    not_modified, headers = conditional.evaluate()
+    if not_modified is not None:
+        return not_modified
+
+    body = get_response_cache().get(conditional.resource) if cache else None
+    if body is None:
+        data = build()
+        if isinstance(data, tuple):
+            return data
+        if not cache:
+            return json_response(data, 200, headers)
+        body = get_response_cache().put(conditional.resource, data)
+    return _build_response(body.identity, 200, headers, body.encoded, body.etag)
+
+
+def ndjson_response(rows, headers=None, chunk_rows=DEFAULT_NDJSON_CHUNK_ROWS):
+    """Stream rows as newline-delimited JSON while they are produced
+
+    Only one chunk of rows is serialized at a time. When the client accepts
+    gzip the stream is compressed incrementally, flushing after every chunk.
+    """
+    # Streams are only ever gzipped: never fall back to it unasked
+    encodings = accepted_encodings(request.headers.get("Accept-Encoding"))
+    encoding = "gzip" if "gzip" in encodings or "*" in encodings else None
+
+    def generate():
+        compressor = None
+        if encoding is not None:
+            compressor = zlib.compressobj(DYNAMIC_GZIP_LEVEL, zlib.DEFLATED, 31)
+        chunk = []
+        for row in rows:
+            chunk.append(dumps(row))
+            if len(chunk) < chunk_rows:
+                continue
+            data = b"\n".join(chunk) + b"\n"
+            chunk = []
+            if compressor is None:
+                yield data
+            else:
+                yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        data = b"\n".join(chunk) + b"\n" if chunk else b""
+        if compressor is None:
+            if data:
+                yield data
+        else:
+            yield compressor.compress(data) + compressor.flush()
+
+    response = Response(
+        stream_with_context(generate()), mimetype=NDJSON_MIMETYPE, headers=headers
+    )
+    response.vary.add("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    return response
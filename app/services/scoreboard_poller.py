@@ -0,0 +1,168 @@
+"""
+Background poller for today's scoreboard.
+
+The poller refreshes ``ScoreboardV2`` on its own schedule and keeps the
+latest extracted games in memory as a versioned snapshot, so ``/games/today``
+never calls stats.nba.com on the request path. It polls quickly while games
+are live, slowly while games are only scheduled, and sleeps until the next
+day once today's games are over (or none are scheduled).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.services.nba_stats import get_scoreboard
+from app.utils.games_util import extract_game_data
+from app.utils.rowsets import column, result_set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIVE_INTERVAL = 5
+DEFAULT_IDLE_INTERVAL = 60
+DEFAULT_ERROR_INTERVAL = 15
+
+# GAME_STATUS_ID values in ScoreboardV2's GameHeader
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+
+
+def today_string():
+    return datetime.now().strftime("%m/%d/%Y")
+
+
+class ScoreboardPoller:
+    """Keeps an in-memory, versioned snapshot of today's games"""
+
+    def __init__(
+        self,
+        live_interval=DEFAULT_LIVE_INTERVAL,
+        idle_interval=DEFAULT_IDLE_INTERVAL,
+        error_interval=DEFAULT_ERROR_INTERVAL,
+    ):
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        self.error_interval = error_interval
+
+        self._snapshot = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+
+    @property
+    def snapshot(self):
+        """The latest snapshot, or None before the first successful poll"""
+        return self._snapshot
+
+    def poll(self):
+        """Fetch the scoreboard once and publish a new snapshot if it changed"""
+        game_date = today_string()
+        data = get_scoreboard(game_date, refresh=True)
+        games = extract_game_data(data)
+        statuses = column(result_set(data, "GameHeader"), "GAME_STATUS_ID")
+
+        with self._lock:
+            previous = self._snapshot
+            if (
+                previous is not None
+                and previous["date"] == game_date
+                and previous["games"] == games
+            ):
+                # Unchanged: keep the version, only bump the fetch time
+                snapshot = dict(previous, fetched_at=datetime.now().isoformat())
+            else:
+                snapshot = {
+                    "date": game_date,
+                    "version": 1 if previous is None else previous["version"] + 1,
+                    "fetched_at": datetime.now().isoformat(),
+                    "games": games,
+                    # Same games give the same digest in every worker
+                    "digest": hashlib.blake2b(
+                        json.dumps(games, sort_keys=True).encode("utf-8"),
+                        digest_size=16,
+                    ).hexdigest(),
+                    "modified_at": time.time(),
+                }
+            snapshot["live"] = GAME_STATUS_LIVE in statuses
+            snapshot["scheduled"] = GAME_STATUS_SCHEDULED in statuses
+            self._snapshot = snapshot
+
+        if previous is None or snapshot["version"] != previous["version"]:
+            for listener in list(self._listeners):
+                try:
+                    listener(previous, snapshot)
+                except Exception as e:
+                    logger.error(f"Error in scoreboard listener: {str(e)}")
+        return snapshot
+
+    def add_listener(self, listener):
+        """Call ``listener(previous, snapshot)`` whenever a new version is published"""
+        self._listeners.append(listener)
+
+    def next_delay(self, snapshot):
+        """Seconds to wait before the next poll given the latest snapshot"""
+        if snapshot["live"]:
+            return self.live_interval
+        if snapshot["scheduled"]:
+            return self.idle_interval
+        # Nothing left to play today: sleep until just after midnight
+        tomorrow = (datetime.now() + timedelta(days=1)).replace(
+            hour=0, minute=0, second=5, microsecond=0
+        )
+        return (tomorrow - datetime.now()).total_seconds()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                delay = self.next_delay(self.poll())
+            except Exception as e:
+                logger.error(f"Error polling scoreboard: {str(e)}")
+                delay = self.error_interval
+
+            self._wake_event.wait(delay)
+            self._wake_event.clear()
+
+    def wake(self):
+        """Poll again immediately"""
+        self._wake_event.set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="scoreboard-poller", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+_poller = None
+
+
+def start_scoreboard_poller(**kwargs):
+    """Start the process-wide scoreboard poller"""
+    global _poller
+    if _poller is not None:
+        _poller.stop()
+    _poller = ScoreboardPoller(**kwargs).start()
+    return _poller
+
+
+def get_scoreboard_poller():
+    """Return the running poller, or None if polling is disabled"""
+    return _poller
@@ -0,0 +1,216 @@
+"""
+Server-Sent Events fan-out of live scoreboard changes.
+
+The scoreboard poller calls ``ScoreboardStream.publish`` once per new
+snapshot version. Per-game deltas are computed and encoded as an SSE event
+once, appended to a short ring buffer and every subscriber is woken with a
+single ``notify_all``; subscribers only copy bytes that were already
+encoded, so the cost of a refresh does not grow with the number of clients.
+
+Event IDs are the snapshot's content digest rather than the poller's
+version counter, so they mean the same games in every worker. A client
+reconnecting with ``Last-Event-ID`` -- possibly to another worker -- is
+sent the deltas after that state when they are buffered here, nothing if
+it is the current state, and a full snapshot otherwise.
+
+Each subscriber is a WSGI response iterator, so it holds one server thread
+blocked in ``Condition.wait`` for as long as it stays connected. Fan-out
+costs nothing per subscriber, but the number of subscribers a worker can
+hold is its thread count (gunicorn ``--threads``, or greenlets under a
+gevent worker), and streams share those threads with ordinary requests.
+Size the threads for the expected subscribers plus regular traffic, or
+route ``/games/stream`` to workers of its own.
+"""
+
+import json
+import threading
+from collections import deque
+
+# Fields of an extracted game that change while it is being played
+DELTA_FIELDS = ("game_status", "live_period", "live_period_time_bcast", "line_score")
+
+DEFAULT_BUFFER_SIZE = 256
+DEFAULT_HEARTBEAT = 15
+
+HEARTBEAT_EVENT = b": keep-alive\n\n"
+
+
+def encode_event(event, event_id, data):
+    """Encode one SSE event"""
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"event: {event}\nid: {event_id}\ndata: {payload}\n\n".encode("utf-8")
+
+
+def diff_games(previous_games, games):
+    """Return per-game deltas between two lists of extracted games"""
+    previous = {game["game_id"]: game for game in previous_games}
+    current_ids = set()
+    deltas = []
+
+    for game in games:
+        game_id = game["game_id"]
+        current_ids.add(game_id)
+        old = previous.get(game_id)
+        if old is None:
+            deltas.append({"game_id": game_id, "added": True, "game": game})
+            continue
+        changes = {
+            field: game.get(field)
+            for field in DELTA_FIELDS
+            if game.get(field) != old.get(field)
+        }
+        if changes:
+            changes["game_id"] = game_id
+            deltas.append(changes)
+
+    for game_id in previous:
+        if game_id not in current_ids:
+            deltas.append({"game_id": game_id, "removed": True})
+    return deltas
+
+
+class ScoreboardStream:
+    """Versioned buffer of encoded scoreboard events shared by all subscribers"""
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE, heartbeat=DEFAULT_HEARTBEAT):
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=buffer_size)
+        self._snapshot_event = None
+        self._version = None
+        self._event_id = None
+        self._condition = threading.Condition()
+        self._subscribers = 0
+        self._published = 0
+
+    def publish(self, previous, snapshot):
+        """Encode the delta and snapshot events for a new scoreboard version"""
+        version = snapshot["version"]
+        if version == self._version:
+            return
+        event_id = snapshot["digest"]
+        snapshot_event = encode_event(
+            "snapshot",
+            event_id,
+            {
+                "date": snapshot["date"],
+                "version": version,
+                "fetched_at": snapshot["fetched_at"],
+                "games": snapshot["games"],
+            },
+        )
+        delta_event = None
+        if previous is not None and previous["date"] == snapshot["date"]:
+            delta_event = encode_event(
+                "delta",
+                event_id,
+                {
+                    "version": version,
+                    "previous_version": previous["version"],
+                    "fetched_at": snapshot["fetched_at"],
+                    "games": diff_games(previous["games"], snapshot["games"]),
+                },
+            )
+
+        with self._condition:
+            if delta_event is None:
+                # New day (or first poll): clients must start from a snapshot
+                self._events.clear()
+            else:
+                self._events.append((version, previous["digest"], delta_event))
+            self._snapshot_event = snapshot_event
+            self._version = version
+            self._event_id = event_id
+            self._published += 1
+            self._condition.notify_all()
+
+    def _events_after(self, version):
+        """Return buffered events newer than ``version``, or None if evicted"""
+        if version == self._version:
+            return []
+        if (
+            version > self._version
+            or not self._events
+            or self._events[0][0] > version + 1
+        ):
+            return None
+        return [
+            event for event_version, _, event in self._events if event_version > version
+        ]
+
+    def _events_since(self, event_id):
+        """Return buffered events after the state ``event_id``, or None if unknown"""
+        if event_id == self._event_id:
+            return []
+        events = list(self._events)
+        # Each delta records the state it applies to; states can repeat, and
+        # the latest occurrence leads to the current one
+        for i in range(len(events) - 1, -1, -1):
+            if events[i][1] == event_id:
+                return [event for _, _, event in events[i:]]
+        return None
+
+    def subscribe(self, last_event_id=None, stop_event=None):
+        """Yield encoded events: a snapshot (or missed deltas), then deltas"""
+        with self._condition:
+            self._subscribers += 1
+        try:
+            with self._condition:
+                version = self._version
+                pending = None
+                if last_event_id is not None and version is not None:
+                    pending = self._events_since(last_event_id)
+                if pending is None:
+                    pending = [self._snapshot_event] if version is not None else []
+
+            for event in pending:
+                yield event
+
+            while stop_event is None or not stop_event.is_set():
+                with self._condition:
+                    if self._version == version:
+                        self._condition.wait(self.heartbeat)
+                    if self._version == version:
+                        pending = [HEARTBEAT_EVENT]
+                    else:
+                        pending = None
+                        if version is not None:
+                            pending = self._events_after(version)
+                        if pending is None:
+                            # Fell behind the buffer: resync from a snapshot
+                            pending = [self._snapshot_event]
+                        version = self._version
+
+                for event in pending:
+                    yield event
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+
+    def stats(self):
+        with self._condition:
+            return {
+                "version": self._version,
+                "event_id": self._event_id,
+                "subscribers": self._subscribers,
+                "buffered_events": len(self._events),
+                "published": self._published,
+            }
+
+
+_stream = None
+
+
+def init_scoreboard_stream(poller, **kwargs):
+    """Attach a stream to the poller so every new version is fanned out"""
+    global _stream
+    _stream = ScoreboardStream(**kwargs)
+    poller.add_listener(_stream.publish)
+    snapshot = poller.snapshot
+    if snapshot is not None:
+        _stream.publish(None, snapshot)
+    return _stream
+
+
+def get_scoreboard_stream():
+    """Return the stream, or None if the scoreboard poller is disabled"""
+    return _stream
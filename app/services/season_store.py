@@ -0,0 +1,147 @@
+"""
+Season-wide team box-score store.
+
+One league-wide ``TeamGameLogs`` call returns the team stats of every game
+in a season, so a whole season is ingested in bulk and indexed by game and
+by unordered team pair. Matchup lookups are then dictionary lookups with
+no per-game upstream calls.
+"""
+
+import logging
+import threading
+import time
+
+from nba_api.stats.library.parameters import SeasonAll
+
+from app.services.nba_stats import league_team_logs_version, versioned_league_team_logs
+from app.services.single_flight import SingleFlight
+from app.services.stats_cache import CURRENT_SEASON_LOGS_TTL, ttl_for
+from app.utils.rowsets import header_index, result_set
+
+logger = logging.getLogger(__name__)
+
+
+def pair_key(team1_id, team2_id):
+    """Return the unordered key for a pair of teams"""
+    return frozenset((team1_id, team2_id))
+
+
+class SeasonGameStore:
+    """Team stats of every game in one season and season type"""
+
+    def __init__(self, season, season_type, table, version=None):
+        self.season = season
+        self.season_type = season_type
+        # ``stored_at`` of the cached league logs the store was built from
+        self.version = version
+        self.built_at = time.time()
+        # Rows are kept raw; project them with ``headers``
+        self.headers = table["headers"]
+        self.games = {}
+        self.pairs = {}
+
+        if not table["data"]:
+            return
+        index = header_index(table)
+        game_id, team_id, game_date = (
+            index["GAME_ID"],
+            index["TEAM_ID"],
+            index["GAME_DATE"],
+        )
+
+        dates = {}
+        for row in table["data"]:
+            self.games.setdefault(row[game_id], {})[row[team_id]] = row
+            dates[row[game_id]] = row[game_date]
+
+        for gid, teams in self.games.items():
+            if len(teams) != 2:
+                continue
+            self.pairs.setdefault(pair_key(*teams), []).append(gid)
+
+        # Most recent games first, matching the order routes return
+        for game_ids in self.pairs.values():
+            game_ids.sort(key=dates.__getitem__, reverse=True)
+
+    def __len__(self):
+        return len(self.games)
+
+    def pair_games(self, team1_id, team2_id):
+        """Return the IDs of games between two teams, most recent first"""
+        return self.pairs.get(pair_key(team1_id, team2_id), [])
+
+    def team_stats(self, game_id, team_id):
+        """Return one team's raw row for a game, or None"""
+        return self.games.get(game_id, {}).get(team_id)
+
+    def is_stale(self):
+        ttl = ttl_for("TeamGameLogs", {"season": self.season})
+        if ttl is not None and time.time() - self.built_at > ttl:
+            return True
+        # The cached logs were refreshed under us
+        return self.version != league_team_logs_version(
+            self.season, self.season_type, True
+        )
+
+
+_stores = {}
+_builds = SingleFlight()
+
+
+def ingest_season(season, season_type):
+    """Load a season's team logs in bulk and (re)build its store"""
+    data, version = versioned_league_team_logs(season, season_type)
+    store = SeasonGameStore(
+        season, season_type, result_set(data, "TeamGameLogs"), version
+    )
+    _stores[(season, season_type)] = store
+    logger.info(f"Ingested {len(store)} {season_type} games for {season}")
+    return store
+
+
+def get_season_store(season, season_type):
+    """Return the store for a season and season type, ingesting it if needed"""
+    store = _stores.get((season, season_type))
+    if store is not None and not store.is_stale():
+        return store
+    return _builds.do(
+        (season, season_type),
+        lambda: ingest_season(season, season_type),
+        group="SeasonGameStore",
+    )
+
+
+def held_season_store(season, season_type):
+    """Return the store held for a season and season type, even if stale, or None"""
+    return _stores.get((season, season_type))
+
+
+def _ingest_loop(seasons, season_types, interval, stop_event):
+    while True:
+        for season in seasons:
+            for season_type in season_types:
+                try:
+                    get_season_store(season, season_type)
+                except Exception as e:
+                    logger.error(
+                        f"Error ingesting {season_type} games for {season}: {str(e)}"
+                    )
+        if stop_event.wait(interval):
+            return
+
+
+def start_season_ingest(
+    seasons=None, season_types=("Regular Season",), interval=CURRENT_SEASON_LOGS_TTL
+):
+    """Ingest seasons in the background and re-ingest them once stale"""
+    seasons = list(seasons or [SeasonAll.current_season])
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=_ingest_loop,
+        args=(seasons, list(season_types), interval, stop_event),
+        name="season-ingest",
+        daemon=True,
+    )
+    thread.stop_event = stop_event
+    thread.start()
+    return thread
@@ -0,0 +1,88 @@
+"""
+Single-flight coalescing of concurrent identical upstream fetches.
+
+While one caller is loading a key, every other caller asking for the same
+key waits for that load and shares its result instead of issuing its own
+request to stats.nba.com.
+"""
+
+import threading
+
+
+class WaitTimeout(TimeoutError):
+    """Raised to a caller that stopped waiting for another caller's load"""
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {}
+
+    def _count(self, group, counter):
+        counters = self._counters.setdefault(
+            group, {"calls": 0, "executions": 0, "collapsed": 0}
+        )
+        counters["calls"] += 1
+        counters[counter] += 1
+
+    def do(self, key, fn, group="default", timeout=None):
+        """Run ``fn`` for ``key`` unless a call for it is already in flight
+
+        A caller waiting on another's call raises WaitTimeout after
+        ``timeout`` seconds; the call itself carries on.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+                self._count(group, "executions")
+            else:
+                leader = False
+                self._count(group, "collapsed")
+
+        if not leader:
+            if not call.event.wait(timeout):
+                raise WaitTimeout(f"{key} still loading after {timeout:g}s")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self):
+        """Return the number of keys currently being loaded"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """Return call/execution/collapsed counters per group"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "groups": {
+                    group: dict(counters) for group, counters in self._counters.items()
+                },
+            }
@@ -0,0 +1,317 @@
+"""
+Persistent cache for upstream stats.nba.com responses.
+
+Entries are stored in SQLite keyed by endpoint name and request parameters,
+so cached data survives restarts and deploys, and is shared by every worker
+process using the same file. Each endpoint has its own TTL policy (see
+``ttl_for``).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from nba_api.stats.library.parameters import SeasonAll
+
+from app.services.deadline import DeadlineExceeded, current_deadline
+from app.utils.seasons import season_start_year
+
+logger = logging.getLogger(__name__)
+
+# TTL policies in seconds; None means the entry never expires
+SCOREBOARD_TTL = 10
+CURRENT_SEASON_LOGS_TTL = 15 * 60
+PLAYER_INFO_TTL = 6 * 60 * 60
+ALL_PLAYERS_TTL = 6 * 60 * 60
+DEFAULT_TTL = 60
+
+# Bumped whenever the stored payload format changes; older entries are dropped
+SCHEMA_VERSION = 2
+
+ENDPOINT_TTLS = {
+    "ScoreboardV2": SCOREBOARD_TTL,
+    "CommonPlayerInfo": PLAYER_INFO_TTL,
+    "CommonAllPlayers": ALL_PLAYERS_TTL,
+}
+
+SEASON_SCOPED_ENDPOINTS = {"TeamGameLogs", "PlayerGameLogs"}
+
+# Shared-file tuning: memory-mapped reads, how long to wait on another
+# process's write, and how long a fill lease lasts (above the upstream timeout)
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_BUSY_TIMEOUT = 5.0
+DEFAULT_FILL_LEASE = 35.0
+FILL_POLL_INTERVAL = 0.05
+
+# How long past expiry an entry is still served while it is refreshed
+DEFAULT_STALE_WINDOW = 24 * 60 * 60
+
+
+def _season_is_past(season):
+    try:
+        return season_start_year(season) < season_start_year(SeasonAll.current_season)
+    except (TypeError, ValueError):
+        return False
+
+
+def ttl_for(endpoint, params):
+    """Return the TTL in seconds for an endpoint call (None = never expires)"""
+    if endpoint in SEASON_SCOPED_ENDPOINTS:
+        # Logs of a finished season are immutable; the current season, and
+        # seasons that have not started yet, still change
+        if _season_is_past(params.get("season")):
+            return None
+        return CURRENT_SEASON_LOGS_TTL
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def season_is_final(season):
+    """Whether a season is over, so data scoped to it never changes"""
+    return ttl_for("TeamGameLogs", {"season": season}) is None
+
+
+def make_key(endpoint, params):
+    """Build a stable cache key from an endpoint name and its parameters"""
+    return endpoint + ":" + json.dumps(params, sort_keys=True, default=str)
+
+
+class StatsCache:
+    """SQLite-backed response cache with per-endpoint hit/miss counters
+
+    The database runs in WAL mode and every thread has its own connection,
+    so lookups take no lock in this process and never wait for writers in
+    other processes. Pointing every worker on a node at the same file makes
+    it one shared cache: a response stored by one worker is a hit for all
+    of them. Misses are filled once across workers with ``acquire_fill``
+    leases. WAL needs shared memory, so the file must be on a local disk.
+    """
+
+    def __init__(
+        self,
+        path,
+        mmap_size=DEFAULT_MMAP_SIZE,
+        busy_timeout=DEFAULT_BUSY_TIMEOUT,
+        fill_lease=DEFAULT_FILL_LEASE,
+        stale_window=DEFAULT_STALE_WINDOW,
+    ):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.fill_lease = fill_lease
+        self.stale_window = stale_window
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner = str(os.getpid())
+        conn = self._connection()
+        self.journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                data TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL
+            )
+            """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fills (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("DELETE FROM responses")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+        self._counters = {}
+
+    def _connection(self):
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, endpoint, counter):
+        with self._lock:
+            counters = self._counters.setdefault(
+                endpoint, {"hits": 0, "misses": 0, "stores": 0, "waits": 0}
+            )
+            counters[counter] += 1
+
+    def get(self, endpoint, params, record=True):
+        """Return the cached data for a call, or None on a miss or expiry"""
+        key = make_key(endpoint, params)
+        row = (
+            self._connection()
+            .execute("SELECT data, expires_at FROM responses WHERE key = ?", (key,))
+            .fetchone()
+        )
+
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            if record:
+                self._count(endpoint, "misses")
+            return None
+
+        if record:
+            self._count(endpoint, "hits")
+        return json.loads(row[0])
+
+    def get_entry(self, endpoint, params):
+        """Return ``(data, stored_at, expires_at)`` even if expired, or None"""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT data, stored_at, expires_at FROM responses WHERE key = ?",
+                (make_key(endpoint, params),),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def in_stale_window(self, expires_at):
+        """Whether an expired entry may still be served while it is refreshed"""
+        return expires_at is not None and time.time() - expires_at <= self.stale_window
+
+    def stored_at(self, endpoint, params, expired=False):
+        """Return when a call was stored, or None if it is missing
+
+        Expired entries count as missing unless ``expired`` is set.
+        """
+        key = make_key(endpoint, params)
+        row = (
+            self._connection()
+            .execute(
+                "SELECT stored_at, expires_at FROM responses WHERE key = ?", (key,)
+            )
+            .fetchone()
+        )
+        if row is None or (
+            not expired and row[1] is not None and row[1] <= time.time()
+        ):
+            return None
+        return row[0]
+
+    def set(self, endpoint, params, data, ttl=None):
+        """Store the data for a call, expiring after ``ttl`` seconds"""
+        key = make_key(endpoint, params)
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        payload = json.dumps(data)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, data, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, payload, now, expires_at),
+            )
+        self._count(endpoint, "stores")
+
+    def acquire_fill(self, endpoint, params):
+        """Claim the upstream fetch of a missing call for this process
+
+        Returns False while another process holds an unexpired lease on it;
+        that process will store the result, so wait with ``wait_for_fill``.
+        """
+        key = make_key(endpoint, params)
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM fills WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO fills (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, self._owner, now + self.fill_lease),
+            )
+        return cursor.rowcount == 1
+
+    def release_fill(self, endpoint, params):
+        """Give up this process's lease on a call, once stored or failed"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM fills WHERE key = ? AND owner = ?",
+                (make_key(endpoint, params), self._owner),
+            )
+
+    def wait_for_fill(self, endpoint, params):
+        """Wait for another process to store a call it holds the lease on
+
+        Returns the stored data, or None once the lease is released or has
+        expired without a result (the fetch failed or its worker died).
+        Raises DeadlineExceeded if the request deadline passes first.
+        """
+        key = make_key(endpoint, params)
+        conn = self._connection()
+        while True:
+            data = self.get(endpoint, params, record=False)
+            if data is not None:
+                self._count(endpoint, "waits")
+                return data
+            lease = conn.execute(
+                "SELECT expires_at FROM fills WHERE key = ?", (key,)
+            ).fetchone()
+            if lease is None or lease[0] <= time.time():
+                return None
+            deadline = current_deadline()
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(
+                    f"Gave up waiting for another worker's {endpoint} fetch: "
+                    f"{deadline.budget:g}s request deadline exceeded"
+                )
+            time.sleep(FILL_POLL_INTERVAL)
+
+    def clear(self, endpoint=None):
+        """Remove all entries, or only those of one endpoint"""
+        conn = self._connection()
+        with conn:
+            if endpoint is None:
+                conn.execute("DELETE FROM responses")
+            else:
+                conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+
+    def stats(self):
+        """Return hit/miss counters per endpoint plus the stored entry counts"""
+        conn = self._connection()
+        entries = dict(
+            conn.execute(
+                "SELECT endpoint, COUNT(*) FROM responses GROUP BY endpoint"
+            ).fetchall()
+        )
+        fills = conn.execute(
+            "SELECT COUNT(*) FROM fills WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+        with self._lock:
+            endpoints = {}
+            for endpoint in set(entries) | set(self._counters):
+                counters = dict(
+                    self._counters.get(
+                        endpoint, {"hits": 0, "misses": 0, "stores": 0, "waits": 0}
+                    )
+                )
+                lookups = counters["hits"] + counters["misses"]
+                counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+                counters["entries"] = entries.get(endpoint, 0)
+                endpoints[endpoint] = counters
+
+        return {
+            "path": self.path,
+            "journal_mode": self.journal_mode,
+            "fills_in_progress": fills,
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,375 @@
+"""
+Asynchronous gateway to stats.nba.com.
+
+All upstream requests run as coroutines on one background event loop that
+owns a pooled keep-alive ``aiohttp`` session, so a worker can keep many
+upstream calls in flight at once. Responses are returned as nba_api's
+``get_data_sets()`` tables (headers plus raw rows per result set) and are
+projected by callers with ``app.utils.rowsets``.
+
+Synchronous code (the Flask routes) uses the blocking ``call``; routes fan
+out on the shared executor, whose threads all wait on this one loop.
+
+Requests are throttled by an optional token bucket and a cap on concurrent
+upstream requests, so bursts queue here instead of getting throttled by
+stats.nba.com. A circuit breaker refuses calls outright while the upstream
+keeps failing, so callers can fall back to stale data without waiting.
+
+Calls made under a request deadline (``app.services.deadline``) are
+refused once it has passed and waited on only until it passes; the
+request itself stays on the wire for other callers sharing it. With a
+hedge delay set, such a call that has not answered after the delay is sent
+a second time and the first response wins, so one straggling upstream
+connection does not use up the budget.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+import aiohttp
+from nba_api.stats.library.http import NBAStatsHTTP, NBAStatsResponse
+
+from app.services.circuit_breaker import (
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_RESET_TIMEOUT,
+    CircuitBreaker,
+)
+from app.services.deadline import DeadlineExceeded, check_deadline, current_deadline
+from app.services.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 100
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class StatsGatewayError(Exception):
+    """Raised when stats.nba.com returns an error or unusable response"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(StatsGatewayError):
+    """Raised instead of calling stats.nba.com while the circuit is open"""
+
+
+def is_upstream_failure(error):
+    """Whether an error means stats.nba.com is down, slow or throttling us"""
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError)):
+        return True
+    if isinstance(error, StatsGatewayError):
+        return error.status is None or error.status >= 500 or error.status == 429
+    return False
+
+
+def build_request(endpoint_cls, **kwargs):
+    """Return the (endpoint, parameters) nba_api would send for an endpoint call"""
+    endpoint = endpoint_cls(get_request=False, **kwargs)
+    return endpoint_cls.endpoint, endpoint.parameters
+
+
+class StatsGateway:
+    """Pooled keep-alive client for stats.nba.com running on its own event loop"""
+
+    def __init__(
+        self,
+        base_url=NBAStatsHTTP.base_url,
+        headers=None,
+        pool_size=DEFAULT_POOL_SIZE,
+        keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+        timeout=DEFAULT_TIMEOUT,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        rate_limit=None,
+        rate_burst=None,
+        breaker_threshold=DEFAULT_FAILURE_THRESHOLD,
+        breaker_reset=DEFAULT_RESET_TIMEOUT,
+        hedge_delay=None,
+    ):
+        self.base_url = base_url
+        self.headers = dict(NBAStatsHTTP.headers if headers is None else headers)
+        # aiohttp only decodes brotli when an optional package is installed
+        self.headers["Accept-Encoding"] = "gzip, deflate"
+        self.headers.pop("Host", None)
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst) if rate_limit else None
+        self.breaker = (
+            CircuitBreaker(breaker_threshold, breaker_reset)
+            if breaker_threshold
+            else None
+        )
+        self.hedge_delay = hedge_delay
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._active = 0
+        self._requests = 0
+        self._errors = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._inflight = {}
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="stats-gateway", daemon=True
+                )
+                thread.start()
+                self._thread = thread
+                self._loop = loop
+        return self._loop
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _acquire(self):
+        """Wait for the rate limiter and a concurrency slot"""
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve()
+                if delay:
+                    await asyncio.sleep(delay)
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        wait = time.perf_counter() - started
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+
+    async def _request(self, endpoint, parameters):
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError(
+                f"{endpoint} not requested: stats.nba.com circuit is open"
+            )
+        await self._acquire()
+        self._active += 1
+        self._requests += 1
+        failed = True
+        try:
+            result = await self._send(endpoint, parameters)
+            failed = False
+            return result
+        except asyncio.CancelledError:
+            # A hedge that lost the race says nothing about the upstream
+            failed = None
+            raise
+        except Exception as e:
+            self._errors += 1
+            failed = is_upstream_failure(e)
+            raise
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+            if self.breaker is not None and failed is not None:
+                if failed:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+    async def _hedged_request(self, endpoint, parameters):
+        """Send a second request if the first is slow; the first answer wins"""
+        primary = asyncio.ensure_future(self._request(endpoint, parameters))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay)
+        if done:
+            return primary.result()
+
+        self._hedges += 1
+        hedge = asyncio.ensure_future(self._request(endpoint, parameters))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_wins += 1
+                        return task.result()
+            # Both failed: report the original request's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(self, endpoint, parameters):
+        session = await self._get_session()
+        url = self.base_url.format(endpoint=endpoint)
+        # Match nba_api: parameters are sorted and None values are left out
+        params = [
+            (key, str(value))
+            for key, value in sorted(parameters.items())
+            if value is not None
+        ]
+        async with session.get(url, params=params) as response:
+            contents = await response.text()
+            if response.status != 200:
+                raise StatsGatewayError(
+                    f"{endpoint} returned HTTP {response.status}: {contents[:200]}",
+                    status=response.status,
+                )
+
+        result = NBAStatsResponse(
+            response=NBAStatsHTTP().clean_contents(contents),
+            status_code=response.status,
+            url=str(response.url),
+        )
+        if not result.valid_json():
+            raise StatsGatewayError(f"{endpoint} returned an invalid JSON response")
+        return result.get_data_sets()
+
+    async def fetch(self, endpoint_cls, hedge=False, **kwargs):
+        """Fetch one endpoint call and return its result sets
+
+        With ``hedge`` and a hedge delay set, a slow request is sent twice.
+        """
+        endpoint, parameters = build_request(endpoint_cls, **kwargs)
+        key = (endpoint, tuple(sorted(parameters.items())))
+
+        # Identical requests already on the wire share one response
+        future = self._inflight.get(key)
+        if future is None:
+            request = (
+                self._hedged_request
+                if hedge and self.hedge_delay is not None
+                else self._request
+            )
+            future = asyncio.ensure_future(request(endpoint, parameters))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the gateway loop and wait for its result"""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def call(self, endpoint_cls, **kwargs):
+        """Blocking wrapper around ``fetch``
+
+        Refused once the request deadline has passed, hedged before it and
+        abandoned with DeadlineExceeded when it passes.
+        """
+        endpoint = endpoint_cls.endpoint
+        check_deadline(endpoint)
+        deadline = current_deadline()
+        if deadline is None:
+            return self.run(self.fetch(endpoint_cls, **kwargs))
+
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch(endpoint_cls, hedge=True, **kwargs), self._ensure_started()
+        )
+        done, _ = concurrent.futures.wait([future], timeout=deadline.remaining())
+        if not done:
+            # Only this wait is cancelled; the shared request runs on
+            future.cancel()
+            raise DeadlineExceeded(
+                f"{endpoint} not answered: {deadline.budget:g}s request deadline exceeded"
+            )
+        return future.result()
+
+    def stats(self):
+        """Return upstream queue depth, concurrency and wait time counters"""
+        stats = {
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._waiting,
+            "active": self._active,
+            "requests": self._requests,
+            "errors": self._errors,
+            "wait_seconds_total": self._wait_total,
+            "wait_seconds_max": self._wait_max,
+            "wait_seconds_avg": (
+                self._wait_total / self._requests if self._requests else 0.0
+            ),
+            "hedge_delay": self.hedge_delay,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+        }
+        if self.rate_limiter is not None:
+            stats["rate_limit"] = self.rate_limiter.stats()
+        if self.breaker is not None:
+            stats["circuit"] = self.breaker.stats()
+        return stats
+
+    def close(self):
+        """Close the connection pool and stop the event loop
+
+        The next call starts a new loop, so a closed gateway stays usable.
+        """
+        if self._loop is None:
+            return
+        if self._session is not None:
+            self.run(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+        self._session = None
+        # The semaphore may be bound to the closed loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._inflight = {}
+
+
+_gateway = None
+_gateway_options = {}
+
+
+def init_stats_gateway(**kwargs):
+    """Create the gateway used for all upstream calls"""
+    global _gateway, _gateway_options
+    if _gateway is not None:
+        _gateway.close()
+    _gateway = StatsGateway(**kwargs)
+    _gateway_options = kwargs
+    return _gateway
+
+
+def _reset_after_fork():
+    # The event loop thread and its sockets belong to the parent
+    global _gateway
+    if _gateway is not None:
+        _gateway = StatsGateway(**_gateway_options)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_stats_gateway():
+    """Return the active gateway, creating a default one if needed"""
+    if _gateway is None:
+        init_stats_gateway()
+    return _gateway
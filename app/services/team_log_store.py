@@ -0,0 +1,221 @@
+"""
+Columnar NumPy store for team game logs.
+
+A team's logs are held as one float array per stat (a 2D ``stats x games``
+matrix in chronological order) plus boolean masks for home games and wins,
+so season, last-N, split and rate aggregates are a few vectorized
+reductions instead of a pass over per-game dicts. Game IDs and dates are
+typed arrays too, so a season of a team is a few kilobytes in the shared
+memory cache.
+"""
+
+import time
+
+import numpy as np
+
+from app.services.memory_cache import get_memory_cache
+from app.services.nba_stats import team_game_logs_version, versioned_team_game_logs
+from app.services.stats_cache import ttl_for
+from app.utils import rowsets
+
+# Output name -> TeamGameLogs column, in the order of the game log model
+STAT_COLUMNS = {
+    "points": "PTS",
+    "field_goals_made": "FGM",
+    "field_goals_attempted": "FGA",
+    "three_pointers_made": "FG3M",
+    "three_pointers_attempted": "FG3A",
+    "free_throws_made": "FTM",
+    "free_throws_attempted": "FTA",
+    "offensive_rebounds": "OREB",
+    "defensive_rebounds": "DREB",
+    "total_rebounds": "REB",
+    "assists": "AST",
+    "turnovers": "TOV",
+    "steals": "STL",
+    "blocks": "BLK",
+    "blocks_against": "BLKA",
+    "personal_fouls": "PF",
+    "personal_fouls_drawn": "PFD",
+    "plus_minus": "PLUS_MINUS",
+    "minutes": "MIN",
+}
+STAT_NAMES = list(STAT_COLUMNS)
+STAT_INDEX = {name: i for i, name in enumerate(STAT_NAMES)}
+
+# Team minutes above this are summed player minutes (5 on the floor)
+PLAYER_MINUTES_THRESHOLD = 100
+
+
+def _ratio(numerator, denominator, scale=1):
+    if not denominator:
+        return None
+    return round(scale * numerator / denominator, 3)
+
+
+class TeamLogColumns:
+    """One team's game logs for a season in columnar form"""
+
+    def __init__(self, team_id, season, season_types, table, version=None):
+        self.team_id = team_id
+        self.season = season
+        self.season_types = tuple(season_types)
+        # ``stored_at`` of the cached logs of each season type
+        self.version = version
+        self.built_at = time.time()
+
+        table = rowsets.sort_rows(table, "GAME_DATE")
+        games = len(table["data"])
+        self.game_ids = np.array(rowsets.column(table, "GAME_ID"), dtype=str)
+        self.game_dates = np.array(
+            [date[:10] for date in rowsets.column(table, "GAME_DATE")],
+            dtype="datetime64[D]",
+        )
+        self.home = np.array(
+            ["vs." in matchup for matchup in rowsets.column(table, "MATCHUP", "")],
+            dtype=bool,
+        )
+        self.wins = np.array(
+            [wl == "W" for wl in rowsets.column(table, "WL")], dtype=bool
+        )
+        self.values = np.array(
+            rowsets.columns(table, STAT_COLUMNS.values()), dtype=np.float64
+        ).reshape(len(STAT_COLUMNS), games)
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self):
+        return (
+            self.values.nbytes
+            + self.game_ids.nbytes
+            + self.game_dates.nbytes
+            + self.home.nbytes
+            + self.wins.nbytes
+        )
+
+    def column(self, name):
+        return self.values[STAT_INDEX[name]]
+
+    def _totals(self, masks):
+        """Sum every stat over each mask in one matrix product"""
+        masks = np.asarray(masks, dtype=np.float64).reshape(len(masks), len(self))
+        totals = (self.values @ masks.T).T
+        return totals.tolist(), masks.sum(axis=1).tolist()
+
+    @staticmethod
+    def _averages(totals, games):
+        return {name: _ratio(total, games) for name, total in zip(STAT_NAMES, totals)}
+
+    @staticmethod
+    def _rates(totals, games):
+        if not games:
+            return {}
+        totals = dict(zip(STAT_NAMES, totals))
+
+        possessions = (
+            totals["field_goals_attempted"]
+            + 0.44 * totals["free_throws_attempted"]
+            - totals["offensive_rebounds"]
+            + totals["turnovers"]
+        )
+        minutes = totals["minutes"]
+        if minutes / games > PLAYER_MINUTES_THRESHOLD:
+            minutes /= 5
+        fga = totals["field_goals_attempted"]
+
+        return {
+            "possessions_per_game": _ratio(possessions, games),
+            "pace": _ratio(possessions, minutes, 48),
+            "offensive_rating": _ratio(totals["points"], possessions, 100),
+            "effective_field_goal_percentage": _ratio(
+                totals["field_goals_made"] + 0.5 * totals["three_pointers_made"], fga
+            ),
+            "true_shooting_percentage": _ratio(
+                totals["points"], 2 * (fga + 0.44 * totals["free_throws_attempted"])
+            ),
+            "turnover_rate": _ratio(totals["turnovers"], possessions),
+            "free_throw_rate": _ratio(totals["free_throws_attempted"], fga),
+            "three_point_attempt_rate": _ratio(totals["three_pointers_attempted"], fga),
+        }
+
+    def splits(self, masks):
+        """Return games, averages and rates for each boolean mask"""
+        totals, games = self._totals(masks)
+        return [
+            {
+                "games": int(count),
+                "averages": self._averages(split_totals, count),
+                "rates": self._rates(split_totals, count),
+            }
+            for split_totals, count in zip(totals, games)
+        ]
+
+    def last_n_mask(self, n):
+        mask = np.zeros(len(self), dtype=bool)
+        if n > 0:
+            mask[-n:] = True
+        return mask
+
+    def rolling_averages(self, window):
+        """Return rolling ``window``-game averages per stat, oldest first"""
+        if window <= 0 or len(self) < window:
+            return {name: [] for name in STAT_NAMES}
+        sums = np.cumsum(self.values, axis=1)
+        sums = np.concatenate([np.zeros((len(STAT_NAMES), 1)), sums], axis=1)
+        means = (sums[:, window:] - sums[:, :-window]) / window
+        return {
+            name: [round(v, 3) for v in row]
+            for name, row in zip(STAT_NAMES, means.tolist())
+        }
+
+    def summary(self, last_n):
+        """Return season, last-N, home/away and win/loss aggregates"""
+        full, last, home, away, wins, losses = self.splits(
+            [
+                np.ones(len(self), dtype=bool),
+                self.last_n_mask(last_n),
+                self.home,
+                ~self.home,
+                self.wins,
+                ~self.wins,
+            ]
+        )
+        last["window"] = last_n
+        return {
+            "games_played": len(self),
+            "full_season": full,
+            "last_n": last,
+            "splits": {"home": home, "away": away, "wins": wins, "losses": losses},
+        }
+
+    def is_stale(self):
+        ttl = ttl_for("TeamGameLogs", {"season": self.season})
+        if ttl is not None and time.time() - self.built_at > ttl:
+            return True
+        # The cached logs were refreshed under us
+        return self.version != tuple(
+            team_game_logs_version(self.team_id, self.season, season_type, True)
+            for season_type in self.season_types
+        )
+
+
+def get_team_columns(team_id, season, season_types):
+    """Return the columnar logs for a team, season and season types"""
+    key = (team_id, season, tuple(season_types))
+    columns = get_memory_cache().get("team_columns", key)
+    if columns is not None and not columns.is_stale():
+        return columns
+
+    loaded = [
+        versioned_team_game_logs(team_id, season, season_type)
+        for season_type in season_types
+    ]
+    table = rowsets.concat(
+        [rowsets.result_set(data, "TeamGameLogs") for data, _ in loaded]
+    )
+    version = tuple(version for _, version in loaded)
+    columns = TeamLogColumns(team_id, season, season_types, table, version)
+    get_memory_cache().put("team_columns", key, columns)
+    return columns
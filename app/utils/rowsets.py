@@ -0,0 +1,163 @@
+"""
+Projections and joins over raw stats.nba.com result sets.
+
+Upstream responses are kept in nba_api's ``get_data_sets()`` form, one
+``{"headers": [...], "data": [[...], ...]}`` table per result set, instead of
+one dict per row. A ``Projection`` maps output keys to columns; it is
+compiled once per header layout into ``itemgetter`` lookups, so building an
+output row is a single tuple fetch and a ``zip``. Result sets are joined on
+a key column through a dict index rather than nested scans.
+"""
+
+from operator import itemgetter
+
+
+def result_set(data, name):
+    """Return the named result set of a response, empty if it is missing"""
+    return data.get(name) or {"headers": [], "data": []}
+
+
+def header_index(table):
+    """Return a dict of column name to position"""
+    return {header: i for i, header in enumerate(table["headers"])}
+
+
+def column(table, name, default=None):
+    """Return one column of a result set as a list"""
+    try:
+        i = table["headers"].index(name)
+    except ValueError:
+        return [default] * len(table["data"])
+    return [row[i] for row in table["data"]]
+
+
+def columns(table, names, default=0):
+    """Return several columns of a result set, ``None`` values replaced"""
+    index = header_index(table)
+    result = []
+    for name in names:
+        i = index.get(name)
+        if i is None:
+            result.append([default] * len(table["data"]))
+        else:
+            result.append(
+                [default if row[i] is None else row[i] for row in table["data"]]
+            )
+    return result
+
+
+def index_rows(table, key="GAME_ID"):
+    """Index rows by a key column; later rows win, like an overwriting scan"""
+    if key not in table["headers"]:
+        return {}
+    i = table["headers"].index(key)
+    return {row[i]: row for row in table["data"]}
+
+
+def group_rows(table, key="GAME_ID"):
+    """Group rows by a key column, keeping their order"""
+    if key not in table["headers"]:
+        return {}
+    i = table["headers"].index(key)
+    groups = {}
+    for row in table["data"]:
+        groups.setdefault(row[i], []).append(row)
+    return groups
+
+
+def concat(tables):
+    """Concatenate result sets, aligning columns to the first table's headers"""
+    tables = [table for table in tables if table["headers"]]
+    if not tables:
+        return {"headers": [], "data": []}
+    headers = tables[0]["headers"]
+    data = []
+    for table in tables:
+        if table["headers"] == headers:
+            data.extend(table["data"])
+            continue
+        index = header_index(table)
+        positions = [index.get(header) for header in headers]
+        data.extend(
+            [None if i is None else row[i] for i in positions] for row in table["data"]
+        )
+    return {"headers": headers, "data": data}
+
+
+def sort_rows(table, key, reverse=False):
+    """Return a copy of a result set with its rows sorted by a column"""
+    if key not in table["headers"]:
+        return table
+    i = table["headers"].index(key)
+    return {
+        "headers": table["headers"],
+        "data": sorted(table["data"], key=itemgetter(i), reverse=reverse),
+    }
+
+
+def _getter(indexes):
+    if not indexes:
+        return lambda row: ()
+    if len(indexes) == 1:
+        i = indexes[0]
+        return lambda row: (row[i],)
+    return itemgetter(*indexes)
+
+
+class Projection:
+    """Output keys mapped to columns (or nested projections) of a row
+
+    Columns missing from a response are filled from ``defaults`` (or None).
+    """
+
+    def __init__(self, fields, defaults=None):
+        self.fields = dict(fields)
+        self.defaults = dict(defaults or {})
+        self._compiled = {}
+
+    def compile(self, headers):
+        """Return a function building the output dict for a raw row"""
+        headers = tuple(headers)
+        build = self._compiled.get(headers)
+        if build is not None:
+            return build
+
+        index = {header: i for i, header in enumerate(headers)}
+        keys, indexes, missing, nested = [], [], {}, []
+        for key, source in self.fields.items():
+            if isinstance(source, Projection):
+                nested.append((key, source.compile(headers)))
+            elif source in index:
+                keys.append(key)
+                indexes.append(index[source])
+            else:
+                missing[key] = self.defaults.get(key)
+
+        keys = tuple(keys)
+        get = _getter(indexes)
+        if not missing and not nested:
+
+            def build(row):
+                return dict(zip(keys, get(row)))
+
+        else:
+
+            def build(row):
+                result = dict(zip(keys, get(row)))
+                if missing:
+                    result.update(missing)
+                for key, build_nested in nested:
+                    result[key] = build_nested(row)
+                return result
+
+        self._compiled[headers] = build
+        return build
+
+    def row(self, table, row):
+        """Project one raw row of ``table``"""
+        return self.compile(table["headers"])(row)
+
+    def rows(self, table):
+        """Project every row of ``table``"""
+        build = self.compile(table["headers"])
+        return [build(row) for row in table["data"]]
@@ -0,0 +1,41 @@
+import heapq
+import re
+from operator import itemgetter
+
+SEASON_PATTERN = re.compile(r"^(\d{4})-(\d{2})$")
+RANGE_SEPARATOR = ".."
+
+# Longest range a single request may cover
+MAX_SEASONS = 30
+
+
+def season_start_year(season):
+    """Return the start year of a season like 2023-24"""
+    match = SEASON_PATTERN.match(season)
+    if not match or (int(match.group(1)) + 1) % 100 != int(match.group(2)):
+        raise ValueError(f"Invalid season '{season}'. Use the format 2023-24")
+    return int(match.group(1))
+
+
+def format_season(start_year):
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def parse_seasons(value):
+    """Expand a season or an inclusive range like 2015-16..2023-24, oldest first"""
+    value = value.strip()
+    if RANGE_SEPARATOR not in value:
+        return [value]
+
+    first, _, last = value.partition(RANGE_SEPARATOR)
+    start, end = season_start_year(first.strip()), season_start_year(last.strip())
+    if end < start:
+        raise ValueError(f"Season range '{value}' ends before it starts")
+    if end - start + 1 > MAX_SEASONS:
+        raise ValueError(f"Season ranges can cover at most {MAX_SEASONS} seasons")
+    return [format_season(year) for year in range(start, end + 1)]
+
+
+def merge_by_date(slices, key="game_date"):
+    """Lazily merge per-season game lists, each most recent first"""
+    return heapq.merge(*slices, key=itemgetter(key), reverse=True)
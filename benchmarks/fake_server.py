@@ -0,0 +1,269 @@
+"""
+Local stand-in for stats.nba.com that replays recorded responses.
+
+Fixtures are stored as one gzipped JSON file of ``{"endpoint", "params",
+"response"}`` records. A request is answered with the fixture recorded for
+the same endpoint and non-empty parameters; calls that were never recorded
+(a different game date, say) fall back to the endpoint's first fixture.
+Latency, jitter and an error rate can be injected, and with ``--record`` the
+server proxies misses to the real upstream and saves what it receives.
+
+    python -m benchmarks.fake_server --fixtures fixtures.json.gz --latency-ms 80
+
+Point the app at it with ``STATS_BASE_URL=http://127.0.0.1:<port>/stats/{endpoint}``.
+Call counters are served as JSON from ``/_bench/stats``.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+FIXTURE_FORMAT_VERSION = 1
+STATS_PATH = "/_bench/stats"
+UPSTREAM_URL = "https://stats.nba.com/stats/{endpoint}"
+
+
+def fixture_key(endpoint, params):
+    """Identify a call by endpoint and non-empty parameters"""
+    return endpoint.lower(), tuple(sorted((k, v) for k, v in params.items() if v != ""))
+
+
+class FixtureStore:
+    """Recorded responses keyed by call, with a per-endpoint fallback"""
+
+    def __init__(self, records=()):
+        self._responses = {}
+        self._fallbacks = {}
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(record["endpoint"], record["params"], record["response"])
+
+    def add(self, endpoint, params, response):
+        key = fixture_key(endpoint, params)
+        body = json.dumps(response).encode("utf-8")
+        with self._lock:
+            self._responses[key] = (dict(params), body)
+            self._fallbacks.setdefault(key[0], body)
+
+    def match(self, endpoint, params):
+        """Return ``(body, exact)`` for a call, body None if the endpoint is unknown"""
+        key = fixture_key(endpoint, params)
+        entry = self._responses.get(key)
+        if entry is not None:
+            return entry[1], True
+        return self._fallbacks.get(key[0]), False
+
+    def __len__(self):
+        return len(self._responses)
+
+    def records(self):
+        with self._lock:
+            items = list(self._responses.items())
+        return [
+            {"endpoint": endpoint, "params": params, "response": json.loads(body)}
+            for (endpoint, _), (params, body) in items
+        ]
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != FIXTURE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported fixture format in {path}")
+        return cls(data["fixtures"])
+
+    def save(self, path):
+        data = {"version": FIXTURE_FORMAT_VERSION, "fixtures": self.records()}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+class FakeStatsServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering stats.nba.com calls from a FixtureStore"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        record=False,
+        seed=None,
+    ):
+        super().__init__((host, port), FakeStatsHandler)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.record = record
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._errors = 0
+        self._fallbacks = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/stats/{{endpoint}}"
+
+    def delay_and_fail(self):
+        """Sleep for the injected latency; return True if this call should fail"""
+        with self._lock:
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def count(self, endpoint, error=False, fallback=False):
+        with self._lock:
+            self._calls[endpoint] = self._calls.get(endpoint, 0) + 1
+            self._errors += error
+            self._fallbacks += fallback
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": dict(self._calls),
+                "total": sum(self._calls.values()),
+                "errors": self._errors,
+                "fallbacks": self._fallbacks,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._calls.clear()
+            self._errors = 0
+            self._fallbacks = 0
+
+    def fetch_upstream(self, endpoint, query):
+        """Fetch a call from the real stats.nba.com and record it"""
+        from nba_api.stats.library.http import NBAStatsHTTP
+
+        url = UPSTREAM_URL.format(endpoint=endpoint) + ("?" + query if query else "")
+        request = urllib.request.Request(url, headers=NBAStatsHTTP.headers)
+        with urllib.request.urlopen(request, timeout=30) as response:
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+        return json.loads(body)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="fake-stats", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeStatsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == STATS_PATH:
+            self._send(200, json.dumps(self.server.stats()).encode("utf-8"))
+            return
+
+        endpoint = url.path.rsplit("/", 1)[-1].lower()
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        if self.server.delay_and_fail():
+            self.server.count(endpoint, error=True)
+            self._send(500, b'{"error": "injected failure"}')
+            return
+
+        body, exact = self.server.store.match(endpoint, params)
+        if not exact and self.server.record:
+            try:
+                response = self.server.fetch_upstream(endpoint, url.query)
+            except Exception as e:
+                self.server.count(endpoint, error=True)
+                self._send(502, json.dumps({"error": str(e)}).encode("utf-8"))
+                return
+            self.server.store.add(endpoint, params, response)
+            body, exact = self.server.store.match(endpoint, params)
+
+        if body is None:
+            self.server.count(endpoint, error=True)
+            self._send(404, b'{"error": "no fixture for endpoint"}')
+            return
+        self.server.count(endpoint, fallback=not exact)
+        self._send(200, body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--fixtures", help="Gzipped JSON fixture file")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_server_arguments(parser)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Proxy unrecorded calls to stats.nba.com and save them on exit",
+    )
+    args = parser.parse_args()
+
+    store = FixtureStore()
+    if args.fixtures:
+        try:
+            store = FixtureStore.load(args.fixtures)
+        except FileNotFoundError:
+            if not args.record:
+                raise
+    server = FakeStatsServer(
+        store,
+        port=args.port,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        record=args.record,
+        seed=args.seed,
+    )
+    print(f"Serving {len(store)} fixtures at {server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.record and args.fixtures:
+            store.save(args.fixtures)
+            print(f"Saved {len(store)} fixtures to {args.fixtures}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Synthetic stats.nba.com fixtures for the offline benchmarks.
+
+Builds a fixture file in the format ``benchmarks.fake_server`` replays, with
+responses for exactly the calls the app makes: team and league
+``TeamGameLogs``, ``PlayerGameLogs`` and ``CommonPlayerInfo`` per player,
+``CommonAllPlayers`` and a ``ScoreboardV2`` slate. Column layouts come from
+nba_api, and a seeded RNG makes every build identical. Fixtures recorded
+from the real upstream (``fake_server --record``) can be used instead.
+
+    python -m benchmarks.fixtures --out fixtures.json.gz --season 2023-24
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+
+from nba_api.stats.endpoints import (
+    CommonAllPlayers,
+    CommonPlayerInfo,
+    PlayerGameLogs,
+    ScoreboardV2,
+    TeamGameLogs,
+)
+
+from app.constants import TEAM_ABBREVIATIONS
+from app.services.stats_gateway import build_request
+from benchmarks.fake_server import FixtureStore
+
+DEFAULT_SEASON = "2023-24"
+DEFAULT_PLAYERS_PER_TEAM = 5
+SCOREBOARD_GAMES = 8
+
+FIRST_NAMES = [
+    "Jalen",
+    "Luka",
+    "Nikola",
+    "Stephen",
+    "Kevin",
+    "Jayson",
+    "Anthony",
+    "Tyrese",
+]
+LAST_NAMES = [
+    "Brown",
+    "Jokić",
+    "Curry",
+    "Durant",
+    "Tatum",
+    "Davis",
+    "Haliburton",
+    "Dončić",
+]
+
+
+def _response(endpoint_cls, tables):
+    """Raw stats.nba.com body with every result set of an endpoint"""
+    result_sets = []
+    for name, headers in endpoint_cls.expected_data.items():
+        rows = [[row.get(header) for header in headers] for row in tables.get(name, [])]
+        result_sets.append({"name": name, "headers": headers, "rowSet": rows})
+    return {"resultSets": result_sets}
+
+
+def _add(store, endpoint_cls, response, **kwargs):
+    endpoint, parameters = build_request(endpoint_cls, **kwargs)
+    params = {key: str(value) for key, value in parameters.items() if value is not None}
+    store.add(endpoint, params, response)
+
+
+def schedule(season):
+    """Round-robin schedule: every team plays one game per round, 82 rounds"""
+    teams = sorted(TEAM_ABBREVIATIONS.values())
+    opening = date(int(season[:4]), 10, 24)
+    games = []
+    for round_number in range(82):
+        day = opening + timedelta(days=2 * round_number)
+        rotated = (
+            teams[:1] + teams[1:][round_number % 29 :] + teams[1:][: round_number % 29]
+        )
+        for i in range(len(teams) // 2):
+            home, away = rotated[i], rotated[-1 - i]
+            if round_number % 2:
+                home, away = away, home
+            game_id = f"002{season[2:4]}{len(games) + 1:05d}"
+            games.append((game_id, day.isoformat() + "T00:00:00", home, away))
+    return games
+
+
+def _stat(rng, header):
+    if header.endswith("_PCT"):
+        return round(rng.uniform(0.2, 0.7), 3)
+    if header.endswith("_RANK"):
+        return rng.randint(1, 30)
+    return rng.randint(0, 50)
+
+
+def team_rows(rng, season, games):
+    abbreviations = {team_id: abbr for abbr, team_id in TEAM_ABBREVIATIONS.items()}
+    headers = TeamGameLogs.expected_data["TeamGameLogs"]
+    rows = []
+    for game_id, game_date, home, away in games:
+        points = {home: rng.randint(90, 130), away: rng.randint(90, 130)}
+        if points[home] == points[away]:
+            points[home] += 1
+        for team, opponent, at_home in ((home, away, True), (away, home, False)):
+            row = {header: _stat(rng, header) for header in headers}
+            separator = " vs. " if at_home else " @ "
+            row.update(
+                SEASON_YEAR=season,
+                TEAM_ID=team,
+                TEAM_ABBREVIATION=abbreviations[team],
+                TEAM_NAME=abbreviations[team],
+                GAME_ID=game_id,
+                GAME_DATE=game_date,
+                MATCHUP=abbreviations[team] + separator + abbreviations[opponent],
+                WL="W" if points[team] > points[opponent] else "L",
+                MIN=240,
+                PTS=points[team],
+                PLUS_MINUS=points[team] - points[opponent],
+            )
+            rows.append(row)
+    return rows
+
+
+def players(players_per_team):
+    """Synthetic roster: (player_id, name, team_id) per player"""
+    result = []
+    for team_index, team_id in enumerate(sorted(TEAM_ABBREVIATIONS.values())):
+        for slot in range(players_per_team):
+            n = team_index * players_per_team + slot
+            name = f"{FIRST_NAMES[n % 8]} {LAST_NAMES[n // 8 % 8]} {n}"
+            result.append((1630000 + n, name, team_id))
+    return result
+
+
+def scoreboard_tables(rng, games):
+    tables = {
+        "GameHeader": [],
+        "LineScore": [],
+        "SeriesStandings": [],
+        "LastMeeting": [],
+    }
+    for sequence, (game_id, game_date, home, away) in enumerate(games, 1):
+        tables["GameHeader"].append(
+            {
+                "GAME_DATE_EST": game_date,
+                "GAME_SEQUENCE": sequence,
+                "GAME_ID": game_id,
+                "GAME_STATUS_ID": 1,
+                "GAME_STATUS_TEXT": f"{6 + sequence % 4}:30 pm ET",
+                "HOME_TEAM_ID": home,
+                "VISITOR_TEAM_ID": away,
+                "ARENA_NAME": "Arena",
+            }
+        )
+        for team in (home, away):
+            tables["LineScore"].append(
+                {"GAME_DATE_EST": game_date, "GAME_ID": game_id, "TEAM_ID": team}
+            )
+        tables["SeriesStandings"].append(
+            {"GAME_ID": game_id, "HOME_TEAM_ID": home, "VISITOR_TEAM_ID": away}
+        )
+        tables["LastMeeting"].append(
+            {"GAME_ID": game_id, "LAST_GAME_HOME_TEAM_POINTS": rng.randint(90, 130)}
+        )
+    return tables
+
+
+def build_fixtures(
+    season=DEFAULT_SEASON, players_per_team=DEFAULT_PLAYERS_PER_TEAM, seed=0
+):
+    """Return a FixtureStore covering one season of synthetic data"""
+    rng = random.Random(seed)
+    store = FixtureStore()
+    games = schedule(season)
+
+    rows = team_rows(rng, season, games)
+    team_ids = sorted(TEAM_ABBREVIATIONS.values())
+    season_type = "Regular Season"
+    _add(
+        store,
+        TeamGameLogs,
+        _response(TeamGameLogs, {"TeamGameLogs": rows}),
+        season_nullable=season,
+        season_type_nullable=season_type,
+    )
+    for team_id in team_ids:
+        team_logs = [row for row in rows if row["TEAM_ID"] == team_id]
+        _add(
+            store,
+            TeamGameLogs,
+            _response(TeamGameLogs, {"TeamGameLogs": team_logs}),
+            team_id_nullable=team_id,
+            season_nullable=season,
+            season_type_nullable=season_type,
+        )
+
+    roster = players(players_per_team)
+    abbreviations = {team_id: abbr for abbr, team_id in TEAM_ABBREVIATIONS.items()}
+    all_players = []
+    for player_id, name, team_id in roster:
+        first, _, last = name.partition(" ")
+        player = {
+            "PERSON_ID": player_id,
+            "DISPLAY_FIRST_LAST": name,
+            "DISPLAY_LAST_COMMA_FIRST": f"{last}, {first}",
+            "ROSTERSTATUS": 1,
+            "TEAM_ID": team_id,
+            "TEAM_CITY": abbreviations[team_id],
+            "TEAM_NAME": abbreviations[team_id],
+            "TEAM_ABBREVIATION": abbreviations[team_id],
+            "POSITION": rng.choice(["G", "F", "C"]),
+            "JERSEY": str(rng.randint(0, 99)),
+        }
+        all_players.append(player)
+        _add(
+            store,
+            CommonPlayerInfo,
+            _response(CommonPlayerInfo, {"CommonPlayerInfo": [player]}),
+            player_id=player_id,
+        )
+
+        headers = PlayerGameLogs.expected_data["PlayerGameLogs"]
+        logs = []
+        for row in rows:
+            if row["TEAM_ID"] != team_id:
+                continue
+            log = {header: _stat(rng, header) for header in headers}
+            log.update(
+                SEASON_YEAR=season,
+                PLAYER_ID=player_id,
+                PLAYER_NAME=name,
+                TEAM_ID=team_id,
+                GAME_ID=row["GAME_ID"],
+                GAME_DATE=row["GAME_DATE"],
+                MATCHUP=row["MATCHUP"],
+                WL=row["WL"],
+                MIN=round(rng.uniform(10, 40), 1),
+            )
+            logs.append(log)
+        _add(
+            store,
+            PlayerGameLogs,
+            _response(PlayerGameLogs, {"PlayerGameLogs": logs}),
+            player_id_nullable=player_id,
+            season_nullable=season,
+        )
+
+    _add(
+        store,
+        CommonAllPlayers,
+        _response(CommonAllPlayers, {"CommonAllPlayers": all_players}),
+    )
+
+    # Served for any date: the fake server falls back to it
+    slate = games[:SCOREBOARD_GAMES]
+    _add(
+        store,
+        ScoreboardV2,
+        _response(ScoreboardV2, scoreboard_tables(rng, slate)),
+        game_date=date.today().strftime("%m/%d/%Y"),
+    )
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", required=True, help="Fixture file to write")
+    parser.add_argument("--season", default=DEFAULT_SEASON)
+    parser.add_argument(
+        "--players-per-team", type=int, default=DEFAULT_PLAYERS_PER_TEAM
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    store = build_fixtures(args.season, args.players_per_team, args.seed)
+    store.save(args.out)
+    print(f"Wrote {len(store)} fixtures to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Offline load benchmark of the API against a fake stats.nba.com.
+
+Starts ``benchmarks.fake_server`` in a subprocess, replaying a fixture
+file (synthetic fixtures are built when none is given), and creates the
+app against it with a fresh stats cache. Each scenario then drives one
+route through Flask test clients from ``--concurrency`` threads. Reported
+per scenario: throughput, latency percentiles, response statuses and the
+upstream calls it caused. Peak RSS of the app process is reported for the
+whole run. The report is JSON so runs can be diffed or compared by a script.
+
+    python -m benchmarks.load_bench --requests 500 --concurrency 16 \\
+        --latency-ms 80 --error-rate 0.01 --output bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_server import STATS_PATH, add_server_arguments
+from benchmarks.fixtures import DEFAULT_SEASON
+
+SCENARIOS = (
+    "games_today",
+    "players_search",
+    "player_stats",
+    "team_games",
+    "team_matchups",
+)
+
+
+def start_fake_server(args, fixtures):
+    """Run the fake upstream in a subprocess; return it and its base URL"""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.fake_server",
+        "--fixtures",
+        fixtures,
+        "--port",
+        "0",
+        "--latency-ms",
+        str(args.latency_ms),
+        "--jitter-ms",
+        str(args.jitter_ms),
+        "--error-rate",
+        str(args.error_rate),
+        "--seed",
+        str(args.seed),
+    ]
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    match = re.search(r"(http://\S+)", line)
+    if match is None:
+        process.kill()
+        raise RuntimeError(f"Fake server did not start: {line.strip()}")
+    return process, match.group(1)
+
+
+def upstream_stats(base_url):
+    url = base_url.split("/stats/")[0] + STATS_PATH
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+def upstream_delta(before, after):
+    calls = {
+        endpoint: count - before["calls"].get(endpoint, 0)
+        for endpoint, count in after["calls"].items()
+        if count != before["calls"].get(endpoint, 0)
+    }
+    return {
+        "calls": calls,
+        "total": after["total"] - before["total"],
+        "errors": after["errors"] - before["errors"],
+        "fallbacks": after["fallbacks"] - before["fallbacks"],
+    }
+
+
+def peak_rss_kib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def percentiles(latencies):
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else 0.0
+        return {"p50": value, "p95": value, "p99": value, "mean": value, "max": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "mean": round(statistics.fmean(latencies), 3),
+        "max": round(max(latencies), 3),
+    }
+
+
+class Workload:
+    """Request URLs for each scenario, drawn from the app's own data"""
+
+    def __init__(self, season, players, teams, seed):
+        self.season = season
+        self.players = players
+        self.teams = teams
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def url(self, scenario):
+        with self._lock:
+            rng = self._random
+            if scenario == "games_today":
+                return "/games/today"
+            if scenario == "players_search":
+                name = rng.choice(self.players)["name"]
+                return f"/players/search?name={name[: rng.randint(2, 6)]}"
+            if scenario == "player_stats":
+                player = rng.choice(self.players)
+                return f"/players/{player['player_id']}/stats?season={self.season}"
+            if scenario == "team_games":
+                team_id = rng.choice(list(self.teams.values()))
+                return f"/teams/{team_id}/games?season={self.season}"
+            if scenario == "team_matchups":
+                team1, team2 = rng.sample(sorted(self.teams), 2)
+                return (
+                    f"/teams/matchups?team1={team1}&team2={team2}&season={self.season}"
+                )
+        raise ValueError(f"Unknown scenario {scenario}")
+
+
+def run_scenario(app, workload, scenario, requests, concurrency):
+    """Issue ``requests`` requests from ``concurrency`` threads"""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+
+    def worker():
+        client = app.test_client()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            url = workload.url(scenario)
+            started = time.perf_counter()
+            response = client.get(url)
+            response.get_data()
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] = (
+                    statuses.get(response.status_code, 0) + 1
+                )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    seconds = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(requests / seconds, 1) if seconds else None,
+        "latency_ms": percentiles(latencies),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "errors": sum(count for status, count in statuses.items() if status >= 500),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_server_arguments(parser)
+    parser.add_argument("--season", default=DEFAULT_SEASON)
+    parser.add_argument(
+        "--requests", type=int, default=500, help="Requests per scenario"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios"
+    )
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",")]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix="nba-bench-")
+    fixtures = args.fixtures
+    if fixtures is None:
+        # Built in a subprocess so they do not count towards peak RSS
+        fixtures = os.path.join(workdir, "fixtures.json.gz")
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.fixtures",
+                "--out",
+                fixtures,
+                "--season",
+                args.season,
+                "--seed",
+                str(args.seed),
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    server, base_url = start_fake_server(args, fixtures)
+    try:
+        from app import create_app
+        from app.constants import TEAM_ABBREVIATIONS
+        from app.services.player_index import get_player_index
+
+        # Request logging would dominate the measurements
+        logging.disable(logging.INFO)
+        started = time.perf_counter()
+        app = create_app(
+            {
+                "STATS_BASE_URL": base_url,
+                "STATS_CACHE_PATH": os.path.join(workdir, "stats_cache.sqlite3"),
+                "SEASON_STORE_SEASONS": [args.season],
+                "CACHE_WARMER_ENABLED": False,
+            }
+        )
+        index = get_player_index()
+        startup_seconds = time.perf_counter() - started
+        if index is None:
+            raise RuntimeError("Player index could not be built from the fixtures")
+
+        players = [
+            player for player, active in zip(index.players, index.active) if active
+        ] or index.players
+        workload = Workload(args.season, players, TEAM_ABBREVIATIONS, args.seed)
+
+        report = {
+            "config": {
+                "season": args.season,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "error_rate": args.error_rate,
+                "seed": args.seed,
+                "fixtures": args.fixtures or "synthetic",
+                "python": sys.version.split()[0],
+            },
+            "startup": {
+                "seconds": round(startup_seconds, 3),
+                "upstream": upstream_stats(base_url),
+            },
+            "scenarios": {},
+        }
+        for scenario in scenarios:
+            before = upstream_stats(base_url)
+            result = run_scenario(
+                app, workload, scenario, args.requests, args.concurrency
+            )
+            result["upstream"] = upstream_delta(before, upstream_stats(base_url))
+            report["scenarios"][scenario] = result
+
+        report["upstream"] = upstream_stats(base_url)
+        report["peak_rss_kib"] = peak_rss_kib()
+    finally:
+        server.terminate()
+        server.wait()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Microbenchmark: row-set projections vs. normalized dicts.
+
+Compares building route payloads from nba_api's ``get_normalized_dict()``
+rows (one dict per row, then a second hand-built dict) against projecting
+the raw ``headers`` + rows with ``app.utils.rowsets``. Synthetic responses
+with the real column layouts are used, so no network access is needed.
+
+    python -m benchmarks.rowsets_bench
+"""
+
+import json
+import random
+import time
+import tracemalloc
+
+from app.routes.teams import TEAM_GAME_LOG
+from app.utils.games_util import extract_game_data
+from app.utils.rowsets import result_set
+
+TEAM_LOG_HEADERS = [
+    "SEASON_YEAR", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_NAME", "GAME_ID",
+    "GAME_DATE", "MATCHUP", "WL", "MIN", "FGM", "FGA", "FG_PCT", "FG3M",
+    "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST",
+    "TOV", "STL", "BLK", "BLKA", "PF", "PFD", "PTS", "PLUS_MINUS",
+]  # fmt: skip
+
+GAME_HEADER_HEADERS = [
+    "GAME_DATE_EST", "GAME_SEQUENCE", "GAME_ID", "GAME_STATUS_ID",
+    "GAME_STATUS_TEXT", "GAMECODE", "HOME_TEAM_ID", "VISITOR_TEAM_ID",
+    "SEASON", "LIVE_PERIOD", "LIVE_PC_TIME", "NATL_TV_BROADCASTER_ABBREVIATION",
+    "HOME_TV_BROADCASTER_ABBREVIATION", "AWAY_TV_BROADCASTER_ABBREVIATION",
+    "LIVE_PERIOD_TIME_BCAST", "ARENA_NAME", "WH_STATUS", "WNBA_COMMISSIONER_FLAG",
+]  # fmt: skip
+
+LINE_SCORE_HEADERS = [
+    "GAME_DATE_EST", "GAME_SEQUENCE", "GAME_ID", "TEAM_ID", "TEAM_ABBREVIATION",
+    "TEAM_CITY_NAME", "TEAM_NAME", "TEAM_WINS_LOSSES", "PTS_QTR1", "PTS_QTR2",
+    "PTS_QTR3", "PTS_QTR4", "PTS", "FG_PCT", "FT_PCT", "FG3_PCT", "AST", "REB",
+    "TOV",
+]  # fmt: skip
+
+SERIES_HEADERS = [
+    "GAME_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID", "GAME_DATE_EST",
+    "HOME_TEAM_WINS", "HOME_TEAM_LOSSES", "SERIES_LEADER",
+]  # fmt: skip
+
+LAST_MEETING_HEADERS = [
+    "GAME_ID", "LAST_GAME_ID", "LAST_GAME_DATE_EST", "LAST_GAME_HOME_TEAM_ID",
+    "LAST_GAME_HOME_TEAM_CITY", "LAST_GAME_HOME_TEAM_NAME",
+    "LAST_GAME_HOME_TEAM_ABBREVIATION", "LAST_GAME_HOME_TEAM_POINTS",
+    "LAST_GAME_VISITOR_TEAM_ID", "LAST_GAME_VISITOR_TEAM_CITY",
+    "LAST_GAME_VISITOR_TEAM_NAME", "LAST_GAME_VISITOR_TEAM_CITY1",
+    "LAST_GAME_VISITOR_TEAM_POINTS",
+]  # fmt: skip
+
+
+def _value(rng, header, i):
+    if header == "GAME_ID":
+        return f"00223{i:05d}"
+    if header in ("GAME_DATE", "GAME_DATE_EST"):
+        return f"2024-01-{i % 28 + 1:02d}T00:00:00"
+    if header == "MATCHUP":
+        return "BOS vs. NYK" if i % 2 else "BOS @ NYK"
+    if header == "WL":
+        return "W" if i % 3 else "L"
+    if header.endswith("_PCT"):
+        return round(rng.random(), 3)
+    return rng.randint(0, 120)
+
+
+def _table(rng, headers, rows, game_id_of=lambda i: i):
+    return {
+        "headers": headers,
+        "data": [[_value(rng, h, game_id_of(i)) for h in headers] for i in range(rows)],
+    }
+
+
+def _normalized(data):
+    """What ``get_normalized_dict()`` builds from the same result sets"""
+    return {
+        name: [dict(zip(table["headers"], row)) for row in table["data"]]
+        for name, table in data.items()
+    }
+
+
+def _normalized_team_games(normalized):
+    """The hand-built per-row dicts the team games route used to build"""
+    games = []
+    for game in normalized["TeamGameLogs"]:
+        games.append(
+            {
+                "game_id": game["GAME_ID"],
+                "game_date": game["GAME_DATE"],
+                "matchup": game["MATCHUP"],
+                "result": game["WL"],
+                "points": game["PTS"],
+                "field_goals_made": game["FGM"],
+                "field_goals_attempted": game["FGA"],
+                "field_goal_percentage": game["FG_PCT"],
+                "three_pointers_made": game["FG3M"],
+                "three_pointers_attempted": game["FG3A"],
+                "three_point_percentage": game["FG3_PCT"],
+                "free_throws_made": game["FTM"],
+                "free_throws_attempted": game["FTA"],
+                "free_throw_percentage": game["FT_PCT"],
+                "offensive_rebounds": game["OREB"],
+                "defensive_rebounds": game["DREB"],
+                "total_rebounds": game["REB"],
+                "assists": game["AST"],
+                "turnovers": game["TOV"],
+                "steals": game["STL"],
+                "blocks": game["BLK"],
+                "blocks_against": game["BLKA"],
+                "personal_fouls": game["PF"],
+                "personal_fouls_drawn": game["PFD"],
+                "plus_minus": game["PLUS_MINUS"],
+            }
+        )
+    return games
+
+
+def _normalized_scoreboard(normalized):
+    """The nested-loop join ``extract_game_data`` used to do"""
+    game_data = []
+
+    # Extract Game Header
+    for game_header in normalized["GameHeader"]:
+        game_info = {
+            "game_id": game_header["GAME_ID"],
+            "game_date": game_header["GAME_DATE_EST"],
+            "game_status": game_header["GAME_STATUS_TEXT"],
+            "home_team": {
+                "id": game_header["HOME_TEAM_ID"],
+                "abbreviation": game_header["HOME_TV_BROADCASTER_ABBREVIATION"],
+                "arena": game_header["ARENA_NAME"],
+            },
+            "visitor_team": {
+                "id": game_header["VISITOR_TEAM_ID"],
+                "abbreviation": game_header["AWAY_TV_BROADCASTER_ABBREVIATION"],
+            },
+            "live_period": game_header["LIVE_PERIOD"],
+            "live_period_time_bcast": game_header["LIVE_PERIOD_TIME_BCAST"],
+        }
+
+        # Extract Line Score
+        for line_score in normalized["LineScore"]:
+            if line_score["GAME_ID"] == game_header["GAME_ID"]:
+                game_info["line_score"] = {
+                    "home_team_score": line_score["PTS"],
+                    "home_team_field_goal_percentage": line_score["FG_PCT"],
+                    "visitor_team_score": line_score["PTS"],
+                    "visitor_team_field_goal_percentage": line_score["FG_PCT"],
+                    "home_team_assists": line_score["AST"],
+                    "visitor_team_assists": line_score["AST"],
+                    "home_team_rebounds": line_score["REB"],
+                    "visitor_team_rebounds": line_score["REB"],
+                }
+
+        # Extract Series Standings
+        for series in normalized["SeriesStandings"]:
+            if series["GAME_ID"] == game_header["GAME_ID"]:
+                game_info["series_standings"] = {
+                    "home_team_wins": series["HOME_TEAM_WINS"],
+                    "home_team_losses": series["HOME_TEAM_LOSSES"],
+                    "series_leader": series["SERIES_LEADER"],
+                }
+
+        # Extract Last Meeting
+        for last_meeting in normalized["LastMeeting"]:
+            if last_meeting["GAME_ID"] == game_header["GAME_ID"]:
+                game_info["last_meeting"] = {
+                    "last_game_home_team": last_meeting["LAST_GAME_HOME_TEAM_NAME"],
+                    "last_game_visitor_team": last_meeting[
+                        "LAST_GAME_VISITOR_TEAM_NAME"
+                    ],
+                    "last_game_home_team_points": last_meeting[
+                        "LAST_GAME_HOME_TEAM_POINTS"
+                    ],
+                    "last_game_visitor_team_points": last_meeting[
+                        "LAST_GAME_VISITOR_TEAM_POINTS"
+                    ],
+                }
+
+        game_data.append(game_info)
+
+    return game_data
+
+
+def measure(fn, repeat):
+    """Return (microseconds per call, peak KiB allocated by one call)"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat * 1e6
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(elapsed, 1), round(peak / 1024, 1)
+
+
+def main():
+    rng = random.Random(0)
+    team_logs = {"TeamGameLogs": _table(rng, TEAM_LOG_HEADERS, 2460)}
+    games = 15
+    scoreboard = {
+        "GameHeader": _table(rng, GAME_HEADER_HEADERS, games),
+        "LineScore": _table(rng, LINE_SCORE_HEADERS, 2 * games, lambda i: i // 2),
+        "SeriesStandings": _table(rng, SERIES_HEADERS, games),
+        "LastMeeting": _table(rng, LAST_MEETING_HEADERS, games),
+    }
+
+    cases = {
+        "league_team_logs": (
+            lambda: _normalized_team_games(_normalized(team_logs)),
+            lambda: TEAM_GAME_LOG.rows(result_set(team_logs, "TeamGameLogs")),
+            50,
+        ),
+        "scoreboard": (
+            lambda: _normalized_scoreboard(_normalized(scoreboard)),
+            lambda: extract_game_data(scoreboard),
+            2000,
+        ),
+    }
+
+    report = {}
+    for name, (normalized, projected, repeat) in cases.items():
+        before_us, before_kib = measure(normalized, repeat)
+        after_us, after_kib = measure(projected, repeat)
+        report[name] = {
+            "normalized": {"us_per_call": before_us, "peak_kib": before_kib},
+            "projected": {"us_per_call": after_us, "peak_kib": after_kib},
+            "speedup": round(before_us / after_us, 2),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import logging
+
+import pytest
+
+from benchmarks.fake_server import FakeStatsServer
+from benchmarks.fixtures import build_fixtures
+
+SEASON = "2023-24"
+PLAYERS_PER_TEAM = 2
+TEAM_ID = 1610612738
+
+
+@pytest.fixture(scope="session")
+def stats_server():
+    """A fake stats.nba.com replaying one synthetic season"""
+    server = FakeStatsServer(build_fixtures(SEASON, PLAYERS_PER_TEAM)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def upstream(stats_server):
+    """The fake server with fresh call counters and no injected faults"""
+    stats_server.reset_stats()
+    yield stats_server
+    stats_server.latency = 0.0
+    stats_server.error_rate = 0.0
+
+
+@pytest.fixture(scope="session")
+def app(stats_server, tmp_path_factory):
+    from app import create_app
+
+    logging.disable(logging.INFO)
+    flask_app = create_app(
+        {
+            "TESTING": True,
+            "STATS_BASE_URL": stats_server.base_url,
+            "STATS_CACHE_PATH": str(
+                tmp_path_factory.mktemp("cache") / "stats_cache.sqlite3"
+            ),
+            "CACHE_WARMER_ENABLED": False,
+        }
+    )
+    yield flask_app
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,66 @@
+import pytest
+
+from tests.conftest import SEASON, TEAM_ID
+
+PLAYER_IDS = [1630002, 1630003]
+
+
+def test_player_batch_matches_single_requests(client):
+    response = client.post(
+        "/players/batch",
+        json={"player_ids": PLAYER_IDS + [str(PLAYER_IDS[0])], "season": SEASON},
+    )
+    assert response.status_code == 200
+    batch = response.get_json()
+    # Duplicate IDs are answered once
+    assert batch["count"] == 2
+    assert batch["failed"] == 0
+    assert batch["partial"] is False
+
+    for item, player_id in zip(batch["results"], PLAYER_IDS):
+        assert item["player_id"] == player_id
+        assert item["info"]["player_id"] == player_id
+        stats = client.get(f"/players/{player_id}/stats?season={SEASON}").get_json()
+        assert item["stats"]["stats"] == stats["stats"]
+
+
+def test_team_batch_accepts_abbreviations(client):
+    response = client.post(
+        "/teams/batch", json={"team_ids": ["BOS", TEAM_ID], "season": SEASON}
+    )
+    assert response.status_code == 200
+    batch = response.get_json()
+    assert batch["count"] == 1
+    (item,) = batch["results"]
+    games = client.get(f"/teams/{TEAM_ID}/games?season={SEASON}").get_json()
+    assert item["team_id"] == TEAM_ID
+    assert len(item["games"]) == len(games["games"])
+
+
+@pytest.mark.parametrize(
+    "player_ids", [[PLAYER_IDS[0], "abc"], [PLAYER_IDS[0], 1.5], [True], [], "1630002"]
+)
+def test_player_batch_rejects_bad_ids(client, player_ids, upstream):
+    response = client.post(
+        "/players/batch", json={"player_ids": player_ids, "season": SEASON}
+    )
+    assert response.status_code == 400
+    assert "player_ids" in response.get_json()["error"]
+    # Nothing is fetched for a rejected batch
+    calls = upstream.stats()["calls"]
+    assert "commonplayerinfo" not in calls and "playergamelogs" not in calls
+
+
+def test_team_batch_rejects_bad_ids(client):
+    response = client.post(
+        "/teams/batch", json={"team_ids": [TEAM_ID, "XYZ"], "season": SEASON}
+    )
+    assert response.status_code == 400
+    assert "team_ids" in response.get_json()["error"]
+
+
+def test_batch_rejects_unknown_includes(client):
+    response = client.post(
+        "/players/batch", json={"player_ids": PLAYER_IDS, "include": ["awards"]}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from app.services import cache_warmer
+from app.services.cache_warmer import CacheWarmer
+from app.services.stats_gateway import get_stats_gateway
+
+GAME = {
+    "game_id": "0022600001",
+    "game_date": "2026-10-24T00:00:00",
+    "game_status": "7:30 pm ET",
+    "home_team": {"id": 1610612737},
+    "visitor_team": {"id": 1610612739},
+}
+
+
+@pytest.fixture
+def warmer(app, monkeypatch):
+    monkeypatch.setattr(
+        cache_warmer,
+        "get_today_games",
+        lambda: {"date": "10/24/2026", "games": [GAME]},
+    )
+    # Tipoff in a minute: the game is due
+    monkeypatch.setattr(cache_warmer, "tipoff_time", lambda game: time.time() + 60)
+    warmer = CacheWarmer(max_players_per_team=1)
+    yield warmer
+    warmer.stop()
+
+
+def test_calls_cover_both_teams_and_rosters(warmer):
+    calls = warmer.calls_for([GAME])
+    team_ids = {call[1] for call in calls if call[0].__name__ == "get_team_game_logs"}
+    assert team_ids == {1610612737, 1610612739}
+    assert sum(call[0].__name__ == "get_player_info" for call in calls) == 2
+    assert len(calls) == len(set(calls))
+
+
+def test_game_with_failed_calls_is_retried(warmer, upstream):
+    upstream.error_rate = 1.0
+    warmer.run_once()
+    assert warmer.stats()["games_warmed"] == 0
+    assert warmer.stats()["errors"] > 0
+
+    upstream.error_rate = 0.0
+    get_stats_gateway().breaker.record_success()
+    warmer.run_once()
+    assert warmer.stats()["games_warmed"] == 1
+
+    calls = warmer.stats()["calls"]
+    warmer.run_once()
+    assert warmer.stats()["calls"] == calls
@@ -0,0 +1,39 @@
+import contextvars
+import threading
+
+from app.services.executor import SharedExecutor
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_tasks_run_in_the_submitting_context():
+    executor = SharedExecutor(max_workers=2)
+    try:
+        request_id.set("abc")
+        assert executor.submit(request_id.get).result() == "abc"
+        assert executor.map(lambda x: x * 2, [1, 2, 3]) == [2, 4, 6]
+    finally:
+        executor.shutdown()
+
+
+def test_full_queue_runs_in_the_caller():
+    executor = SharedExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+    try:
+        blocked = executor.submit(release.wait)
+        inline = executor.submit(threading.current_thread)
+        assert inline.result() is threading.current_thread()
+        release.set()
+        blocked.result()
+        stats = executor.stats()
+        assert (stats["submitted"], stats["ran_inline"]) == (1, 1)
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_shutdown_executor_reopens():
+    executor = SharedExecutor(max_workers=1)
+    executor.shutdown()
+    assert executor.submit(lambda: 42).result() == 42
+    executor.shutdown()
@@ -0,0 +1,77 @@
+from app.services.memory_cache import MemoryCache, get_memory_cache
+from tests.conftest import SEASON, TEAM_ID
+
+
+class Blob:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+def test_entries_are_sized_and_evicted_least_recently_used_first():
+    cache = MemoryCache(max_bytes=300)
+    for key in ("a", "b", "c"):
+        cache.get("logs", key)
+        assert cache.put("logs", key, Blob(100))
+    assert cache.stats()["bytes"] == 300
+
+    # "a" is used again, so "b" is the least recently used
+    cache.get("logs", "a")
+    cache.get("logs", "d")
+    cache.get("logs", "d")
+    assert cache.put("logs", "d", Blob(100))
+    assert cache.get("logs", "b") is None
+    assert cache.get("logs", "a") is not None
+
+    stats = cache.stats()
+    assert stats["bytes"] == 300
+    assert stats["namespaces"]["logs"]["evictions"] == 1
+    assert stats["namespaces"]["logs"]["entries"] == 3
+
+
+def test_one_off_entries_do_not_displace_popular_ones():
+    cache = MemoryCache(max_bytes=200)
+    for key in ("a", "b"):
+        for _ in range(3):
+            cache.get("logs", key)
+        cache.put("logs", key, Blob(100))
+
+    assert not cache.put("logs", "scan", Blob(100))
+    assert cache.get("logs", "a") is not None
+    assert cache.get("logs", "b") is not None
+    assert cache.stats()["namespaces"]["logs"]["rejected"] == 1
+
+
+def test_oversized_values_are_rejected():
+    cache = MemoryCache(max_bytes=100)
+    assert not cache.put("logs", "big", Blob(101))
+    assert cache.stats()["entries"] == 0
+
+
+def test_replacing_and_clearing_keep_sizes_consistent():
+    cache = MemoryCache(max_bytes=1000)
+    cache.put("players", 1, Blob(100))
+    cache.put("players", 1, Blob(250))
+    cache.put("teams", 1, Blob(50))
+    assert cache.stats()["bytes"] == 300
+    assert cache.stats()["namespaces"]["players"]["bytes"] == 250
+
+    cache.clear("players")
+    stats = cache.stats()
+    assert stats["bytes"] == 50
+    assert stats["entries"] == 1
+    assert stats["namespaces"]["players"]["entries"] == 0
+    assert stats["namespaces"]["players"]["bytes"] == 0
+
+
+def test_routes_reuse_cached_columns(client):
+    get_memory_cache().clear()
+    url = f"/teams/{TEAM_ID}/aggregates?season={SEASON}"
+    client.get(url)
+    before = get_memory_cache().stats()["namespaces"]["team_columns"]
+
+    # A different window builds nothing new
+    client.get(f"{url}&last_n=3")
+    after = get_memory_cache().stats()["namespaces"]["team_columns"]
+    assert after["hits"] == before["hits"] + 1
+    assert after["entries"] == before["entries"] == 1
+    assert after["bytes"] == before["bytes"] > 0
@@ -0,0 +1,58 @@
+from app.services.player_index import PlayerIndex
+
+HEADERS = [
+    "PERSON_ID",
+    "DISPLAY_FIRST_LAST",
+    "TEAM_ID",
+    "TEAM_CITY",
+    "TEAM_NAME",
+    "POSITION",
+    "JERSEY",
+    "ROSTERSTATUS",
+]
+
+
+def make_index(*players):
+    rows = [
+        [player_id, name, 1610612738, "Boston", "Celtics", "G", "0", active]
+        for player_id, name, active in players
+    ]
+    return PlayerIndex({"headers": HEADERS, "data": rows})
+
+
+INDEX = make_index(
+    (1, "Jayson Tatum", 1),
+    (2, "Nikola Jokić", 1),
+    (3, "Al Horford", 1),
+    (4, "Jaylen Brown", 0),
+)
+
+
+def names(players):
+    return [player["name"] for player in players]
+
+
+def test_ranks_exact_then_prefix_then_substring():
+    index = make_index((1, "Ja Morant", 1), (2, "Jalen Green", 1), (3, "Raja Bell", 1))
+    assert names(index.search("ja")) == ["Ja Morant", "Jalen Green", "Raja Bell"]
+
+
+def test_short_queries_match_inside_names():
+    assert names(INDEX.search("ok")) == ["Nikola Jokić"]
+    assert names(INDEX.search("l h")) == ["Al Horford"]
+
+
+def test_accents_are_folded():
+    assert names(INDEX.search("jokic")) == ["Nikola Jokić"]
+
+
+def test_tokens_match_in_any_order():
+    assert names(INDEX.search("tatum jay")) == ["Jayson Tatum"]
+
+
+def test_active_players_rank_first():
+    assert names(INDEX.search("jay")) == ["Jayson Tatum", "Jaylen Brown"]
+
+
+def test_rosters_list_active_players():
+    assert INDEX.roster(1610612738) == [1, 2, 3]
@@ -0,0 +1,87 @@
+import pytest
+
+from tests.conftest import SEASON
+
+PLAYER_ID = 1630002
+PROPS_URL = f"/players/{PLAYER_ID}/props?season={SEASON}&props=PTS:20.5"
+
+
+@pytest.mark.parametrize("last_n", ["abc", "-3", "0", "2.5", ""])
+def test_invalid_last_n_is_rejected(client, last_n):
+    response = client.get(f"{PROPS_URL}&last_n={last_n}")
+    assert response.status_code == 400
+    assert "last_n" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("last_n", ["abc", -3, 0, 2.5, True])
+def test_invalid_last_n_in_body_is_rejected(client, last_n):
+    response = client.post(
+        f"/players/{PLAYER_ID}/props",
+        json={
+            "season": SEASON,
+            "props": [{"stat": "PTS", "line": 20.5}],
+            "last_n": last_n,
+        },
+    )
+    assert response.status_code == 400
+    assert "last_n" in response.get_json()["error"]
+
+
+def player_games(client):
+    # Most recent first
+    return client.get(f"/players/{PLAYER_ID}/stats?season={SEASON}").get_json()["stats"]
+
+
+def test_hit_rates_count_the_last_n_games(client):
+    games = player_games(client)
+    recent = [game["points"] for game in games[:5]]
+
+    response = client.get(f"{PROPS_URL}&last_n=5")
+    assert response.status_code == 200
+    (prop,) = response.get_json()["props"]
+    assert prop["stat"] == "PTS"
+    assert prop["games"] == 5
+    assert prop["over"] == sum(points > 20.5 for points in recent)
+    assert prop["under"] == sum(points < 20.5 for points in recent)
+    assert prop["hit_rate"] == pytest.approx(prop["over"] / 5, abs=1e-3)
+    assert prop["average"] == pytest.approx(sum(recent) / 5, abs=1e-3)
+
+
+def test_hit_rates_default_to_the_whole_season(client):
+    games = player_games(client)
+    (prop,) = client.get(PROPS_URL).get_json()["props"]
+    assert prop["games"] == len(games)
+    assert prop["over"] == sum(game["points"] > 20.5 for game in games)
+
+
+def test_posted_props_take_their_own_windows(client):
+    games = player_games(client)
+    response = client.post(
+        f"/players/{PLAYER_ID}/props",
+        json={
+            "season": SEASON,
+            "last_n": 10,
+            "props": [
+                {"stat": "PRA", "line": 40},
+                {"stat": "AST", "line": 5, "last_n": 3},
+                {"stat": "REB", "line": 7, "last_n": 1000},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    combo, assists, rebounds = response.get_json()["props"]
+
+    pra = [game["points"] + game["rebounds"] + game["assists"] for game in games[:10]]
+    assert combo["stat"] == "PTS+REB+AST"
+    assert combo["games"] == 10
+    assert combo["over"] == sum(value > 40 for value in pra)
+    assert assists["games"] == 3
+    assert assists["over"] == sum(game["assists"] > 5 for game in games[:3])
+    # Windows longer than the season cover every game
+    assert rebounds["games"] == len(games)
+
+
+def test_unknown_stat_is_rejected(client):
+    response = client.get(f"/players/{PLAYER_ID}/props?season={SEASON}&props=XYZ:1")
+    assert response.status_code == 400
+    assert "XYZ" in response.get_json()["error"]
@@ -0,0 +1,116 @@
+import gzip
+import json
+import time
+
+from app.routes import games
+from app.services.responses import ResponseCache
+from app.services.scoreboard_poller import get_scoreboard_poller
+from tests.conftest import SEASON, TEAM_ID
+
+GAMES_URL = f"/teams/{TEAM_ID}/games?season={SEASON}"
+
+
+def test_etag_revalidates_to_not_modified(client):
+    response = client.get(GAMES_URL)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # The first ETag may be the body's hash, sent before the logs were cached;
+    # the 304 then carries the version's ETag
+    response = client.get(GAMES_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    etag = response.headers["ETag"]
+
+    response = client.get(GAMES_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_etag_differs_between_resources(client):
+    games = client.get(GAMES_URL)
+    aggregates = client.get(f"/teams/{TEAM_ID}/aggregates?season={SEASON}")
+    assert games.headers["ETag"] != aggregates.headers["ETag"]
+
+    response = client.get(
+        f"/teams/{TEAM_ID}/aggregates?season={SEASON}",
+        headers={"If-None-Match": games.headers["ETag"]},
+    )
+    assert response.status_code == 200
+
+
+def test_ndjson_streams_one_game_per_line(client):
+    games = client.get(GAMES_URL).get_json()["games"]
+
+    response = client.get(GAMES_URL + "&format=ndjson")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert "Content-Encoding" not in response.headers
+    rows = [json.loads(line) for line in response.data.splitlines()]
+    assert len(rows) == len(games)
+    assert {row["game_id"] for row in rows} == {game["game_id"] for game in games}
+
+
+def test_ndjson_is_gzipped_only_when_accepted(client):
+    plain = client.get(GAMES_URL + "&format=ndjson").data
+
+    response = client.get(
+        GAMES_URL + "&format=ndjson", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain
+
+    response = client.get(
+        GAMES_URL + "&format=ndjson", headers={"Accept-Encoding": "br"}
+    )
+    assert "Content-Encoding" not in response.headers
+    assert response.data == plain
+
+
+def test_ndjson_revalidates(client):
+    response = client.get(GAMES_URL + "&format=ndjson")
+    etag = response.headers["ETag"]
+    response = client.get(GAMES_URL + "&format=ndjson", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_response_cache_counts_compressed_variants():
+    cache = ResponseCache(max_bytes=50_000)
+    data = {"rows": [[i, f"player {i}"] for i in range(1000)]}
+    first = cache.put("first", data)
+    first.encoded("gzip")
+    assert cache.stats()["bytes"] == first.size > len(first.identity)
+
+    # Room for both bodies, but not for the second one's variant as well
+    variant = len(first.variants["gzip"])
+    cache.max_bytes = first.size + len(first.identity) + variant // 2
+    second = cache.put("second", data)
+    assert cache.stats()["entries"] == 2
+    second.encoded("gzip")
+    assert cache.stats()["entries"] == 1
+    assert cache.get("first") is None
+    assert cache.stats()["bytes"] == second.size <= cache.max_bytes
+
+
+def test_today_etag_and_body_come_from_one_snapshot(client, monkeypatch):
+    poller = get_scoreboard_poller()
+    waited = time.monotonic() + 10
+    while poller.snapshot is None and time.monotonic() < waited:
+        time.sleep(0.05)
+    snapshot = poller.snapshot
+    today_version = games.today_version
+
+    def version_then_poll(current):
+        # A poll lands between the validators and the body
+        version = today_version(current)
+        poller._snapshot = dict(current, version=current["version"] + 1, digest="newer")
+        return version
+
+    monkeypatch.setattr(games, "today_version", version_then_poll)
+    try:
+        response = client.get("/games/today")
+    finally:
+        poller._snapshot = snapshot
+    assert response.status_code == 200
+    assert response.get_json()["version"] == snapshot["version"]
+    assert response.headers["ETag"] == client.get("/games/today").headers["ETag"]
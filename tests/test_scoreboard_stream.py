@@ -0,0 +1,100 @@
+import json
+import time
+
+from app.services.scoreboard_stream import (
+    HEARTBEAT_EVENT,
+    ScoreboardStream,
+    diff_games,
+    get_scoreboard_stream,
+)
+
+
+def snapshot(version, digest, period):
+    return {
+        "date": "10/17/2026",
+        "version": version,
+        "digest": digest,
+        "fetched_at": "2026-10-17T20:00:00",
+        "games": [{"game_id": "1", "live_period": period}],
+    }
+
+
+def parse(event):
+    fields = dict(
+        line.split(": ", 1) for line in event.decode("utf-8").strip().split("\n")
+    )
+    fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+def stream_of(*periods, **kwargs):
+    stream = ScoreboardStream(**kwargs)
+    previous = None
+    for version, period in enumerate(periods, 1):
+        current = snapshot(version, f"state-{period}", period)
+        stream.publish(previous, current)
+        previous = current
+    return stream
+
+
+def test_diff_games_reports_changed_fields_only():
+    previous = [{"game_id": "1", "live_period": 1, "game_status": "Q1"}]
+    games = [
+        {"game_id": "1", "live_period": 2, "game_status": "Q1"},
+        {"game_id": "2", "live_period": 1},
+    ]
+    assert diff_games(previous, games) == [
+        {"live_period": 2, "game_id": "1"},
+        {"game_id": "2", "added": True, "game": games[1]},
+    ]
+
+
+def test_new_subscriber_gets_a_snapshot():
+    event = parse(next(stream_of(1, 2).subscribe()))
+    assert event["event"] == "snapshot"
+    assert event["id"] == "state-2"
+    assert event["data"]["games"][0]["live_period"] == 2
+
+
+def test_reconnect_replays_missed_deltas():
+    events = stream_of(1, 2, 3).subscribe("state-1")
+    first, second = parse(next(events)), parse(next(events))
+    assert (first["event"], first["id"]) == ("delta", "state-2")
+    assert (second["event"], second["id"]) == ("delta", "state-3")
+
+
+def test_reconnect_at_the_current_state_waits_for_changes():
+    events = stream_of(1, 2, heartbeat=0.01).subscribe("state-2")
+    assert next(events) == HEARTBEAT_EVENT
+
+
+def test_reconnect_from_an_unknown_state_gets_a_snapshot():
+    event = parse(next(stream_of(3, heartbeat=0.01).subscribe("state-2")))
+    assert (event["event"], event["id"]) == ("snapshot", "state-3")
+
+
+def test_subscriber_is_sent_new_deltas():
+    stream = stream_of(1)
+    events = stream.subscribe()
+    assert parse(next(events))["event"] == "snapshot"
+    stream.publish(snapshot(1, "state-1", 1), snapshot(2, "state-2", 2))
+    event = parse(next(events))
+    assert (event["event"], event["id"]) == ("delta", "state-2")
+    assert event["data"]["games"] == [{"live_period": 2, "game_id": "1"}]
+
+
+def test_stream_route_sends_the_scoreboard(client):
+    stream = get_scoreboard_stream()
+    waited = time.monotonic() + 10
+    while stream.stats()["version"] is None and time.monotonic() < waited:
+        time.sleep(0.05)
+
+    response = client.get("/games/stream", buffered=False)
+    try:
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        event = parse(next(response.response))
+        assert event["event"] == "snapshot"
+        assert event["id"] == stream.stats()["event_id"]
+    finally:
+        response.close()
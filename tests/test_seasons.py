@@ -0,0 +1,66 @@
+import pytest
+
+from app.utils.seasons import MAX_SEASONS, parse_seasons
+from tests.conftest import SEASON, TEAM_ID
+
+
+def test_parse_seasons_expands_inclusive_ranges():
+    assert parse_seasons("2023-24") == ["2023-24"]
+    assert parse_seasons(" 2021-22 .. 2023-24 ") == ["2021-22", "2022-23", "2023-24"]
+    assert parse_seasons("1999-00..2000-01") == ["1999-00", "2000-01"]
+
+
+@pytest.mark.parametrize(
+    "value, message",
+    [
+        ("2023-24..2015-16", "ends before it starts"),
+        ("garbage..2023-24", "Invalid season 'garbage'"),
+        ("2023-25..2024-25", "Invalid season '2023-25'"),
+        ("2023-24..", "Invalid season ''"),
+        ("1950-51..2023-24", f"at most {MAX_SEASONS} seasons"),
+    ],
+)
+def test_parse_seasons_rejects_bad_ranges(value, message):
+    with pytest.raises(ValueError, match=message):
+        parse_seasons(value)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"/teams/{TEAM_ID}/games?season=2023-24..2015-16",
+        f"/teams/{TEAM_ID}/games?season=garbage..2023-24",
+        "/players/1630002/stats?season=2023-24..2015-16",
+        "/players/1630002/stats?season=2023-24..24-25",
+    ],
+)
+def test_bad_season_ranges_are_rejected(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert "season" in response.get_json()["error"].lower()
+
+
+def test_batch_rejects_bad_season_ranges(client):
+    response = client.post(
+        "/teams/batch",
+        json={"team_ids": [TEAM_ID], "season": ["2023-24", "24-25..2023-24"]},
+    )
+    assert response.status_code == 400
+    assert "Invalid season '24-25'" in response.get_json()["error"]
+
+
+def test_season_range_merges_most_recent_first(client):
+    response = client.get(f"/teams/{TEAM_ID}/games?season=2022-23..{SEASON}")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["seasons"] == ["2022-23", SEASON]
+    dates = [game["game_date"] for game in body["games"]]
+    assert dates == sorted(dates, reverse=True)
+    assert body["games_played"] == len(body["games"])
+
+
+def test_single_season_range_matches_the_season(client):
+    season = client.get(f"/teams/{TEAM_ID}/games?season={SEASON}").get_json()
+    ranged = client.get(f"/teams/{TEAM_ID}/games?season={SEASON}..{SEASON}").get_json()
+    assert ranged["seasons"] == [SEASON]
+    assert ranged["games"] == season["games"]
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from app.services.deadline import DeadlineExceeded, check_deadline, request_deadline
+from app.services.nba_stats import _coalesced
+from app.services.single_flight import SingleFlight
+
+
+def run_concurrently(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_calls_collapse_into_one():
+    flight = SingleFlight()
+    executions = []
+    results = []
+
+    def load():
+        executions.append(1)
+        time.sleep(0.1)
+        return "data"
+
+    run_concurrently([lambda: results.append(flight.do("key", load, group="test"))] * 5)
+    assert results == ["data"] * 5
+    assert len(executions) == 1
+    assert flight.stats()["groups"]["test"] == {
+        "calls": 5,
+        "executions": 1,
+        "collapsed": 4,
+    }
+    assert flight.in_flight() == 0
+
+
+def test_error_is_shared_with_waiting_callers():
+    flight = SingleFlight()
+    errors = []
+
+    def load():
+        time.sleep(0.1)
+        raise ValueError("upstream down")
+
+    def call():
+        try:
+            flight.do("key", load)
+        except ValueError as e:
+            errors.append(e)
+
+    run_concurrently([call] * 3)
+    assert len(errors) == 3
+    assert len({id(error) for error in errors}) == 1
+
+
+def test_leader_deadline_is_not_shared():
+    loads = []
+    results = {}
+
+    def load():
+        loads.append(1)
+        time.sleep(0.3)
+        check_deadline("load")
+        return "data"
+
+    def call(name, budget, delay):
+        time.sleep(delay)
+        with request_deadline(budget):
+            try:
+                results[name] = _coalesced("key", load, "test")
+            except DeadlineExceeded:
+                results[name] = "deadline"
+
+    # The second caller joins the first's load, which runs out of its deadline
+    run_concurrently([lambda: call("short", 0.1, 0), lambda: call("long", 5, 0.05)])
+    assert results == {"short": "deadline", "long": "data"}
+    assert len(loads) == 2
+
+
+def test_own_deadline_error_is_raised():
+    with request_deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            _coalesced("expired", lambda: check_deadline("load"), "test")
+
+
+def test_waiting_stops_at_the_own_deadline():
+    results = {}
+    release = threading.Event()
+
+    def load():
+        release.wait(2)
+        return "data"
+
+    def call(name, budget, delay):
+        time.sleep(delay)
+        with request_deadline(budget):
+            try:
+                results[name] = _coalesced("slow", load, "test")
+            except DeadlineExceeded:
+                results[name] = "deadline"
+            if name == "short":
+                release.set()
+
+    run_concurrently([lambda: call("long", 5, 0), lambda: call("short", 0.1, 0.05)])
+    assert results == {"short": "deadline", "long": "data"}
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+from nba_api.stats.endpoints import CommonPlayerInfo
+from nba_api.stats.library.parameters import SeasonAll
+
+from app.services.deadline import DeadlineExceeded, request_deadline
+from app.services.nba_stats import cached_fetch, get_player_info, get_stats_cache
+from app.services.stats_cache import StatsCache, ttl_for
+
+PARAMS = {"player_id": 1}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StatsCache(str(tmp_path / "cache.sqlite3"), stale_window=60)
+
+
+def test_set_and_get(cache):
+    assert cache.get("CommonPlayerInfo", PARAMS) is None
+    cache.set("CommonPlayerInfo", PARAMS, {"rows": [1, 2]}, ttl=60)
+    assert cache.get("CommonPlayerInfo", PARAMS) == {"rows": [1, 2]}
+    counters = cache.stats()["endpoints"]["CommonPlayerInfo"]
+    assert (counters["hits"], counters["misses"], counters["stores"]) == (1, 1, 1)
+
+
+def test_expired_entry_is_a_miss_but_kept(cache):
+    cache.set("CommonPlayerInfo", PARAMS, {"rows": []}, ttl=-1)
+    assert cache.get("CommonPlayerInfo", PARAMS) is None
+    data, stored_at, expires_at = cache.get_entry("CommonPlayerInfo", PARAMS)
+    assert data == {"rows": []}
+    assert cache.in_stale_window(expires_at)
+    assert cache.stored_at("CommonPlayerInfo", PARAMS) is None
+    assert cache.stored_at("CommonPlayerInfo", PARAMS, expired=True) == stored_at
+
+
+def test_fill_lease_is_exclusive_across_processes(cache, tmp_path):
+    other = StatsCache(cache.path)
+    other._owner = "other-worker"
+    assert cache.acquire_fill("CommonPlayerInfo", PARAMS)
+    assert not other.acquire_fill("CommonPlayerInfo", PARAMS)
+    cache.release_fill("CommonPlayerInfo", PARAMS)
+    assert other.acquire_fill("CommonPlayerInfo", PARAMS)
+
+
+def test_only_past_seasons_are_final():
+    params = {"team_id": 1, "season": "2000-01", "season_type": "Regular Season"}
+    assert ttl_for("TeamGameLogs", params) is None
+    params["season"] = SeasonAll.current_season
+    assert ttl_for("TeamGameLogs", params) is not None
+
+
+def test_cached_fetch_calls_upstream_once(app, upstream):
+    first = get_player_info(1630010)
+    assert get_player_info(1630010) == first
+    assert upstream.stats()["calls"]["commonplayerinfo"] == 1
+
+
+def test_stale_entry_served_when_upstream_fails(app, upstream):
+    params = {"player_id": 1630011}
+    cache = get_stats_cache()
+    # Past the stale window, so it is only served because the fetch fails
+    cache.set("CommonPlayerInfo", params, {"stale": True}, ttl=-cache.stale_window - 60)
+    upstream.error_rate = 1.0
+    data = cached_fetch(CommonPlayerInfo, params, player_id=1630011)
+    assert data == {"stale": True}
+    assert upstream.stats()["calls"]["commonplayerinfo"] == 1
+
+
+def test_fresh_for_keeps_entries_that_outlive_it(app, upstream):
+    params = {"player_id": 1630012}
+    get_stats_cache().set("CommonPlayerInfo", params, {"cached": True}, ttl=600)
+    data = cached_fetch(CommonPlayerInfo, params, fresh_for=60, player_id=1630012)
+    assert data == {"cached": True}
+    data = cached_fetch(CommonPlayerInfo, params, fresh_for=3600, player_id=1630012)
+    assert "CommonPlayerInfo" in data
+    assert upstream.stats()["calls"]["commonplayerinfo"] == 1
+    assert (
+        time.time() + 600 < get_stats_cache().get_entry("CommonPlayerInfo", params)[2]
+    )
+
+
+def test_fill_wait_stops_at_the_deadline(cache):
+    other = StatsCache(cache.path)
+    other._owner = "other-worker"
+    assert other.acquire_fill("CommonPlayerInfo", PARAMS)
+    started = time.monotonic()
+    with request_deadline(0.2):
+        with pytest.raises(DeadlineExceeded):
+            cache.wait_for_fill("CommonPlayerInfo", PARAMS)
+    assert time.monotonic() - started < 1
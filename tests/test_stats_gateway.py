@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+from nba_api.stats.endpoints import CommonPlayerInfo
+
+from app.services.deadline import DeadlineExceeded, request_deadline
+from app.services.stats_gateway import (
+    CircuitOpenError,
+    StatsGateway,
+    StatsGatewayError,
+)
+
+PLAYER_ID = 1630000
+
+
+@pytest.fixture
+def gateway(upstream):
+    gateway = StatsGateway(base_url=upstream.base_url)
+    yield gateway
+    gateway.close()
+
+
+def calls(upstream):
+    return upstream.stats()["calls"].get("commonplayerinfo", 0)
+
+
+def wait_for_calls(upstream, count, timeout=2.0):
+    """Wait for requests the gateway gave up on to reach the server's counters"""
+    deadline = time.monotonic() + timeout
+    while calls(upstream) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return calls(upstream)
+
+
+def test_call_returns_result_sets(gateway, upstream):
+    data = gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+    table = data["CommonPlayerInfo"]
+    row = dict(zip(table["headers"], table["data"][0]))
+    assert row["PERSON_ID"] == PLAYER_ID
+    assert calls(upstream) == 1
+
+
+def test_identical_calls_in_flight_share_one_request(gateway, upstream):
+    upstream.latency = 0.2
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+            )
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 5
+    assert calls(upstream) == 1
+
+
+def test_upstream_error_raises(gateway, upstream):
+    upstream.error_rate = 1.0
+    with pytest.raises(StatsGatewayError) as info:
+        gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+    assert info.value.status == 500
+
+
+def test_circuit_opens_after_consecutive_failures(upstream):
+    gateway = StatsGateway(
+        base_url=upstream.base_url, breaker_threshold=2, breaker_reset=60
+    )
+    try:
+        upstream.error_rate = 1.0
+        for _ in range(2):
+            with pytest.raises(StatsGatewayError):
+                gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+        with pytest.raises(CircuitOpenError):
+            gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+        assert calls(upstream) == 2
+        assert gateway.stats()["circuit"]["state"] == "open"
+    finally:
+        gateway.close()
+
+
+def test_slow_call_is_hedged_under_a_deadline(upstream):
+    gateway = StatsGateway(base_url=upstream.base_url, hedge_delay=0.05)
+    try:
+        upstream.latency = 0.3
+        gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+        assert gateway.stats()["hedges"] == 0
+
+        with request_deadline(5):
+            data = gateway.call(CommonPlayerInfo, player_id=PLAYER_ID + 1)
+        assert "CommonPlayerInfo" in data
+        assert gateway.stats()["hedges"] == 1
+        # The losing request is cancelled here but still answered upstream
+        assert wait_for_calls(upstream, 3) == 3
+    finally:
+        gateway.close()
+
+
+def test_call_refused_after_deadline(gateway, upstream):
+    with request_deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+    assert calls(upstream) == 0
+
+
+def test_closed_gateway_restarts(gateway, upstream):
+    gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+    gateway.close()
+    gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+    assert calls(upstream) == 2
+
+
+def test_slow_call_is_abandoned_at_the_deadline(gateway, upstream):
+    upstream.latency = 1.0
+    started = time.monotonic()
+    with request_deadline(0.2):
+        with pytest.raises(DeadlineExceeded):
+            gateway.call(CommonPlayerInfo, player_id=PLAYER_ID)
+    assert time.monotonic() - started < 0.5
+    # Still answered upstream, and shared with any caller waiting on it
+    assert wait_for_calls(upstream, 1) == 1
@@ -0,0 +1,71 @@
+import pytest
+
+from tests.conftest import SEASON, TEAM_ID
+
+GAMES_URL = f"/teams/{TEAM_ID}/games?season={SEASON}"
+AGGREGATES_URL = f"/teams/{TEAM_ID}/aggregates?season={SEASON}"
+
+
+def average(games, stat):
+    return sum(game[stat] for game in games) / len(games)
+
+
+@pytest.fixture
+def games(client):
+    # Most recent first
+    return client.get(GAMES_URL).get_json()["games"]
+
+
+def test_aggregates_match_game_logs(client, games):
+    response = client.get(f"{AGGREGATES_URL}&last_n=5")
+    assert response.status_code == 200
+    aggregates = response.get_json()
+    assert aggregates["games_played"] == len(games)
+
+    full = aggregates["full_season"]
+    assert full["games"] == len(games)
+    for stat in ("points", "assists", "plus_minus"):
+        assert full["averages"][stat] == pytest.approx(average(games, stat), abs=1e-3)
+
+    last = aggregates["last_n"]
+    assert last["games"] == last["window"] == 5
+    assert last["averages"]["points"] == pytest.approx(
+        average(games[:5], "points"), abs=1e-3
+    )
+
+
+def test_aggregates_split_home_away_and_wins(client, games):
+    splits = client.get(AGGREGATES_URL).get_json()["splits"]
+    home = [game for game in games if "vs." in game["matchup"]]
+    wins = [game for game in games if game["result"] == "W"]
+
+    assert splits["home"]["games"] == len(home)
+    assert splits["away"]["games"] == len(games) - len(home)
+    assert splits["wins"]["games"] == len(wins)
+    assert splits["losses"]["games"] == len(games) - len(wins)
+    assert splits["home"]["averages"]["points"] == pytest.approx(
+        average(home, "points"), abs=1e-3
+    )
+    assert splits["wins"]["averages"]["points"] == pytest.approx(
+        average(wins, "points"), abs=1e-3
+    )
+
+
+def test_rolling_averages_run_oldest_first(client, games):
+    rolling = client.get(f"{AGGREGATES_URL}&rolling=3").get_json()["rolling"]
+    oldest_first = games[::-1]
+
+    assert rolling["window"] == 3
+    assert rolling["game_ids"] == [game["game_id"] for game in oldest_first[2:]]
+    points = rolling["averages"]["points"]
+    assert len(points) == len(games) - 2
+    assert points[0] == pytest.approx(average(oldest_first[:3], "points"), abs=1e-3)
+    assert points[-1] == pytest.approx(average(games[:3], "points"), abs=1e-3)
+
+
+@pytest.mark.parametrize(
+    "query", ["last_n=0", "last_n=abc", "last_n=2.5", "rolling=0", "rolling=abc"]
+)
+def test_invalid_windows_are_rejected(client, query):
+    response = client.get(f"{AGGREGATES_URL}&{query}")
+    assert response.status_code == 400